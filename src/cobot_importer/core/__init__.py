@@ -1,15 +1,34 @@
 """Core data models and services for Cobot Importer 3D."""
 
 from .project import Project, PathSegment, PathPoint, IOEvent
+from .points import PointStore, PointView
+from .changes import ChangeSet
 from .serialization import ProjectSerializer
-from .model_loader import MeshGeometry, ModelLoader
+from .edits import Edit, ProjectEditor
+from .journal import EditJournal
+from .history import EditHistory
+from .mesh_cache import MeshCache
+from .model_loader import AsyncModelLoader, LoadCancelled, MeshGeometry, MeshLoadTask, ModelLoader
+from .spatial import MeshIndex
 
 __all__ = [
     "Project",
     "PathSegment",
     "PathPoint",
     "IOEvent",
+    "PointStore",
+    "PointView",
+    "ChangeSet",
     "ProjectSerializer",
+    "Edit",
+    "ProjectEditor",
+    "EditJournal",
+    "EditHistory",
+    "MeshCache",
     "MeshGeometry",
+    "MeshLoadTask",
+    "AsyncModelLoader",
+    "LoadCancelled",
     "ModelLoader",
+    "MeshIndex",
 ]
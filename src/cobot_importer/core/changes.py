@@ -0,0 +1,103 @@
+"""Revision counters, stable identifiers and change sets for the domain model."""
+
+from __future__ import annotations
+
+import itertools
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+_revisions = itertools.count(1)
+
+
+def next_revision() -> int:
+    """Return a process-wide, strictly increasing revision number."""
+
+    return next(_revisions)
+
+
+def new_id() -> str:
+    """Return a new stable identifier for a project or path segment."""
+
+    return uuid.uuid4().hex
+
+
+PointRange = Tuple[int, Optional[int]]
+
+
+@dataclass
+class ChangeSet:
+    """Describes what an edit (or a batch of edits) changed, keyed by segment id.
+
+    ``added`` segments are new or replaced and should be rebuilt from scratch;
+    ``points_changed`` maps a segment id to the ``(start, stop)`` row range
+    whose contents changed, where ``stop`` is ``None`` when every row from
+    ``start`` onwards may have moved (insertions and removals).
+    ``created`` is the part of ``added`` that did not exist before the first
+    change; only those segments disappear from the set when removed again.
+    """
+
+    added: Set[str] = field(default_factory=set)
+    removed: Set[str] = field(default_factory=set)
+    created: Set[str] = field(default_factory=set)
+    points_changed: Dict[str, PointRange] = field(default_factory=dict)
+    params_changed: Dict[str, Set[str]] = field(default_factory=dict)
+    project_fields: Set[str] = field(default_factory=set)
+    order_changed: bool = False
+
+    @staticmethod
+    def segments_added(segment_ids: Iterable[str]) -> "ChangeSet":
+        segment_ids = set(segment_ids)
+        return ChangeSet(added=segment_ids, created=set(segment_ids), order_changed=True)
+
+    def is_empty(self) -> bool:
+        return not (
+            self.added
+            or self.removed
+            or self.points_changed
+            or self.params_changed
+            or self.project_fields
+            or self.order_changed
+        )
+
+    def touched_segments(self) -> Set[str]:
+        """Ids of segments that still exist and need updating."""
+
+        return (self.added | set(self.points_changed) | set(self.params_changed)) - self.removed
+
+    def mark_points(self, segment_id: str, start: int, stop: Optional[int]) -> None:
+        current = self.points_changed.get(segment_id)
+        if current is not None:
+            start = min(start, current[0])
+            stop = None if stop is None or current[1] is None else max(stop, current[1])
+        self.points_changed[segment_id] = (start, stop)
+
+    def mark_params(self, segment_id: str, names: Iterable[str]) -> None:
+        self.params_changed.setdefault(segment_id, set()).update(names)
+
+    def merge(self, other: "ChangeSet") -> "ChangeSet":
+        """Fold ``other`` (which happened later) into this change set and return it."""
+
+        for segment_id in other.removed:
+            self.points_changed.pop(segment_id, None)
+            self.params_changed.pop(segment_id, None)
+            self.added.discard(segment_id)
+            if segment_id in self.created:
+                # Created and deleted again: the segment never existed outside this change set.
+                self.created.discard(segment_id)
+            else:
+                self.removed.add(segment_id)
+        for segment_id in other.added:
+            self.added.add(segment_id)
+            if segment_id in self.removed:
+                # Deleted and inserted again, so it is replaced rather than new.
+                self.removed.discard(segment_id)
+            else:
+                self.created.add(segment_id)
+        for segment_id, (start, stop) in other.points_changed.items():
+            self.mark_points(segment_id, start, stop)
+        for segment_id, names in other.params_changed.items():
+            self.mark_params(segment_id, names)
+        self.project_fields |= other.project_fields
+        self.order_changed = self.order_changed or other.order_changed
+        return self
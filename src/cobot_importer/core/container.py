@@ -0,0 +1,146 @@
+"""Binary project container (``.cobot3d`` v2).
+
+The container is an uncompressed zip archive holding a small JSON manifest
+plus one raw little-endian ``float64`` ``(N, 6)`` pose blob per path segment.
+Blobs are stored aligned so they can be memory-mapped directly from the
+archive; point data is only paged in when it is actually accessed.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .points import PointStore
+from .project import IOEvent, PathSegment, Project
+
+CONTAINER_MAGIC = b"PK\x03\x04"
+CONTAINER_VERSION = 2
+MANIFEST_NAME = "manifest.json"
+
+_POSE_DTYPE = np.dtype("<f8")
+_BLOB_ALIGNMENT = 64
+_LOCAL_HEADER_SIZE = 30
+_ZIP64_EXTRA_SIZE = 20
+_PADDING_EXTRA_ID = 0xD935
+
+
+class ProjectContainer:
+    """Read and write the zip based project container."""
+
+    @staticmethod
+    def is_container(path: str | Path) -> bool:
+        with open(path, "rb") as handle:
+            return handle.read(len(CONTAINER_MAGIC)) == CONTAINER_MAGIC
+
+    @staticmethod
+    def detach_from(project: Project, path: str | Path) -> None:
+        """Copy point data mapped from ``path`` into memory before it is overwritten."""
+
+        for segment in project.paths:
+            if segment.points.source is not None and _same_file(segment.points.source, path):
+                segment.points.detach()
+
+    @staticmethod
+    def save(project: Project, path: str | Path) -> None:
+        path = Path(path)
+        ProjectContainer.detach_from(project, path)
+        manifest = project.to_dict(include_points=False)
+        manifest["format"] = "cobot3d"
+        manifest["version"] = CONTAINER_VERSION
+        fd, temp_name = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent or None)
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(temp_name, "w", compression=zipfile.ZIP_STORED) as archive:
+                for index, (segment, entry) in enumerate(zip(project.paths, manifest["paths"])):
+                    blob_name = f"segments/{index:06d}.f8"
+                    poses = np.ascontiguousarray(segment.points.poses, dtype=_POSE_DTYPE)
+                    _write_aligned(archive, blob_name, poses)
+                    entry["points_blob"] = blob_name
+                    entry["point_count"] = int(len(poses))
+                    entry["io_events"] = {
+                        str(row): [event.to_dict() for event in events]
+                        for row, events in segment.points.event_items().items()
+                    }
+                archive.writestr(MANIFEST_NAME, json.dumps(manifest, ensure_ascii=False))
+            os.replace(temp_name, path)
+        except BaseException:
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+            raise
+
+    @staticmethod
+    def load(path: str | Path) -> Project:
+        path = Path(path)
+        with zipfile.ZipFile(path, "r") as archive:
+            manifest: Dict[str, Any] = json.loads(archive.read(MANIFEST_NAME).decode("utf-8"))
+            version = manifest.get("version", CONTAINER_VERSION)
+            if version > CONTAINER_VERSION:
+                raise ValueError(f"Unsupported project container version {version}")
+            offsets = {
+                entry["points_blob"]: _data_offset(archive, entry["points_blob"])
+                for entry in manifest.get("paths", [])
+                if entry.get("point_count")
+            }
+
+        mapping = np.memmap(path, dtype=np.uint8, mode="c") if offsets else None
+        paths: List[PathSegment] = []
+        for entry in manifest.get("paths", []):
+            segment = PathSegment.from_dict(entry)
+            count = int(entry.get("point_count", 0))
+            events = {
+                int(row): [IOEvent.from_dict(evt) for evt in items]
+                for row, items in entry.get("io_events", {}).items()
+            }
+            if count and mapping is not None:
+                poses = np.ndarray(
+                    shape=(count, 6), dtype=_POSE_DTYPE, buffer=mapping, offset=offsets[entry["points_blob"]]
+                )
+                segment.points = PointStore.from_mapped(poses, events, source=str(path))
+            paths.append(segment)
+        manifest["paths"] = []
+        project = Project.from_dict(manifest)
+        project.paths = paths
+        return project
+
+
+def _write_aligned(archive: zipfile.ZipFile, name: str, array: np.ndarray) -> None:
+    """Store ``array`` uncompressed with its data aligned to ``_BLOB_ALIGNMENT``."""
+
+    info = zipfile.ZipInfo(name)
+    info.compress_type = zipfile.ZIP_STORED
+    info.file_size = array.nbytes
+    zip64 = array.nbytes * 1.05 > zipfile.ZIP64_LIMIT
+    header_offset = archive.fp.tell()  # type: ignore[union-attr]
+    data_offset = header_offset + _LOCAL_HEADER_SIZE + len(name.encode("utf-8")) + 4
+    if zip64:
+        data_offset += _ZIP64_EXTRA_SIZE
+    padding = (-data_offset) % _BLOB_ALIGNMENT
+    info.extra = struct.pack("<HH", _PADDING_EXTRA_ID, padding) + b"\x00" * padding
+    with archive.open(info, "w", force_zip64=zip64) as handle:
+        if array.size:
+            handle.write(memoryview(array).cast("B"))
+
+
+def _data_offset(archive: zipfile.ZipFile, name: str) -> int:
+    info = archive.getinfo(name)
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"Container entry {name} is compressed and cannot be mapped")
+    archive.fp.seek(info.header_offset)  # type: ignore[union-attr]
+    header = archive.fp.read(_LOCAL_HEADER_SIZE)  # type: ignore[union-attr]
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    return info.header_offset + _LOCAL_HEADER_SIZE + name_length + extra_length
+
+
+def _same_file(first: str | Path, second: str | Path) -> bool:
+    try:
+        return Path(first).resolve() == Path(second).resolve()
+    except OSError:
+        return False
@@ -0,0 +1,489 @@
+"""Reversible project edits and the editor that applies them.
+
+Every change the UI makes to a :class:`~.project.Project` is expressed as an
+:class:`Edit`. Applying an edit returns its inverse, and edits serialize to
+small dictionaries, so the same objects drive the edit journal and any other
+listener registered on a :class:`ProjectEditor`. While applying, edits also
+describe what they touched in a :class:`~.changes.ChangeSet` so views can
+update incrementally.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, ClassVar, Dict, Hashable, Iterable, List, Optional, Sequence, Type
+
+import numpy as np
+
+from .changes import ChangeSet
+from .points import POSE_FIELDS
+from .project import IOEvent, PathPoint, PathSegment, Project
+
+PROJECT_FIELDS = ("name", "model_path", "model_transform", "metadata")
+SEGMENT_FIELDS = (
+    "name",
+    "speed",
+    "point_density",
+    "blend_radius",
+    "retract_height",
+    "approach_height",
+    "tool_offset",
+    "enabled",
+)
+
+EditListener = Callable[["Edit", "Edit"], None]
+ChangeListener = Callable[[ChangeSet], None]
+
+_EDIT_OVERHEAD = 256
+
+
+class Edit(ABC):
+    """Base class for reversible, serializable project edits."""
+
+    op: ClassVar[str] = ""
+    _registry: ClassVar[Dict[str, Type["Edit"]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls.op:
+            Edit._registry[cls.op] = cls
+
+    @abstractmethod
+    def apply(self, project: Project, changes: Optional[ChangeSet] = None) -> "Edit":
+        """Apply the edit and return the edit that undoes it.
+
+        When ``changes`` is given, the touched segments are recorded in it.
+        """
+
+    @abstractmethod
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form, read back by :meth:`from_dict`."""
+
+    def merge_key(self) -> Optional[Hashable]:
+        """Key shared by consecutive edits that may collapse into one undo step."""
+
+        return None
+
+    def nbytes(self) -> int:
+        """Approximate memory retained by the edit."""
+
+        return _EDIT_OVERHEAD
+
+    @classmethod
+    @abstractmethod
+    def _from_payload(cls, data: Dict[str, Any]) -> "Edit":
+        """Edit of this type from its :meth:`to_dict` form."""
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "Edit":
+        try:
+            edit_type = Edit._registry[data["op"]]
+        except KeyError as exc:
+            raise ValueError(f"Unknown edit operation: {data.get('op')!r}") from exc
+        return edit_type._from_payload(data)
+
+
+def _check_fields(fields: Dict[str, Any], allowed: Sequence[str]) -> None:
+    unknown = set(fields) - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {sorted(unknown)}")
+
+
+def _events_to_dict(events: Dict[int, List[IOEvent]]) -> Dict[str, Any]:
+    return {str(row): [event.to_dict() for event in items] for row, items in events.items()}
+
+
+def _events_from_dict(data: Dict[str, Any]) -> Dict[int, List[IOEvent]]:
+    return {int(row): [IOEvent.from_dict(event) for event in items] for row, items in data.items()}
+
+
+@dataclass(eq=False)
+class SetProjectFields(Edit):
+    """Change top-level project attributes such as the name or model path."""
+
+    op: ClassVar[str] = "project.set"
+
+    fields: Dict[str, Any]
+
+    def apply(self, project: Project, changes: Optional[ChangeSet] = None) -> Edit:
+        _check_fields(self.fields, PROJECT_FIELDS)
+        previous = {name: getattr(project, name) for name in self.fields}
+        for name, value in self.fields.items():
+            setattr(project, name, value)
+        if changes is not None:
+            changes.project_fields.update(self.fields)
+        return SetProjectFields(previous)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"op": self.op, "fields": self.fields}
+
+    def merge_key(self) -> Optional[Hashable]:
+        return (self.op, tuple(sorted(self.fields)))
+
+    @classmethod
+    def _from_payload(cls, data: Dict[str, Any]) -> Edit:
+        return cls(dict(data["fields"]))
+
+
+@dataclass(eq=False)
+class SetSegmentFields(Edit):
+    """Change scalar parameters of one path segment."""
+
+    op: ClassVar[str] = "segment.set"
+
+    segment: int
+    fields: Dict[str, Any]
+
+    def apply(self, project: Project, changes: Optional[ChangeSet] = None) -> Edit:
+        _check_fields(self.fields, SEGMENT_FIELDS)
+        target = project.ensure_path(self.segment)
+        previous = {name: getattr(target, name) for name in self.fields}
+        for name, value in self.fields.items():
+            setattr(target, name, value)
+        if changes is not None:
+            changes.mark_params(target.id, self.fields)
+        return SetSegmentFields(self.segment, previous)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"op": self.op, "segment": self.segment, "fields": self.fields}
+
+    def merge_key(self) -> Optional[Hashable]:
+        return (self.op, self.segment, tuple(sorted(self.fields)))
+
+    @classmethod
+    def _from_payload(cls, data: Dict[str, Any]) -> Edit:
+        return cls(int(data["segment"]), dict(data["fields"]))
+
+
+@dataclass(eq=False)
+class InsertSegment(Edit):
+    """Insert a path segment at ``index``."""
+
+    op: ClassVar[str] = "segment.insert"
+
+    index: int
+    segment: PathSegment
+
+    def apply(self, project: Project, changes: Optional[ChangeSet] = None) -> Edit:
+        if not 0 <= self.index <= len(project.paths):
+            raise ValueError(f"Path index {self.index} is out of range")
+        project.paths.insert(self.index, self.segment)
+        project.touch()
+        if changes is not None:
+            changes.merge(ChangeSet.segments_added([self.segment.id]))
+        return RemoveSegment(self.index)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"op": self.op, "index": self.index, "segment": self.segment.to_dict()}
+
+    def nbytes(self) -> int:
+        return _EDIT_OVERHEAD + self.segment.points.nbytes
+
+    @classmethod
+    def _from_payload(cls, data: Dict[str, Any]) -> Edit:
+        return cls(int(data["index"]), PathSegment.from_dict(data["segment"]))
+
+
+@dataclass(eq=False)
+class RemoveSegment(Edit):
+    """Remove the path segment at ``index``."""
+
+    op: ClassVar[str] = "segment.remove"
+
+    index: int
+
+    def apply(self, project: Project, changes: Optional[ChangeSet] = None) -> Edit:
+        removed = project.ensure_path(self.index)
+        project.remove_path(self.index)
+        if changes is not None:
+            changes.merge(ChangeSet(removed={removed.id}, order_changed=True))
+        return InsertSegment(self.index, removed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"op": self.op, "index": self.index}
+
+    @classmethod
+    def _from_payload(cls, data: Dict[str, Any]) -> Edit:
+        return cls(int(data["index"]))
+
+
+@dataclass(eq=False)
+class SetPoints(Edit):
+    """Overwrite consecutive waypoint poses starting at ``start``."""
+
+    op: ClassVar[str] = "points.set"
+
+    segment: int
+    start: int
+    poses: np.ndarray
+
+    def apply(self, project: Project, changes: Optional[ChangeSet] = None) -> Edit:
+        target = project.ensure_path(self.segment)
+        points = target.points
+        previous = points.poses[self.start : self.start + len(self.poses)].copy()
+        points.set_rows(self.start, self.poses)
+        if changes is not None:
+            changes.mark_points(target.id, self.start, self.start + len(self.poses))
+        return SetPoints(self.segment, self.start, previous)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"op": self.op, "segment": self.segment, "start": self.start, "poses": self.poses.tolist()}
+
+    def merge_key(self) -> Optional[Hashable]:
+        return (self.op, self.segment, self.start, len(self.poses))
+
+    def nbytes(self) -> int:
+        return _EDIT_OVERHEAD + self.poses.nbytes
+
+    @classmethod
+    def _from_payload(cls, data: Dict[str, Any]) -> Edit:
+        return cls(int(data["segment"]), int(data["start"]), np.asarray(data["poses"], dtype=float).reshape(-1, 6))
+
+
+@dataclass(eq=False)
+class InsertPoints(Edit):
+    """Insert waypoints so that they end up at the indices ``rows``."""
+
+    op: ClassVar[str] = "points.insert"
+
+    segment: int
+    rows: np.ndarray
+    poses: np.ndarray
+    io_events: Dict[int, List[IOEvent]] = field(default_factory=dict)
+
+    def apply(self, project: Project, changes: Optional[ChangeSet] = None) -> Edit:
+        target = project.ensure_path(self.segment)
+        target.points.insert_rows(self.rows, self.poses, self.io_events)
+        if changes is not None and len(self.rows):
+            changes.mark_points(target.id, int(np.min(self.rows)), None)
+        return RemovePoints(self.segment, self.rows)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "op": self.op,
+            "segment": self.segment,
+            "rows": np.asarray(self.rows).tolist(),
+            "poses": self.poses.tolist(),
+            "io_events": _events_to_dict(self.io_events),
+        }
+
+    def nbytes(self) -> int:
+        return _EDIT_OVERHEAD + self.poses.nbytes + np.asarray(self.rows).nbytes
+
+    @classmethod
+    def _from_payload(cls, data: Dict[str, Any]) -> Edit:
+        return cls(
+            int(data["segment"]),
+            np.asarray(data["rows"], dtype=np.int64),
+            np.asarray(data["poses"], dtype=float).reshape(-1, 6),
+            _events_from_dict(data.get("io_events", {})),
+        )
+
+
+@dataclass(eq=False)
+class RemovePoints(Edit):
+    """Remove the waypoints at ``rows``."""
+
+    op: ClassVar[str] = "points.remove"
+
+    segment: int
+    rows: np.ndarray
+
+    def apply(self, project: Project, changes: Optional[ChangeSet] = None) -> Edit:
+        target = project.ensure_path(self.segment)
+        points = target.points
+        rows = np.unique(np.asarray(self.rows, dtype=np.int64))
+        poses = points.poses[rows].copy()
+        events = points.event_items()
+        removed_events = {int(row): events[int(row)] for row in rows if int(row) in events}
+        points.delete_rows(rows)
+        if changes is not None and rows.size:
+            changes.mark_points(target.id, int(rows[0]), None)
+        return InsertPoints(self.segment, rows, poses, removed_events)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"op": self.op, "segment": self.segment, "rows": np.asarray(self.rows).tolist()}
+
+    def nbytes(self) -> int:
+        return _EDIT_OVERHEAD + np.asarray(self.rows).nbytes
+
+    @classmethod
+    def _from_payload(cls, data: Dict[str, Any]) -> Edit:
+        return cls(int(data["segment"]), np.asarray(data["rows"], dtype=np.int64))
+
+
+@dataclass(eq=False)
+class SetPointEvents(Edit):
+    """Replace the IO events attached to one waypoint."""
+
+    op: ClassVar[str] = "points.events"
+
+    segment: int
+    row: int
+    events: List[IOEvent]
+
+    def apply(self, project: Project, changes: Optional[ChangeSet] = None) -> Edit:
+        target = project.ensure_path(self.segment)
+        points = target.points
+        previous = points.event_items().get(self.row, [])
+        points.set_events(self.row, self.events)
+        if changes is not None:
+            changes.mark_points(target.id, self.row, self.row + 1)
+        return SetPointEvents(self.segment, self.row, previous)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "op": self.op,
+            "segment": self.segment,
+            "row": self.row,
+            "events": [event.to_dict() for event in self.events],
+        }
+
+    @classmethod
+    def _from_payload(cls, data: Dict[str, Any]) -> Edit:
+        return cls(int(data["segment"]), int(data["row"]), [IOEvent.from_dict(evt) for evt in data["events"]])
+
+
+@dataclass(eq=False)
+class CompoundEdit(Edit):
+    """Several edits applied, undone and recorded as one."""
+
+    op: ClassVar[str] = "compound"
+
+    edits: List[Edit]
+
+    def apply(self, project: Project, changes: Optional[ChangeSet] = None) -> Edit:
+        inverses = [edit.apply(project, changes) for edit in self.edits]
+        return CompoundEdit(inverses[::-1])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"op": self.op, "edits": [edit.to_dict() for edit in self.edits]}
+
+    def nbytes(self) -> int:
+        return _EDIT_OVERHEAD + sum(edit.nbytes() for edit in self.edits)
+
+    @classmethod
+    def _from_payload(cls, data: Dict[str, Any]) -> Edit:
+        return cls([Edit.from_dict(item) for item in data["edits"]])
+
+
+class ProjectEditor:
+    """Apply edits to a project and notify listeners about each change.
+
+    Edit listeners receive ``(edit, inverse)`` (journal, history); change
+    subscribers receive the :class:`~.changes.ChangeSet` of each edit.
+    """
+
+    def __init__(self, project: Project) -> None:
+        self._project = project
+        self._listeners: List[EditListener] = []
+        self._subscribers: List[ChangeListener] = []
+
+    @property
+    def project(self) -> Project:
+        return self._project
+
+    def add_listener(self, listener: EditListener) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: EditListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def subscribe(self, subscriber: ChangeListener) -> None:
+        self._subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: ChangeListener) -> None:
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+
+    def apply(self, edit: Edit) -> Edit:
+        """Apply ``edit``, notify listeners with ``(edit, inverse)`` and return the inverse."""
+
+        changes = ChangeSet()
+        inverse = edit.apply(self._project, changes)
+        for listener in list(self._listeners):
+            listener(edit, inverse)
+        for subscriber in list(self._subscribers):
+            subscriber(changes)
+        return inverse
+
+    def index_of(self, segment: PathSegment) -> int:
+        for index, candidate in enumerate(self._project.paths):
+            if candidate is segment:
+                return index
+        raise ValueError(f"Segment {segment.name!r} is not part of the project")
+
+    # region Convenience helpers
+    def set_project_fields(self, **fields: Any) -> None:
+        self.apply(SetProjectFields(fields))
+
+    def set_segment_fields(self, index: int, **fields: Any) -> None:
+        self.apply(SetSegmentFields(index, fields))
+
+    def set_point_value(self, index: int, row: int, column: int, value: float) -> None:
+        points = self._project.ensure_path(index).points
+        pose = points.poses[row : row + 1].copy()
+        pose[0, column] = value
+        self.apply(SetPoints(index, row, pose))
+
+    def set_poses(self, index: int, start: int, poses: np.ndarray) -> None:
+        self.apply(SetPoints(index, start, np.asarray(poses, dtype=float).reshape(-1, 6)))
+
+    def replace_points(self, index: int, start: int, stop: int, poses: np.ndarray) -> None:
+        """Replace rows ``start:stop`` by ``poses`` in one undoable step."""
+
+        poses = np.asarray(poses, dtype=float).reshape(-1, 6)
+        if stop - start == len(poses):
+            if len(poses):
+                self.set_poses(index, start, poses)
+            return
+        edits: List[Edit] = []
+        if stop > start:
+            edits.append(RemovePoints(index, np.arange(start, stop, dtype=np.int64)))
+        if len(poses):
+            edits.append(InsertPoints(index, np.arange(start, start + len(poses), dtype=np.int64), poses))
+        self.apply(edits[0] if len(edits) == 1 else CompoundEdit(edits))
+
+    def insert_points(self, index: int, start: int, points: Iterable[PathPoint] | np.ndarray) -> None:
+        if isinstance(points, np.ndarray):
+            poses = np.zeros((len(points), 6))
+            poses[:, : points.shape[1]] = points
+            events: Dict[int, List[IOEvent]] = {}
+        else:
+            items = list(points)
+            poses = np.array([[getattr(point, name) for name in POSE_FIELDS] for point in items], dtype=float)
+            events = {start + offset: list(point.io_events) for offset, point in enumerate(items) if point.io_events}
+        rows = np.arange(start, start + len(poses), dtype=np.int64)
+        self.apply(InsertPoints(index, rows, poses.reshape(-1, 6), events))
+
+    def remove_points(self, index: int, rows: Iterable[int]) -> None:
+        rows = np.asarray(sorted(set(rows)), dtype=np.int64)
+        if rows.size:
+            self.apply(RemovePoints(index, rows))
+
+    def add_path(self, segment: Optional[PathSegment] = None) -> PathSegment:
+        segment = segment or PathSegment(name=f"Path {len(self._project.paths) + 1}")
+        self.apply(InsertSegment(len(self._project.paths), segment))
+        return segment
+
+    def add_paths(self, segments: Sequence[PathSegment]) -> None:
+        """Append several segments as one undoable step."""
+
+        start = len(self._project.paths)
+        edits: List[Edit] = [InsertSegment(start + offset, segment) for offset, segment in enumerate(segments)]
+        if edits:
+            self.apply(CompoundEdit(edits))
+
+    def remove_path(self, index: int) -> None:
+        self.apply(RemoveSegment(index))
+
+    def clone_path(self, index: int) -> PathSegment:
+        path = self._project.ensure_path(index)
+        cloned = path.copy(keep_id=False)
+        cloned.name = f"{path.name} Copy"
+        self.apply(InsertSegment(index + 1, cloned))
+        return cloned
+
+    # endregion
@@ -0,0 +1,147 @@
+"""Command based undo/redo history for project edits."""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Hashable, List, Optional
+
+from .edits import Edit, ProjectEditor
+
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+
+
+@dataclass
+class _HistoryEntry:
+    undo: Edit
+    redo: Edit
+    merge_key: Optional[Hashable]
+    timestamp: float
+
+    @property
+    def nbytes(self) -> int:
+        return self.undo.nbytes() + self.redo.nbytes()
+
+
+class EditHistory:
+    """Undo/redo stacks fed by a :class:`~.edits.ProjectEditor`.
+
+    Each entry keeps only the edit and its inverse, so memory and time are
+    proportional to the size of the change; removed segments are retained by
+    reference and point buffers are shared copy-on-write. Consecutive edits
+    with the same :meth:`~.edits.Edit.merge_key` arriving within
+    ``merge_interval`` seconds (for example spin box steps) collapse into a
+    single entry. The oldest entries are evicted once ``memory_limit`` bytes
+    are exceeded.
+    """
+
+    def __init__(
+        self,
+        editor: ProjectEditor,
+        memory_limit: int = DEFAULT_MEMORY_LIMIT,
+        merge_interval: float = 1.0,
+    ) -> None:
+        self._editor = editor
+        self._memory_limit = memory_limit
+        self._merge_interval = merge_interval
+        self._undo: Deque[_HistoryEntry] = deque()
+        self._redo: List[_HistoryEntry] = []
+        self._nbytes = 0
+        self._applying = False
+        self._listeners: List[Callable[[], None]] = []
+        editor.add_listener(self._on_edit)
+
+    @property
+    def memory_limit(self) -> int:
+        return self._memory_limit
+
+    @memory_limit.setter
+    def memory_limit(self, value: int) -> None:
+        self._memory_limit = value
+        self._evict()
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory retained by all undo and redo entries."""
+
+        return self._nbytes
+
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """Register a callback invoked whenever the stacks change."""
+
+        self._listeners.append(listener)
+
+    def undo(self) -> bool:
+        if not self._undo:
+            return False
+        entry = self._undo.pop()
+        before = entry.nbytes
+        entry.redo = self._apply(entry.undo)
+        self._nbytes += entry.nbytes - before
+        self._redo.append(entry)
+        self._notify()
+        return True
+
+    def redo(self) -> bool:
+        if not self._redo:
+            return False
+        entry = self._redo.pop()
+        before = entry.nbytes
+        entry.undo = self._apply(entry.redo)
+        self._nbytes += entry.nbytes - before
+        entry.merge_key = None
+        self._undo.append(entry)
+        self._notify()
+        return True
+
+    def clear(self) -> None:
+        self._undo.clear()
+        self._redo.clear()
+        self._nbytes = 0
+        self._notify()
+
+    def detach(self) -> None:
+        self._editor.remove_listener(self._on_edit)
+
+    def _apply(self, edit: Edit) -> Edit:
+        self._applying = True
+        try:
+            return self._editor.apply(edit)
+        finally:
+            self._applying = False
+
+    def _on_edit(self, edit: Edit, inverse: Edit) -> None:
+        if self._applying:
+            return
+        for entry in self._redo:
+            self._nbytes -= entry.nbytes
+        self._redo.clear()
+        now = time.monotonic()
+        key = edit.merge_key()
+        last = self._undo[-1] if self._undo else None
+        if key is not None and last is not None and last.merge_key == key and now - last.timestamp <= self._merge_interval:
+            self._nbytes -= last.nbytes
+            last.redo = edit
+            last.timestamp = now
+            self._nbytes += last.nbytes
+        else:
+            entry = _HistoryEntry(undo=inverse, redo=edit, merge_key=key, timestamp=now)
+            self._undo.append(entry)
+            self._nbytes += entry.nbytes
+        self._evict()
+        self._notify()
+
+    def _evict(self) -> None:
+        while self._nbytes > self._memory_limit and len(self._undo) > 1:
+            self._nbytes -= self._undo.popleft().nbytes
+
+    def _notify(self) -> None:
+        for listener in list(self._listeners):
+            listener()
@@ -0,0 +1,217 @@
+"""Append-only edit journal with crash recovery and background compaction."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence, TextIO, Tuple
+
+from .container import ProjectContainer
+from .edits import Edit, ProjectEditor
+from .project import Project
+from .serialization import ProjectSerializer
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_SUFFIX = ".journal"
+
+
+class EditJournal:
+    """Write-ahead log of project edits stored next to the project file.
+
+    Each applied :class:`~.edits.Edit` is appended as one JSON line
+    ``{"seq": n, "edit": {...}}`` and flushed immediately. The project file
+    remembers the last sequence number it contains (``Project.journal_seq``),
+    so on open only newer records are replayed. :meth:`compact` writes the full
+    project from a worker thread and then drops the records it absorbed.
+    """
+
+    def __init__(self, project_path: str | Path, project_format: str = ProjectSerializer.FORMAT_JSON) -> None:
+        self._project_path = Path(project_path)
+        self._path = self.path_for(project_path)
+        self._format = project_format
+        self._project: Optional[Project] = None
+        self._handle: Optional[TextIO] = None
+        self._records: List[Tuple[int, str]] = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal-compaction")
+        self._compaction: Optional[Future] = None
+        self._listener = lambda edit, _inverse: self.record(edit)
+
+    @staticmethod
+    def path_for(project_path: str | Path) -> Path:
+        project_path = Path(project_path)
+        return project_path.with_name(project_path.name + JOURNAL_SUFFIX)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def pending_count(self) -> int:
+        """Number of records not yet absorbed into the project file."""
+
+        return len(self._records)
+
+    # region Recovery
+    @staticmethod
+    def read_pending(project_path: str | Path, project: Project) -> List[Tuple[int, Edit]]:
+        """Return records from the journal of ``project_path`` that are newer than ``project``."""
+
+        journal_path = EditJournal.path_for(project_path)
+        pending: List[Tuple[int, Edit]] = []
+        if not journal_path.exists():
+            return pending
+        with open(journal_path, "r", encoding="utf-8") as handle:
+            for line_number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    seq = int(record["seq"])
+                    edit = Edit.from_dict(record["edit"])
+                except (ValueError, KeyError, TypeError):
+                    # A torn final line is expected after a crash mid-write.
+                    logger.warning("Ignoring unreadable journal record %s:%d", journal_path, line_number)
+                    break
+                if seq > project.journal_seq:
+                    pending.append((seq, edit))
+        return pending
+
+    @staticmethod
+    def replay(project: Project, records: List[Tuple[int, Edit]]) -> int:
+        """Apply ``records`` from :meth:`read_pending` to ``project``."""
+
+        for seq, edit in records:
+            edit.apply(project)
+            project.journal_seq = seq
+        return len(records)
+
+    # endregion
+
+    # region Recording
+    def start(
+        self,
+        project: Project,
+        editor: Optional[ProjectEditor] = None,
+        recovered: Sequence[Tuple[int, Edit]] = (),
+    ) -> None:
+        """Begin journaling edits made to ``project``.
+
+        The journal file is rewritten to hold only ``recovered`` (records that
+        were replayed but are not yet part of the project file).
+        """
+
+        self._project = project
+        kept = [(seq, json.dumps({"seq": seq, "edit": edit.to_dict()}, ensure_ascii=False)) for seq, edit in recovered]
+        with self._lock:
+            self._records = kept
+            self._rewrite_locked()
+        if editor is not None:
+            editor.add_listener(self._listener)
+
+    def detach(self, editor: ProjectEditor) -> None:
+        editor.remove_listener(self._listener)
+
+    def record(self, edit: Edit) -> int:
+        """Append ``edit`` to the journal and return its sequence number."""
+
+        if self._project is None or self._handle is None:
+            raise RuntimeError("Journal has not been started")
+        with self._lock:
+            seq = self._project.journal_seq + 1
+            self._project.journal_seq = seq
+            line = json.dumps({"seq": seq, "edit": edit.to_dict()}, ensure_ascii=False)
+            self._handle.write(line + "\n")
+            self._handle.flush()
+            self._records.append((seq, line))
+        return seq
+
+    def sync(self) -> None:
+        """Force journal contents to stable storage."""
+
+        with self._lock:
+            if self._handle is not None:
+                self._handle.flush()
+                os.fsync(self._handle.fileno())
+
+    # endregion
+
+    # region Compaction
+    def compact(self) -> Future:
+        """Write the full project in the background and trim the journal.
+
+        The calling thread only takes a copy-on-write snapshot (O(segments)),
+        so edits made while the worker runs stay in the journal for the next
+        compaction. The worker detaches the snapshot's point data from the
+        file and writes it; the file is replaced atomically, and mappings of
+        the live project keep reading the previous file's data.
+        """
+
+        if self._project is None:
+            raise RuntimeError("Journal has not been started")
+        self.sync()
+        if os.name == "nt":
+            # Windows cannot replace a file that is still mapped.
+            ProjectContainer.detach_from(self._project, self._project_path)
+        snapshot = self._project.copy()
+        self._compaction = self._executor.submit(self._write_snapshot, snapshot)
+        return self._compaction
+
+    def wait(self) -> None:
+        if self._compaction is not None:
+            self._compaction.result()
+
+    def _write_snapshot(self, snapshot: Project) -> None:
+        ProjectContainer.detach_from(snapshot, self._project_path)
+        ProjectSerializer.save(snapshot, self._project_path, format=self._format)
+        with self._lock:
+            self._records = [(seq, line) for seq, line in self._records if seq > snapshot.journal_seq]
+            self._rewrite_locked()
+        logger.info("Compacted project %s at journal seq %d", self._project_path, snapshot.journal_seq)
+
+    def _rewrite_locked(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        temp_path = self._path.with_name(self._path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            for _seq, line in self._records:
+                handle.write(line + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self._path)
+        self._handle = open(self._path, "a", encoding="utf-8")
+
+    # endregion
+
+    def close(self) -> None:
+        """Wait for pending compaction and close the journal file.
+
+        An empty journal is removed, so a journal left on disk always means
+        there is work to recover.
+        """
+
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown(wait=True)
+            with self._lock:
+                if self._handle is not None:
+                    self._handle.close()
+                    self._handle = None
+                if not self._records and self._path.exists():
+                    self._path.unlink()
+
+    def discard(self) -> None:
+        """Close the journal and delete it from disk."""
+
+        with self._lock:
+            self._records = []
+        self.close()
+        if self._path.exists():
+            self._path.unlink()
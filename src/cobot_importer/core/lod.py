@@ -0,0 +1,121 @@
+"""Level-of-detail generation for workpiece meshes."""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING, List, Sequence, Tuple
+
+import numpy as np
+
+try:  # pragma: no cover - optional dependency
+    import fast_simplification
+except ImportError:  # pragma: no cover - optional dependency
+    fast_simplification = None
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .model_loader import MeshGeometry
+
+logger = logging.getLogger(__name__)
+
+# Meshes below this size are drawn at full resolution only.
+LOD_MIN_FACES = 50_000
+# Target face counts of the generated levels relative to the full mesh.
+LOD_RATIOS: Tuple[float, ...] = (0.25, 0.05, 0.01)
+LOD_FLOOR_FACES = 2_000
+# Largest cluster count whose face keys (count ** 3) still fit in int64.
+_MAX_LINEAR_CLUSTERS = 2_000_000
+
+
+def compute_vertex_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Area weighted unit vertex normals, computed without per-vertex Python loops."""
+
+    triangles = vertices[faces]
+    face_normals = np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0])
+    normals = np.zeros((len(vertices), 3), dtype=face_normals.dtype)
+    for corner in range(3):
+        np.add.at(normals, faces[:, corner], face_normals)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+    return normals
+
+
+def decimate(vertices: np.ndarray, faces: np.ndarray, target_faces: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Reduce a triangle mesh to roughly ``target_faces`` faces.
+
+    Uses quadric error decimation from the optional ``fast_simplification``
+    package and falls back to vertex clustering on a uniform grid.
+    """
+
+    if target_faces >= len(faces):
+        return vertices, faces
+    if fast_simplification is not None:
+        reduction = 1.0 - target_faces / len(faces)
+        points, triangles = fast_simplification.simplify(vertices, faces, target_reduction=reduction)
+        return np.asarray(points), np.asarray(triangles)
+    return _cluster_decimate(vertices, faces, target_faces)
+
+
+def _cluster_decimate(vertices: np.ndarray, faces: np.ndarray, target_faces: int) -> Tuple[np.ndarray, np.ndarray]:
+    triangles = vertices[faces]
+    area = 0.5 * np.linalg.norm(
+        np.cross(triangles[:, 1] - triangles[:, 0], triangles[:, 2] - triangles[:, 0]), axis=1
+    ).sum()
+    if area <= 0:
+        return vertices, faces
+    # A surface crossing a cell leaves about two triangles behind.
+    cell = np.sqrt(2.0 * area / target_faces)
+    origin = vertices.min(axis=0)
+    for _attempt in range(4):
+        keys = np.floor((vertices - origin) / cell).astype(np.int64)
+        dims = keys.max(axis=0) + 1
+        linear = (keys[:, 0] * dims[1] + keys[:, 1]) * dims[2] + keys[:, 2]
+        _cells, cluster, counts = np.unique(linear, return_inverse=True, return_counts=True)
+        merged = np.zeros((len(counts), 3))
+        np.add.at(merged, cluster, vertices)
+        merged /= counts[:, None]
+        remapped = cluster[faces]
+        keep = (
+            (remapped[:, 0] != remapped[:, 1])
+            & (remapped[:, 1] != remapped[:, 2])
+            & (remapped[:, 0] != remapped[:, 2])
+        )
+        remapped = remapped[keep]
+        ordered = np.sort(remapped, axis=1)
+        if len(counts) < _MAX_LINEAR_CLUSTERS:
+            face_keys = (ordered[:, 0] * len(counts) + ordered[:, 1]) * len(counts) + ordered[:, 2]
+            unique_faces = np.unique(face_keys, return_index=True)[1]
+        else:
+            unique_faces = np.unique(ordered, axis=0, return_index=True)[1]
+        remapped = remapped[unique_faces]
+        if len(remapped) <= target_faces * 1.5:
+            break
+        cell *= np.sqrt(len(remapped) / target_faces)
+    used, compact = np.unique(remapped, return_inverse=True)
+    return merged[used].astype(vertices.dtype, copy=False), compact.reshape(-1, 3).astype(faces.dtype, copy=False)
+
+
+def build_lod_chain(geometry: "MeshGeometry", ratios: Sequence[float] = LOD_RATIOS) -> List["MeshGeometry"]:
+    """Return progressively coarser versions of ``geometry`` (excluding itself)."""
+
+    from .model_loader import MeshGeometry
+
+    face_count = len(geometry.faces)
+    if face_count < LOD_MIN_FACES:
+        return []
+    levels: List[MeshGeometry] = []
+    vertices, faces = np.asarray(geometry.vertices), np.asarray(geometry.faces)
+    previous = face_count
+    for ratio in ratios:
+        target = max(int(face_count * ratio), LOD_FLOOR_FACES)
+        if target >= previous * 0.8:
+            continue
+        # Decimating the previous level keeps the chain cheap to build.
+        vertices, faces = decimate(vertices, faces, target)
+        if len(faces) == 0 or len(faces) >= previous:
+            break
+        levels.append(
+            MeshGeometry(vertices=vertices, faces=faces, normals=compute_vertex_normals(vertices, faces))
+        )
+        previous = len(faces)
+    logger.info("Built %d LOD levels: %s faces", len(levels), [len(level.faces) for level in levels])
+    return levels
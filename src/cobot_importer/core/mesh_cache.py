@@ -0,0 +1,221 @@
+"""Persistent, content-addressed cache of tessellated meshes."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .spatial import MeshIndex
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .model_loader import MeshGeometry
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV = "COBOT_IMPORTER_CACHE_DIR"
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024
+# Bump when the stored layout or the tessellation changes.
+CACHE_VERSION = 4
+
+_INDEX_NAME = "index.json"
+_ARRAYS = ("vertices", "faces", "normals")
+_INDEX_PREFIX = "bvh_"
+_INDEX_ARRAYS = ("order", "node_min", "node_max")
+_HASH_CHUNK = 4 * 1024 * 1024
+
+
+def default_cache_dir() -> Path:
+    """Return the cache root, honouring ``COBOT_IMPORTER_CACHE_DIR``."""
+
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override)
+    if sys.platform == "win32":
+        base = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local"))
+        return base / "CobotImporter3D" / "mesh_cache"
+    base = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    return base / "cobot_importer" / "meshes"
+
+
+class MeshCache:
+    """Store tessellated meshes, their LOD levels and BVH as ``.npy`` arrays.
+
+    Arrays are memory-mapped on load.
+
+    Entries are addressed by a BLAKE2 digest of the model file contents, so a
+    renamed or copied model still hits. To avoid re-hashing large files on
+    every open, the digest is remembered per ``(path, size, mtime)`` in a small
+    index. Least recently used entries are evicted once the cache grows beyond
+    ``max_bytes``.
+    """
+
+    def __init__(self, root: Optional[str | Path] = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self._root = Path(root) if root is not None else default_cache_dir()
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    # region Lookup
+    def key_for(self, path: str | Path, progress: Optional[Callable[[float], None]] = None) -> str:
+        """Return the cache key of a model file, hashing it only when it changed.
+
+        ``progress`` receives the hashed fraction of the file after each chunk.
+        """
+
+        filepath = Path(path).resolve()
+        stat = filepath.stat()
+        index = self._read_index()
+        record = index.get(str(filepath))
+        if record and record.get("size") == stat.st_size and record.get("mtime_ns") == stat.st_mtime_ns:
+            return record["key"]
+        digest = hashlib.blake2b(digest_size=20)
+        hashed = 0
+        with open(filepath, "rb") as handle:
+            for chunk in iter(lambda: handle.read(_HASH_CHUNK), b""):
+                digest.update(chunk)
+                hashed += len(chunk)
+                if progress is not None:
+                    progress(hashed / max(stat.st_size, 1))
+        key = f"v{CACHE_VERSION}-{digest.hexdigest()}"
+        with self._lock:
+            index = self._read_index()
+            index[str(filepath)] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "key": key}
+            self._write_index(index)
+        return key
+
+    def get(self, key: str) -> Optional["MeshGeometry"]:
+        """Return the cached geometry for ``key`` with memory-mapped arrays, if present."""
+
+        entry = self._root / key
+        if not (entry / "vertices.npy").exists():
+            return None
+        try:
+            geometry = self._load_level(entry, "")
+            level = 1
+            while (entry / f"lod{level}_vertices.npy").exists():
+                geometry.lods.append(self._load_level(entry, f"lod{level}_"))
+                level += 1
+            if (entry / f"{_INDEX_PREFIX}order.npy").exists():
+                arrays = {name: np.load(entry / f"{_INDEX_PREFIX}{name}.npy", mmap_mode="r") for name in _INDEX_ARRAYS}
+                geometry.index = MeshIndex.from_arrays(geometry.vertices, geometry.faces, arrays)
+        except (OSError, ValueError) as exc:
+            logger.warning("Discarding unreadable mesh cache entry %s: %s", entry, exc)
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        try:
+            os.utime(entry)
+        except OSError:  # pragma: no cover - best effort LRU bookkeeping
+            pass
+        return geometry
+
+    @staticmethod
+    def _load_level(entry: Path, prefix: str) -> "MeshGeometry":
+        from .model_loader import MeshGeometry
+
+        arrays: Dict[str, Optional[np.ndarray]] = {}
+        for name in _ARRAYS:
+            array_path = entry / f"{prefix}{name}.npy"
+            arrays[name] = np.load(array_path, mmap_mode="r") if array_path.exists() else None
+        return MeshGeometry(vertices=arrays["vertices"], faces=arrays["faces"], normals=arrays["normals"])
+
+    # endregion
+
+    # region Storage
+    def put(self, key: str, geometry: "MeshGeometry") -> None:
+        """Store ``geometry`` under ``key`` and evict old entries if needed."""
+
+        self._root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=self._root))
+        try:
+            for level, mesh in enumerate(geometry.levels):
+                prefix = f"lod{level}_" if level else ""
+                for name in _ARRAYS:
+                    array = getattr(mesh, name)
+                    if array is not None:
+                        np.save(staging / f"{prefix}{name}.npy", np.ascontiguousarray(array))
+            if geometry.index is not None:
+                for name, array in geometry.index.to_arrays().items():
+                    np.save(staging / f"{_INDEX_PREFIX}{name}.npy", array)
+            target = self._root / key
+            try:
+                os.replace(staging, target)
+            except OSError:
+                # Another process stored the same content first.
+                shutil.rmtree(staging, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        self.evict(keep=key)
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Delete least recently used entries until the cache fits ``max_bytes``."""
+
+        entries = self._entries()
+        total = sum(size for _path, size, _used in entries)
+        for entry, size, _used in sorted(entries, key=lambda item: item[2]):
+            if total <= self._max_bytes:
+                break
+            if entry.name == keep:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+            logger.info("Evicted mesh cache entry %s (%d bytes)", entry.name, size)
+
+    @property
+    def size(self) -> int:
+        """Total bytes used by cached meshes."""
+
+        return sum(size for _path, size, _used in self._entries())
+
+    def clear(self) -> None:
+        shutil.rmtree(self._root, ignore_errors=True)
+
+    def _entries(self) -> List[Tuple[Path, int, float]]:
+        if not self._root.exists():
+            return []
+        entries = []
+        for entry in self._root.iterdir():
+            if not entry.is_dir() or entry.name.startswith("."):
+                continue
+            size = sum(item.stat().st_size for item in entry.iterdir())
+            entries.append((entry, size, entry.stat().st_mtime))
+        return entries
+
+    # endregion
+
+    # region Index
+    def _read_index(self) -> Dict[str, Dict[str, object]]:
+        try:
+            with open(self._root / _INDEX_NAME, "r", encoding="utf-8") as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index: Dict[str, Dict[str, object]]) -> None:
+        self._root.mkdir(parents=True, exist_ok=True)
+        temp_path = self._root / f"{_INDEX_NAME}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                json.dump(index, handle)
+            os.replace(temp_path, self._root / _INDEX_NAME)
+        except OSError as exc:  # pragma: no cover - the index is only an optimization
+            logger.warning("Cannot update mesh cache index: %s", exc)
+
+    # endregion
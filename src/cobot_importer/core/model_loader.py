@@ -3,23 +3,115 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Callable, List, Optional
 
 import numpy as np
 import trimesh
 
+from .lod import build_lod_chain, compute_vertex_normals
+from .mesh_cache import MeshCache
+from .spatial import MeshIndex
+
 logger = logging.getLogger(__name__)
 
+# ``progress(fraction, stage)`` with ``fraction`` in [0, 1].
+ProgressCallback = Callable[[float, str], None]
+# ``on_bounds(bounds)`` with ``bounds`` shaped ``(2, 3)`` as ``[min, max]``.
+BoundsCallback = Callable[[np.ndarray], None]
+
+_STL_HEADER = 84
+_STL_FACET = np.dtype([("normal", "<f4", (3,)), ("vertices", "<f4", (3, 3)), ("attributes", "<u2")])
+
+
+VERTEX_DTYPE = np.dtype(np.float32)
+INDEX_DTYPE = np.dtype(np.uint32)
+
+
+def _compact(array: Optional[np.ndarray], dtype: np.dtype) -> Optional[np.ndarray]:
+    """Return ``array`` as a C-contiguous array of ``dtype``, copying only if needed."""
+
+    if array is None:
+        return None
+    if isinstance(array, np.ndarray) and array.dtype == dtype and array.flags.c_contiguous:
+        return array
+    return np.ascontiguousarray(array, dtype=dtype)
+
+
+class LoadCancelled(Exception):
+    """Raised inside a model load when its cancellation was requested."""
+
 
 @dataclass
 class MeshGeometry:
-    """Container for mesh data for rendering."""
+    """Container for mesh data for rendering.
+
+    Vertices and normals are contiguous ``float32`` and faces ``uint32``, the
+    layout OpenGL consumes, so the loader, the cache (which may hand out
+    memory maps) and the renderer share the same buffers without copies.
+    ``lods`` holds progressively coarser versions of the mesh for distant or
+    interactive rendering; it is empty for small meshes. ``index`` is the
+    triangle BVH used for picking and snapping on the full-resolution mesh.
+    """
 
     vertices: np.ndarray
     faces: np.ndarray
     normals: Optional[np.ndarray]
+    lods: List["MeshGeometry"] = field(default_factory=list)
+    index: Optional[MeshIndex] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.vertices = _compact(self.vertices, VERTEX_DTYPE)
+        self.faces = _compact(self.faces, INDEX_DTYPE)
+        self.normals = _compact(self.normals, VERTEX_DTYPE)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the mesh and its LOD levels (mapped or resident)."""
+
+        return sum(
+            array.nbytes
+            for level in self.levels
+            for array in (level.vertices, level.faces, level.normals)
+            if array is not None
+        )
+
+    def build_index(self) -> MeshIndex:
+        """Return the spatial index, building it on first use."""
+
+        if self.index is None:
+            self.index = MeshIndex.build(self.vertices, self.faces)
+        return self.index
+
+    @property
+    def levels(self) -> List["MeshGeometry"]:
+        """The full mesh followed by its LOD levels, finest first."""
+
+        return [self, *self.lods]
+
+    @property
+    def bounds(self) -> np.ndarray:
+        return np.array([self.vertices.min(axis=0), self.vertices.max(axis=0)])
+
+
+class _Reporter:
+    """Maps stage-local progress onto the overall range and checks for cancellation."""
+
+    def __init__(self, progress: Optional[ProgressCallback], cancel: Optional[threading.Event]) -> None:
+        self._progress = progress
+        self._cancel = cancel
+
+    def __call__(self, fraction: float, stage: str) -> None:
+        if self._cancel is not None and self._cancel.is_set():
+            raise LoadCancelled()
+        if self._progress is not None:
+            self._progress(min(max(fraction, 0.0), 1.0), stage)
+
+    def span(self, start: float, stop: float, stage: str) -> Callable[[float], None]:
+        return lambda fraction: self(start + (stop - start) * fraction, stage)
 
 
 class ModelLoader:
@@ -28,7 +120,22 @@ class ModelLoader:
     SUPPORTED_EXTENSIONS = {".stl", ".step", ".stp", ".obj"}
 
     @staticmethod
-    def load_mesh(path: str | Path) -> MeshGeometry:
+    def load_mesh(
+        path: str | Path,
+        cache: Optional[MeshCache] = None,
+        progress: Optional[ProgressCallback] = None,
+        cancel: Optional[threading.Event] = None,
+        on_bounds: Optional[BoundsCallback] = None,
+    ) -> MeshGeometry:
+        """Load and tessellate a model file.
+
+        With a :class:`~.mesh_cache.MeshCache`, a model that was loaded before
+        is served from memory-mapped arrays instead of being parsed again.
+        ``cancel`` is checked between stages (the parser itself cannot be
+        interrupted) and raises :class:`LoadCancelled`. ``on_bounds`` is called
+        before parsing when the bounds can be read cheaply from the file.
+        """
+
         filepath = Path(path)
         if not filepath.exists():
             raise FileNotFoundError(f"Model file not found: {filepath}")
@@ -36,8 +143,96 @@ class ModelLoader:
             raise ValueError(
                 f"Unsupported model format '{filepath.suffix}'. Supported: {sorted(ModelLoader.SUPPORTED_EXTENSIONS)}"
             )
+        report = _Reporter(progress, cancel)
+        report(0.0, "hash")
+        key = None
+        if cache is not None:
+            key = cache.key_for(filepath, progress=report.span(0.0, 0.2, "hash"))
+            geometry = cache.get(key)
+            if geometry is not None:
+                logger.info("Loaded mesh from cache: %s", filepath)
+                report(1.0, "done")
+                return geometry
+
+        if on_bounds is not None:
+            bounds = ModelLoader.peek_bounds(filepath)
+            if bounds is not None:
+                on_bounds(bounds)
+        report(0.2, "parse")
+        geometry = ModelLoader._parse(filepath)
+        report(0.6, "lod")
+        geometry.lods = build_lod_chain(geometry)
+        report(0.75, "index")
+        geometry.build_index()
+        report(0.9, "cache")
+        if cache is not None and key is not None:
+            try:
+                cache.put(key, geometry)
+            except OSError as exc:
+                logger.warning("Cannot store mesh in cache %s: %s", cache.root, exc)
+        report(1.0, "done")
+        return geometry
+
+    @staticmethod
+    def peek_bounds(path: str | Path) -> Optional[np.ndarray]:
+        """Return ``[min, max]`` corners without tessellating, when the format allows it.
 
+        Only binary STL files are supported; other formats return ``None``.
+        """
+
+        facets = ModelLoader._map_binary_stl(Path(path))
+        if facets is None:
+            return None
+        vertices = facets["vertices"].reshape(-1, 3)
+        return np.array([vertices.min(axis=0), vertices.max(axis=0)], dtype=float)
+
+    @staticmethod
+    def _map_binary_stl(filepath: Path) -> Optional[np.ndarray]:
+        """Memory-map the facet records of a binary STL file, or return ``None``."""
+
+        if filepath.suffix.lower() != ".stl":
+            return None
+        size = filepath.stat().st_size
+        if size < _STL_HEADER:
+            return None
+        with open(filepath, "rb") as handle:
+            handle.seek(80)
+            count = int(np.frombuffer(handle.read(4), dtype="<u4")[0])
+        if count == 0 or size != _STL_HEADER + count * _STL_FACET.itemsize:
+            return None
+        return np.memmap(filepath, dtype=_STL_FACET, mode="r", offset=_STL_HEADER, shape=(count,))
+
+    @staticmethod
+    def _read_binary_stl(facets: np.ndarray) -> MeshGeometry:
+        """Build an indexed mesh from STL facets by merging bit-identical corners.
+
+        This avoids trimesh's float64 intermediates, which dominate peak memory
+        for large STL files.
+        """
+
+        corners = np.ascontiguousarray(facets["vertices"], dtype=VERTEX_DTYPE).reshape(-1, 3)
+        # Compare bit patterns, folding -0.0 onto 0.0.
+        bits = np.where(corners == 0, np.uint32(0), corners.view(np.uint32))
+        order = np.lexsort((bits[:, 2], bits[:, 1], bits[:, 0]))
+        ordered = bits[order]
+        del bits
+        first = np.empty(len(ordered), dtype=bool)
+        first[0] = True
+        np.any(ordered[1:] != ordered[:-1], axis=1, out=first[1:])
+        del ordered
+        inverse = np.empty(len(order), dtype=INDEX_DTYPE)
+        inverse[order] = np.cumsum(first, dtype=np.int64) - 1
+        vertices = corners[order[first]]
+        del corners, order
+        faces = inverse.reshape(-1, 3)
+        return MeshGeometry(vertices=vertices, faces=faces, normals=compute_vertex_normals(vertices, faces))
+
+    @staticmethod
+    def _parse(filepath: Path) -> MeshGeometry:
         logger.info("Loading mesh: %s", filepath)
+        facets = ModelLoader._map_binary_stl(filepath)
+        if facets is not None:
+            return ModelLoader._read_binary_stl(facets)
         mesh = trimesh.load_mesh(filepath, force='mesh')
         if mesh.is_empty:
             raise ValueError("Loaded mesh is empty")
@@ -45,7 +240,71 @@ class ModelLoader:
         if not isinstance(mesh, trimesh.Trimesh):
             mesh = mesh.as_trimesh()
 
-        vertices = np.array(mesh.vertices, dtype=float)
-        faces = np.array(mesh.faces, dtype=int)
-        normals = np.array(mesh.vertex_normals, dtype=float) if mesh.vertex_normals is not None else None
+        vertices = _compact(mesh.vertices, VERTEX_DTYPE)
+        faces = _compact(mesh.faces, INDEX_DTYPE)
+        # Release trimesh's float64/int64 arrays before computing normals.
+        del mesh
+        normals = compute_vertex_normals(vertices, faces)
         return MeshGeometry(vertices=vertices, faces=faces, normals=normals)
+
+
+class MeshLoadTask:
+    """Handle of a model load running on an :class:`AsyncModelLoader`."""
+
+    def __init__(self, path: Path, future: Future, cancel_event: threading.Event) -> None:
+        self.path = path
+        self._future = future
+        self._cancel_event = cancel_event
+
+    def cancel(self) -> None:
+        """Request cancellation; the task finishes with :class:`LoadCancelled`."""
+
+        self._cancel_event.set()
+        self._future.cancel()
+
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def done(self) -> bool:
+        return self._future.done()
+
+    def result(self, timeout: Optional[float] = None) -> MeshGeometry:
+        return self._future.result(timeout)
+
+    def add_done_callback(self, callback: Callable[["MeshLoadTask"], None]) -> None:
+        self._future.add_done_callback(lambda _future: callback(self))
+
+    def exception(self) -> Optional[BaseException]:
+        """Return the failure of a finished task (``LoadCancelled`` when cancelled)."""
+
+        if self._future.cancelled():
+            return LoadCancelled()
+        return self._future.exception()
+
+
+class AsyncModelLoader:
+    """Run :meth:`ModelLoader.load_mesh` on worker threads.
+
+    Callbacks are invoked from the worker thread; GUI code should forward
+    them through queued signals.
+    """
+
+    def __init__(self, cache: Optional[MeshCache] = None, max_workers: int = 1) -> None:
+        self._cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="model-loader")
+
+    def submit(
+        self,
+        path: str | Path,
+        progress: Optional[ProgressCallback] = None,
+        on_bounds: Optional[BoundsCallback] = None,
+    ) -> MeshLoadTask:
+        filepath = Path(path)
+        cancel_event = threading.Event()
+        future = self._executor.submit(
+            ModelLoader.load_mesh, filepath, self._cache, progress, cancel_event, on_bounds
+        )
+        return MeshLoadTask(filepath, future, cancel_event)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,487 @@
+"""Columnar storage for path waypoints."""
+
+from __future__ import annotations
+
+from collections.abc import MutableSequence
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, overload
+
+import numpy as np
+
+from .changes import next_revision
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .project import IOEvent, PathPoint
+
+POSE_FIELDS: Tuple[str, ...] = ("x", "y", "z", "rx", "ry", "rz")
+
+
+class _PoseField:
+    """Descriptor exposing one pose column of a :class:`PointView`."""
+
+    def __init__(self, column: int) -> None:
+        self._column = column
+
+    def __get__(self, view: Optional["PointView"], owner: type) -> Any:
+        if view is None:
+            return self
+        return float(view._store._data[view._store._check_index(view._index), self._column])
+
+    def __set__(self, view: "PointView", value: float) -> None:
+        view._store.set_value(view._index, self._column, value)
+
+
+class PointView:
+    """Live ``PathPoint``-compatible view onto one row of a :class:`PointStore`.
+
+    Views are positional: inserting or removing rows before ``index`` makes the
+    view refer to a different waypoint.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    x = _PoseField(0)
+    y = _PoseField(1)
+    z = _PoseField(2)
+    rx = _PoseField(3)
+    ry = _PoseField(4)
+    rz = _PoseField(5)
+
+    def __init__(self, store: "PointStore", index: int) -> None:
+        self._store = store
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def io_events(self) -> Tuple[IOEvent, ...]:
+        return self._store.events_at(self._index)
+
+    @io_events.setter
+    def io_events(self, events: Iterable[IOEvent]) -> None:
+        self._store.set_events(self._index, events)
+
+    def to_point(self) -> "PathPoint":
+        from .project import PathPoint
+
+        x, y, z, rx, ry, rz = self._store.poses[self._store._check_index(self._index)].tolist()
+        events = list(self._store.events_at(self._index))
+        return PathPoint(x, y, z, rx, ry, rz, io_events=events)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.to_point().to_dict()
+
+    def __eq__(self, other: object) -> bool:
+        if hasattr(other, "io_events") and all(hasattr(other, name) for name in POSE_FIELDS):
+            return all(getattr(self, name) == getattr(other, name) for name in POSE_FIELDS) and list(
+                self.io_events
+            ) == list(other.io_events)  # type: ignore[attr-defined]
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in POSE_FIELDS)
+        return f"PointView(index={self._index}, {values})"
+
+
+PointLike = Union["PathPoint", PointView]
+
+
+class PointStore(MutableSequence):
+    """Waypoints stored as an ``(N, 6)`` pose array plus a sparse IO event table.
+
+    The store behaves like the former ``List[PathPoint]`` (indexing yields
+    :class:`PointView` objects) while :attr:`poses`, :attr:`positions` and
+    :attr:`orientations` give zero-copy array access for bulk consumers. The
+    arrays are read-only views by convention: mutate through the store so
+    copy-on-write sharing (see :meth:`copy`) and :attr:`revision` stay intact.
+    """
+
+    _MIN_CAPACITY = 16
+
+    def __init__(self, points: Iterable[PointLike] = ()) -> None:
+        self._data = np.empty((self._MIN_CAPACITY, 6), dtype=float)
+        self._size = 0
+        self._events: Dict[int, List[IOEvent]] = {}
+        self._source: Optional[str] = None
+        self._shared = False
+        self._revision = next_revision()
+        self.extend(points)
+
+    # region Construction
+    @classmethod
+    def from_array(
+        cls, poses: np.ndarray, io_events: Optional[Dict[int, List[IOEvent]]] = None
+    ) -> "PointStore":
+        """Build a store from an ``(N, 3)`` or ``(N, 6)`` array of poses."""
+
+        store = cls()
+        store.extend_array(poses)
+        for index, events in (io_events or {}).items():
+            store.set_events(index, events)
+        return store
+
+    @classmethod
+    def from_mapped(
+        cls, poses: np.ndarray, io_events: Optional[Dict[int, List[IOEvent]]] = None, source: Optional[str] = None
+    ) -> "PointStore":
+        """Wrap an existing ``(N, 6)`` array (typically a memory map) without copying.
+
+        Writes go to the wrapped array; growing the store moves the data into
+        memory owned by the store.
+        """
+
+        store = cls()
+        store._data = poses
+        store._size = len(poses)
+        store._source = source
+        store._touch()
+        for index, events in (io_events or {}).items():
+            store.set_events(index, events)
+        return store
+
+    @classmethod
+    def from_dicts(cls, items: Sequence[Dict[str, Any]]) -> "PointStore":
+        from .project import IOEvent
+
+        poses = np.array([[item.get(name, 0.0) for name in POSE_FIELDS] for item in items], dtype=float)
+        events = {
+            index: [IOEvent.from_dict(evt) for evt in item["io_events"]]
+            for index, item in enumerate(items)
+            if item.get("io_events")
+        }
+        return cls.from_array(poses.reshape(-1, 6), events)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        items: List[Dict[str, Any]] = []
+        for index, values in enumerate(self.poses.tolist()):
+            item: Dict[str, Any] = dict(zip(POSE_FIELDS, values))
+            item["io_events"] = [event.to_dict() for event in self._events.get(index, ())]
+            items.append(item)
+        return items
+
+    def to_list(self) -> List["PathPoint"]:
+        """Materialize the store as independent ``PathPoint`` objects."""
+
+        return [view.to_point() for view in self]
+
+    def copy(self) -> "PointStore":
+        """Return a copy-on-write copy.
+
+        Both stores share the pose buffer until either of them is modified, so
+        copying costs O(events) rather than O(points).
+        """
+
+        clone = PointStore()
+        clone._data = self._data
+        clone._size = self._size
+        clone._source = self._source
+        clone._events = self.event_items()
+        clone._shared = self._shared = True
+        clone._revision = self._revision
+        return clone
+
+    # endregion
+
+    # region Array access
+    @property
+    def poses(self) -> np.ndarray:
+        """``(N, 6)`` view of ``x, y, z, rx, ry, rz`` for every waypoint."""
+
+        return self._data[: self._size]
+
+    @property
+    def positions(self) -> np.ndarray:
+        """``(N, 3)`` view of the waypoint positions."""
+
+        return self._data[: self._size, :3]
+
+    @property
+    def orientations(self) -> np.ndarray:
+        """``(N, 3)`` view of the waypoint rotation vectors."""
+
+        return self._data[: self._size, 3:]
+
+    @property
+    def nbytes(self) -> int:
+        return int(self._data.nbytes)
+
+    @property
+    def revision(self) -> int:
+        """Revision number that increases whenever poses or events change.
+
+        Copies made with :meth:`copy` keep the revision of their source, so
+        caches keyed by revision remain valid for snapshots.
+        """
+
+        return self._revision
+
+    @property
+    def source(self) -> Optional[str]:
+        """Path of the file the pose array is mapped from, if any."""
+
+        return self._source
+
+    def detach(self) -> None:
+        """Copy mapped pose data into memory owned by the store."""
+
+        if self._source is None:
+            return
+        data = np.empty((max(self._size, self._MIN_CAPACITY), 6), dtype=float)
+        data[: self._size] = self._data[: self._size]
+        self._data = data
+        self._source = None
+        self._shared = False
+
+    def set_value(self, index: int, column: int, value: float) -> None:
+        index = self._check_index(index)
+        self._make_writable()
+        self._data[index, column] = value
+        self._touch()
+
+    def set_rows(self, start: int, values: np.ndarray) -> None:
+        """Overwrite consecutive rows beginning at ``start`` with ``values``."""
+
+        values = self._as_pose_array(values)
+        stop = start + len(values)
+        if start < 0 or stop > self._size:
+            raise IndexError(f"Rows {start}:{stop} are out of range for {self._size} points")
+        self._make_writable()
+        self._data[start:stop, : values.shape[1]] = values
+        self._touch()
+
+    def extend_array(self, poses: np.ndarray) -> None:
+        self.insert_array(self._size, poses)
+
+    def insert_array(self, index: int, poses: np.ndarray, io_events: Optional[Dict[int, List[IOEvent]]] = None) -> None:
+        """Insert ``poses`` before ``index``; event keys are relative to ``index``."""
+
+        poses = self._as_pose_array(poses)
+        count = len(poses)
+        index = self._clamp_insert_index(index)
+        if count == 0:
+            return
+        self._reserve(self._size + count)
+        self._make_writable()
+        self._data[index + count : self._size + count] = self._data[index : self._size]
+        self._data[index : index + count] = 0.0
+        self._data[index : index + count, : poses.shape[1]] = poses
+        self._size += count
+        self._shift_events(index, count)
+        self._touch()
+        for offset, events in (io_events or {}).items():
+            self.set_events(index + offset, events)
+
+    def insert_rows(
+        self, rows: Iterable[int], poses: np.ndarray, io_events: Optional[Dict[int, List[IOEvent]]] = None
+    ) -> None:
+        """Insert ``poses`` so that they end up at the (final) indices ``rows``.
+
+        This is the inverse of :meth:`delete_rows`; ``io_events`` is keyed by
+        final row index.
+        """
+
+        indices = np.asarray(list(rows), dtype=np.int64)
+        poses = self._as_pose_array(poses)
+        if len(indices) != len(poses):
+            raise ValueError("Row count does not match pose count")
+        if indices.size == 0:
+            return
+        order = np.argsort(indices, kind="stable")
+        indices, poses = indices[order], poses[order]
+        total = self._size + len(indices)
+        if indices[0] < 0 or indices[-1] >= total or np.any(np.diff(indices) == 0):
+            raise IndexError("Insert rows are out of range or repeated")
+        inserted = np.zeros(total, dtype=bool)
+        inserted[indices] = True
+        data = np.zeros((max(total, self._MIN_CAPACITY, len(self._data) if self._source is None else 0), 6))
+        data[:total][~inserted] = self._data[: self._size]
+        data[indices, : poses.shape[1]] = poses
+        if self._events:
+            old_to_new = np.flatnonzero(~inserted)
+            self._events = {int(old_to_new[index]): events for index, events in self._events.items()}
+        self._data = data
+        self._size = total
+        self._source = None
+        self._shared = False
+        self._touch()
+        for index, events in (io_events or {}).items():
+            self.set_events(index, events)
+
+    def delete_rows(self, rows: Iterable[int]) -> None:
+        """Remove several rows at once."""
+
+        indices = np.unique(np.asarray(list(rows), dtype=np.int64))
+        if indices.size == 0:
+            return
+        if indices[0] < 0 or indices[-1] >= self._size:
+            raise IndexError("Point index out of range")
+        keep = np.ones(self._size, dtype=bool)
+        keep[indices] = False
+        remaining = int(keep.sum())
+        self._make_writable()
+        self._data[:remaining] = self._data[: self._size][keep]
+        self._size = remaining
+        self._touch()
+        if self._events:
+            new_index = np.cumsum(keep) - 1
+            self._events = {
+                int(new_index[index]): events for index, events in self._events.items() if keep[index]
+            }
+
+    # endregion
+
+    # region IO events
+    def events_at(self, index: int) -> Tuple[IOEvent, ...]:
+        """Return the events of a waypoint (empty for most waypoints).
+
+        The result is read-only; change events with :meth:`set_events`, which
+        also bumps :attr:`revision`.
+        """
+
+        index = self._check_index(index)
+        return tuple(self._events.get(index, ()))
+
+    def set_events(self, index: int, events: Iterable[IOEvent]) -> None:
+        index = self._check_index(index)
+        events = list(events)
+        if events:
+            self._events[index] = events
+        else:
+            self._events.pop(index, None)
+        self._touch()
+
+    def event_items(self) -> Dict[int, List[IOEvent]]:
+        """Return the non-empty event lists keyed by waypoint index."""
+
+        return {index: list(events) for index, events in sorted(self._events.items()) if events}
+
+    # endregion
+
+    # region MutableSequence protocol
+    def __len__(self) -> int:
+        return self._size
+
+    @overload
+    def __getitem__(self, index: int) -> PointView:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[PointView]:
+        ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[PointView, List[PointView]]:
+        if isinstance(index, slice):
+            return [PointView(self, row) for row in range(*index.indices(self._size))]
+        return PointView(self, self._check_index(index))
+
+    def __setitem__(self, index: Union[int, slice], value: Any) -> None:
+        if isinstance(index, slice):
+            rows = range(*index.indices(self._size))
+            values = list(value)
+            if index.step not in (None, 1) or len(rows) != len(values):
+                raise ValueError("Only contiguous slice assignment of equal length is supported")
+            for row, point in zip(rows, values):
+                self[row] = point
+            return
+        row = self._check_index(index)
+        self._make_writable()
+        self._data[row] = [getattr(value, name) for name in POSE_FIELDS]
+        self._touch()
+        self.set_events(row, list(value.io_events))
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        if isinstance(index, slice):
+            self.delete_rows(range(*index.indices(self._size)))
+        else:
+            self.delete_rows([self._check_index(index)])
+
+    def __iter__(self) -> Iterator[PointView]:
+        for row in range(self._size):
+            yield PointView(self, row)
+
+    def insert(self, index: int, value: PointLike) -> None:
+        pose = np.array([[getattr(value, name) for name in POSE_FIELDS]], dtype=float)
+        index = self._clamp_insert_index(index)
+        self.insert_array(index, pose, {0: list(value.io_events)})
+
+    def extend(self, values: Iterable[PointLike]) -> None:
+        if isinstance(values, PointStore):
+            self.insert_array(self._size, values.poses.copy(), values.event_items())
+            return
+        values = list(values)
+        if not values:
+            return
+        poses = np.array([[getattr(point, name) for name in POSE_FIELDS] for point in values], dtype=float)
+        events = {offset: list(point.io_events) for offset, point in enumerate(values) if point.io_events}
+        self.insert_array(self._size, poses, events)
+
+    def clear(self) -> None:
+        self._data = np.empty((self._MIN_CAPACITY, 6), dtype=float)
+        self._size = 0
+        self._events.clear()
+        self._source = None
+        self._shared = False
+        self._touch()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PointStore):
+            return np.array_equal(self.poses, other.poses) and self.event_items() == other.event_items()
+        if isinstance(other, list):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PointStore(size={self._size}, events={len(self.event_items())})"
+
+    # endregion
+
+    # region Internals
+    def _check_index(self, index: int) -> int:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(f"Point index {index} is out of range")
+        return index
+
+    def _clamp_insert_index(self, index: int) -> int:
+        if index < 0:
+            index = max(index + self._size, 0)
+        return min(index, self._size)
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= len(self._data):
+            return
+        new_capacity = max(capacity, len(self._data) * 2, self._MIN_CAPACITY)
+        data = np.empty((new_capacity, 6), dtype=float)
+        data[: self._size] = self._data[: self._size]
+        self._data = data
+        self._source = None
+        self._shared = False
+
+    def _touch(self) -> None:
+        self._revision = next_revision()
+
+    def _make_writable(self) -> None:
+        if self._shared:
+            data = np.empty(self._data.shape, dtype=float)
+            data[: self._size] = self._data[: self._size]
+            self._data = data
+            self._source = None
+            self._shared = False
+
+    def _shift_events(self, index: int, count: int) -> None:
+        if not self._events:
+            return
+        self._events = {(key + count if key >= index else key): events for key, events in self._events.items()}
+
+    @staticmethod
+    def _as_pose_array(values: np.ndarray) -> np.ndarray:
+        array = np.asarray(values, dtype=float)
+        if array.ndim == 1:
+            array = array.reshape(1, -1) if array.size else array.reshape(0, 6)
+        if array.ndim != 2 or array.shape[1] not in (3, 6):
+            raise ValueError(f"Expected an (N, 3) or (N, 6) pose array, got shape {array.shape}")
+        return array
+
+    # endregion
@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
+import copy
+from dataclasses import dataclass, field, asdict, replace
 from enum import Enum
-from typing import List, Optional, Dict, Any
+from typing import Any, Dict, List, Optional
+
+from .changes import new_id, next_revision
+from .points import PointStore
 
 
 class IOType(str, Enum):
@@ -78,46 +82,95 @@ class PathPoint:
 
 @dataclass
 class PathSegment:
-    """A user-defined path over the workpiece."""
+    """A user-defined path over the workpiece.
+
+    ``points`` is always a :class:`PointStore`; lists of ``PathPoint`` assigned
+    to it are converted on the fly. ``id`` is stable across saves and unique
+    within a project, unlike ``name``.
+    """
 
     name: str
-    points: List[PathPoint] = field(default_factory=list)
+    points: PointStore = field(default_factory=PointStore)
     speed: float = 100.0
     point_density: float = 1.0
     blend_radius: float = 0.0
     retract_height: float = 10.0
     approach_height: float = 10.0
+    tool_offset: float = 0.0
     enabled: bool = True
+    id: str = field(default_factory=new_id, compare=False)
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
+    @property
+    def revision(self) -> int:
+        """Revision that increases whenever parameters or points change."""
+
+        return max(self._params_revision, self.points.revision)
+
+    @property
+    def params_revision(self) -> int:
+        """Revision of the scalar parameters (and of the ``points`` binding)."""
+
+        return self._params_revision
+
+    def to_dict(self, include_points: bool = True) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "id": self.id,
             "name": self.name,
-            "points": [point.to_dict() for point in self.points],
             "speed": self.speed,
             "point_density": self.point_density,
             "blend_radius": self.blend_radius,
             "retract_height": self.retract_height,
             "approach_height": self.approach_height,
+            "tool_offset": self.tool_offset,
             "enabled": self.enabled,
         }
+        if include_points:
+            data["points"] = self.points.to_dicts()
+        return data
 
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> "PathSegment":
         return PathSegment(
             name=data.get("name", "Path"),
-            points=[PathPoint.from_dict(point) for point in data.get("points", [])],
+            points=PointStore.from_dicts(data.get("points", [])),
             speed=data.get("speed", 100.0),
             point_density=data.get("point_density", 1.0),
             blend_radius=data.get("blend_radius", 0.0),
             retract_height=data.get("retract_height", 10.0),
             approach_height=data.get("approach_height", 10.0),
+            tool_offset=data.get("tool_offset", 0.0),
             enabled=data.get("enabled", True),
+            id=data.get("id") or new_id(),
         )
 
+    def copy(self, keep_id: bool = True) -> "PathSegment":
+        """Return an independent copy; point data is shared copy-on-write.
+
+        With ``keep_id`` the copy is a snapshot that keeps the id and revision;
+        otherwise it is a new segment with a fresh id.
+        """
+
+        if not keep_id:
+            return replace(self, points=self.points.copy(), id=new_id())
+        clone = replace(self, points=self.points.copy())
+        object.__setattr__(clone, "_params_revision", self._params_revision)
+        return clone
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name == "points" and not isinstance(value, PointStore):
+            value = PointStore(value)
+        super().__setattr__(name, value)
+        if name != "id":
+            super().__setattr__("_params_revision", next_revision())
+
 
 @dataclass
 class Project:
-    """Represents an entire planning project."""
+    """Represents an entire planning project.
+
+    :attr:`revision` increases with every change to the project or any of its
+    segments; editors call :meth:`touch` after restructuring ``paths``.
+    """
 
     name: str = "New Project"
     model_path: Optional[str] = None
@@ -131,14 +184,33 @@ class Project:
     )
     paths: List[PathSegment] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Sequence number of the last edit journal record contained in this state.
+    journal_seq: int = field(default=0, compare=False, repr=False)
+    id: str = field(default_factory=new_id, compare=False)
 
-    def to_dict(self) -> Dict[str, Any]:
+    @property
+    def revision(self) -> int:
+        return max([self._revision, *(path.revision for path in self.paths)])
+
+    def touch(self) -> None:
+        """Record a change that attribute tracking cannot see, such as list edits."""
+
+        object.__setattr__(self, "_revision", next_revision())
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if name not in ("id", "journal_seq"):
+            self.touch()
+
+    def to_dict(self, include_points: bool = True) -> Dict[str, Any]:
         return {
+            "id": self.id,
             "name": self.name,
             "model_path": self.model_path,
             "model_transform": self.model_transform,
-            "paths": [path.to_dict() for path in self.paths],
+            "paths": [path.to_dict(include_points) for path in self.paths],
             "metadata": self.metadata,
+            "journal_seq": self.journal_seq,
         }
 
     @staticmethod
@@ -155,7 +227,25 @@ class Project:
             ],
             paths=[PathSegment.from_dict(path) for path in data.get("paths", [])],
             metadata=data.get("metadata", {}),
+            journal_seq=data.get("journal_seq", 0),
+            id=data.get("id") or new_id(),
+        )
+
+    def copy(self) -> "Project":
+        """Return an independent copy that can be serialized from another thread.
+
+        Segments are copied with :meth:`PathSegment.copy`, so this costs
+        O(segments) rather than O(points).
+        """
+
+        clone = replace(
+            self,
+            model_transform=copy.deepcopy(self.model_transform),
+            paths=[path.copy() for path in self.paths],
+            metadata=copy.deepcopy(self.metadata),
         )
+        object.__setattr__(clone, "_revision", self._revision)
+        return clone
 
     def ensure_path(self, index: int) -> PathSegment:
         try:
@@ -166,15 +256,18 @@ class Project:
     def add_path(self, segment: Optional[PathSegment] = None) -> PathSegment:
         segment = segment or PathSegment(name=f"Path {len(self.paths) + 1}")
         self.paths.append(segment)
+        self.touch()
         return segment
 
     def remove_path(self, index: int) -> None:
         self.ensure_path(index)
         del self.paths[index]
+        self.touch()
 
     def clone_path(self, index: int) -> PathSegment:
         path = self.ensure_path(index)
-        cloned = PathSegment.from_dict(path.to_dict())
+        cloned = path.copy(keep_id=False)
         cloned.name = f"{path.name} Copy"
         self.paths.insert(index + 1, cloned)
+        self.touch()
         return cloned
@@ -0,0 +1,117 @@
+"""Projection of waypoints onto the workpiece surface."""
+
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from .rotations import rotation_vectors_from_normals
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .model_loader import MeshGeometry
+    from .project import PathSegment
+
+logger = logging.getLogger(__name__)
+
+# Points per task handed to the worker threads.
+PROJECTION_CHUNK = 8192
+# Vertex normals deviating more than this from the face normal (about 20°)
+# belong to a sharp edge and are replaced by the face normal.
+CREASE_COSINE = 0.94
+
+
+@dataclass
+class SurfaceProjection:
+    """Closest surface points with their unit normals and triangle ids."""
+
+    points: np.ndarray
+    normals: np.ndarray
+    faces: np.ndarray
+    distances: np.ndarray
+
+
+def project_points(
+    geometry: "MeshGeometry", points: np.ndarray, workers: Optional[int] = None
+) -> SurfaceProjection:
+    """Project ``(N, 3)`` points onto the closest point of the mesh surface.
+
+    Normals are interpolated from the vertex normals, except across sharp
+    edges where the face normal is used. Chunks are queried on ``workers`` threads, one per CPU by
+    default; the numpy kernels release the GIL, so the chunks run in parallel.
+    """
+
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    index = geometry.build_index()
+    if len(points) == 0:
+        empty = np.empty((0, 3))
+        return SurfaceProjection(empty, empty.copy(), np.empty(0, dtype=np.int64), np.empty(0))
+    chunks = [points[start : start + PROJECTION_CHUNK] for start in range(0, len(points), PROJECTION_CHUNK)]
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="projection") as executor:
+            results = list(executor.map(index.nearest_surface, chunks))
+    else:
+        results = [index.nearest_surface(chunk) for chunk in chunks]
+    closest = np.concatenate([result.points for result in results])
+    faces = np.concatenate([result.faces for result in results])
+    distances = np.concatenate([result.distances for result in results])
+    logger.debug("Projected %d points on %d threads", len(points), workers)
+    return SurfaceProjection(closest, surface_normals(geometry, closest, faces), faces, distances)
+
+
+def project_segment(
+    segment: "PathSegment", geometry: "MeshGeometry", orient: bool = False, workers: Optional[int] = None
+) -> np.ndarray:
+    """Return the ``(N, 6)`` poses of ``segment`` moved onto the mesh surface.
+
+    With ``orient`` the rotation vectors are replaced so the tool axis points
+    against the surface normal; otherwise the orientations are kept. The
+    segment itself is not modified.
+    """
+
+    poses = np.array(segment.points.poses, dtype=float)
+    if len(poses) == 0:
+        return poses
+    projection = project_points(geometry, poses[:, :3], workers=workers)
+    poses[:, :3] = projection.points
+    if orient:
+        poses[:, 3:] = rotation_vectors_from_normals(projection.normals)
+    return poses
+
+
+def surface_normals(geometry: "MeshGeometry", points: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """Unit normals at ``points`` lying on the given mesh ``faces``."""
+
+    corners = np.asarray(geometry.faces[faces], dtype=np.int64)
+    triangles = np.asarray(geometry.vertices[corners], dtype=float)
+    edge1 = triangles[:, 1] - triangles[:, 0]
+    edge2 = triangles[:, 2] - triangles[:, 0]
+    face_normals = np.cross(edge1, edge2)
+    face_lengths = np.linalg.norm(face_normals, axis=1, keepdims=True)
+    face_normals = np.divide(face_normals, face_lengths, out=np.zeros_like(face_normals), where=face_lengths > 0)
+    if geometry.normals is None:
+        normals = face_normals
+    else:
+        # Barycentric interpolation of the vertex normals.
+        offset = points - triangles[:, 0]
+        d00 = np.einsum("ij,ij->i", edge1, edge1)
+        d01 = np.einsum("ij,ij->i", edge1, edge2)
+        d11 = np.einsum("ij,ij->i", edge2, edge2)
+        d20 = np.einsum("ij,ij->i", offset, edge1)
+        d21 = np.einsum("ij,ij->i", offset, edge2)
+        denom = d00 * d11 - d01 * d01
+        with np.errstate(divide="ignore", invalid="ignore"):
+            v = np.where(denom != 0, (d11 * d20 - d01 * d21) / denom, 1.0 / 3.0)
+            w = np.where(denom != 0, (d00 * d21 - d01 * d20) / denom, 1.0 / 3.0)
+        weights = np.stack([1.0 - v - w, v, w], axis=1)
+        vertex_normals = np.asarray(geometry.normals[corners], dtype=float)
+        crease = np.einsum("ijk,ik->ij", vertex_normals, face_normals) < CREASE_COSINE
+        vertex_normals[crease] = np.repeat(face_normals[:, None], 3, axis=1)[crease]
+        normals = np.einsum("ij,ijk->ik", weights, vertex_normals)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
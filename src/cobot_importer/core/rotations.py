@@ -0,0 +1,125 @@
+"""Batched orientation helpers for waypoint rotation vectors.
+
+Quaternions are stored as ``(w, x, y, z)`` rows.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+# Tool frame axis that points out of the flange towards the workpiece.
+TOOL_AXIS = np.array([0.0, 0.0, 1.0])
+
+
+def rotation_vectors_from_normals(normals: np.ndarray) -> np.ndarray:
+    """Rotation vectors that turn the tool axis against each surface normal.
+
+    The result is the shortest rotation taking :data:`TOOL_AXIS` to ``-normal``,
+    i.e. the tool approaches the surface head-on, in the same axis-angle form
+    (radians) as the waypoints' ``rx, ry, rz``. For a normal along ``-z`` no
+    rotation is needed; for ``+z`` a half turn about ``x`` is used.
+    """
+
+    targets = -np.atleast_2d(np.asarray(normals, dtype=float))
+    lengths = np.linalg.norm(targets, axis=1, keepdims=True)
+    targets = np.divide(targets, lengths, out=np.tile(TOOL_AXIS, (len(targets), 1)), where=lengths > 0)
+    axes = np.cross(TOOL_AXIS, targets)
+    sines = np.linalg.norm(axes, axis=1)
+    cosines = targets @ TOOL_AXIS
+    angles = np.arctan2(sines, cosines)
+    result = np.zeros_like(targets)
+    turning = sines > 1e-12
+    result[turning] = axes[turning] / sines[turning, None] * angles[turning, None]
+    flipped = ~turning & (cosines < 0)
+    result[flipped] = [np.pi, 0.0, 0.0]
+    return result
+
+
+def rotation_matrices(rotation_vectors: np.ndarray) -> np.ndarray:
+    """``(N, 3, 3)`` rotation matrices of ``(N, 3)`` rotation vectors (Rodrigues)."""
+
+    vectors = np.atleast_2d(np.asarray(rotation_vectors, dtype=float))
+    angles = np.linalg.norm(vectors, axis=1)
+    axes = np.divide(vectors, angles[:, None], out=np.zeros_like(vectors), where=angles[:, None] > 0)
+    skew = _skew(axes)
+    sines = np.sin(angles)[:, None, None]
+    cosines = np.cos(angles)[:, None, None]
+    return np.eye(3) + sines * skew + (1.0 - cosines) * (skew @ skew)
+
+
+def _skew(vectors: np.ndarray) -> np.ndarray:
+    """``(N, 3, 3)`` cross-product matrices of ``(N, 3)`` vectors."""
+
+    x, y, z = vectors.T
+    zero = np.zeros_like(x)
+    return np.stack([zero, -z, y, z, zero, -x, -y, x, zero], axis=1).reshape(-1, 3, 3)
+
+
+# region Quaternions
+def quaternions_from_rotation_vectors(rotation_vectors: np.ndarray) -> np.ndarray:
+    """``(N, 4)`` unit quaternions ``(w, x, y, z)`` of ``(N, 3)`` rotation vectors."""
+
+    vectors = np.atleast_2d(np.asarray(rotation_vectors, dtype=float))
+    angles = np.linalg.norm(vectors, axis=1)
+    # sin(angle / 2) / angle, continued by its limit 1/2 at zero.
+    scales = np.divide(np.sin(0.5 * angles), angles, out=np.full_like(angles, 0.5), where=angles > 1e-12)
+    return np.hstack([np.cos(0.5 * angles)[:, None], vectors * scales[:, None]])
+
+
+def rotation_vectors_from_quaternions(quaternions: np.ndarray) -> np.ndarray:
+    """``(N, 3)`` rotation vectors with angles in ``[0, pi]`` of ``(N, 4)`` quaternions ``(w, x, y, z)``."""
+
+    quaternions = np.atleast_2d(np.asarray(quaternions, dtype=float))
+    # q and -q are the same rotation; the positive-w one has the shorter angle.
+    quaternions = np.where(quaternions[:, :1] < 0, -quaternions, quaternions)
+    sines = np.linalg.norm(quaternions[:, 1:], axis=1)
+    angles = 2.0 * np.arctan2(sines, quaternions[:, 0])
+    scales = np.divide(angles, sines, out=np.full_like(angles, 2.0), where=sines > 1e-12)
+    return quaternions[:, 1:] * scales[:, None]
+
+
+def canonical_rotation_vectors(rotation_vectors: np.ndarray) -> np.ndarray:
+    """The same rotations with angles wrapped into ``[0, pi]``; vectors already in range are returned unchanged."""
+
+    vectors = np.atleast_2d(np.asarray(rotation_vectors, dtype=float))
+    angles = np.linalg.norm(vectors, axis=1)
+    wrapped = np.mod(angles + np.pi, 2.0 * np.pi) - np.pi
+    scales = np.divide(wrapped, angles, out=np.ones_like(angles), where=angles > np.pi)
+    return vectors * scales[:, None]
+
+
+def quaternion_matrices(quaternions: np.ndarray) -> np.ndarray:
+    """``(N, 3, 3)`` rotation matrices of ``(N, 4)`` quaternions ``(w, x, y, z)``."""
+
+    quaternions = np.atleast_2d(np.asarray(quaternions, dtype=float))
+    quaternions = quaternions / np.linalg.norm(quaternions, axis=1, keepdims=True)
+    w, vectors = quaternions[:, 0], quaternions[:, 1:]
+    outer = vectors[:, :, None] * vectors[:, None, :]
+    scale = (w * w - np.einsum("ij,ij->i", vectors, vectors))[:, None, None]
+    return scale * np.eye(3) + 2.0 * outer + 2.0 * w[:, None, None] * _skew(vectors)
+
+
+def slerp(starts: np.ndarray, ends: np.ndarray, fractions: np.ndarray) -> np.ndarray:
+    """Spherical linear interpolation between rows of ``(N, 4)`` quaternions at ``(N,)`` fractions.
+
+    Each pair is interpolated along the shorter arc. Nearly identical
+    orientations fall back to normalized linear interpolation.
+    """
+
+    starts = np.atleast_2d(np.asarray(starts, dtype=float))
+    ends = np.atleast_2d(np.asarray(ends, dtype=float))
+    fractions = np.asarray(fractions, dtype=float).reshape(-1, 1)
+    dots = np.einsum("ij,ij->i", starts, ends)[:, None]
+    ends = np.where(dots < 0, -ends, ends)
+    dots = np.abs(dots)
+    angles = np.arccos(np.clip(dots, -1.0, 1.0))
+    sines = np.sin(angles)
+    close = sines < 1e-6
+    safe = np.where(close, 1.0, sines)
+    start_weights = np.where(close, 1.0 - fractions, np.sin((1.0 - fractions) * angles) / safe)
+    end_weights = np.where(close, fractions, np.sin(fractions * angles) / safe)
+    result = start_weights * starts + end_weights * ends
+    return result / np.linalg.norm(result, axis=1, keepdims=True)
+
+
+# endregion
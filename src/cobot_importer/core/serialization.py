@@ -3,28 +3,53 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 from typing import Any
 
+from .container import ProjectContainer
 from .project import Project
 
 
 class ProjectSerializer:
-    """Serialize project data to and from JSON files."""
+    """Serialize project data to and from project files.
+
+    Two formats share the ``.cobot3d`` extension: the original indented JSON
+    document and the binary container (v2) implemented by
+    :class:`~.container.ProjectContainer`. :meth:`load` detects the format.
+    """
 
     FILE_EXTENSION = ".cobot3d"
+    FORMAT_JSON = "json"
+    FORMAT_CONTAINER = "container"
+
+    @staticmethod
+    def detect_format(path: str | Path) -> str:
+        if ProjectContainer.is_container(path):
+            return ProjectSerializer.FORMAT_CONTAINER
+        return ProjectSerializer.FORMAT_JSON
 
     @staticmethod
     def load(path: str | Path) -> Project:
+        if ProjectSerializer.detect_format(path) == ProjectSerializer.FORMAT_CONTAINER:
+            return ProjectContainer.load(path)
         with open(path, "r", encoding="utf-8") as handle:
             data: Any = json.load(handle)
         return Project.from_dict(data)
 
     @staticmethod
-    def save(project: Project, path: str | Path) -> None:
+    def save(project: Project, path: str | Path, format: str = FORMAT_JSON) -> None:
+        ProjectContainer.detach_from(project, path)
+        if format == ProjectSerializer.FORMAT_CONTAINER:
+            ProjectContainer.save(project, path)
+            return
+        if format != ProjectSerializer.FORMAT_JSON:
+            raise ValueError(f"Unknown project format '{format}'")
         payload = project.to_dict()
-        with open(path, "w", encoding="utf-8") as handle:
+        temp_path = Path(f"{path}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as handle:
             json.dump(payload, handle, indent=2, ensure_ascii=False)
+        os.replace(temp_path, path)
 
     @staticmethod
     def suggest_path(project: Project, directory: str | Path) -> Path:
@@ -0,0 +1,318 @@
+"""Cross sections of the workpiece mesh with families of parallel planes."""
+
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .project import PathSegment
+from .projection import surface_normals
+from .rotations import rotation_vectors_from_normals
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .model_loader import MeshGeometry
+    from .spatial import MeshIndex
+
+logger = logging.getLogger(__name__)
+
+# Consecutive section points closer than this (mm) are merged.
+MERGE_DISTANCE = 1e-6
+
+
+@dataclass
+class SectionCurve:
+    """One connected curve where plane ``plane`` cuts the mesh.
+
+    ``faces`` holds the triangle each point lies on; closed curves repeat
+    their first point at the end.
+    """
+
+    plane: int
+    points: np.ndarray
+    faces: np.ndarray
+    closed: bool
+
+
+def plane_offsets(geometry: "MeshGeometry", normal: Sequence[float], spacing: float) -> np.ndarray:
+    """Offsets of planes ``spacing`` apart across the mesh, centred in its extent along ``normal``."""
+
+    if spacing <= 0:
+        raise ValueError("Spacing must be positive")
+    heights = np.asarray(geometry.vertices, dtype=float) @ _unit_normal(normal)
+    low, high = float(heights.min()), float(heights.max())
+    count = max(int(np.ceil((high - low) / spacing)), 1)
+    margin = 0.5 * (high - low - (count - 1) * spacing)
+    return low + margin + spacing * np.arange(count)
+
+
+def slice_mesh(
+    geometry: "MeshGeometry",
+    normal: Sequence[float],
+    offsets: Sequence[float],
+    workers: Optional[int] = None,
+) -> List[SectionCurve]:
+    """Cut the mesh with every plane ``normal . x = offset`` and chain the cuts into curves.
+
+    All planes are intersected with the triangles in one vectorized pass; the
+    mesh index limits the pass to leaves whose box meets a plane. Groups of
+    planes are processed on ``workers`` threads (one per CPU by default).
+    Curves are returned ordered by plane.
+    """
+
+    normal = _unit_normal(normal)
+    offsets = np.asarray(offsets, dtype=float).reshape(-1)
+    if not len(offsets):
+        return []
+    order = np.argsort(offsets, kind="stable")
+    index = geometry.build_index()
+    heights = np.asarray(geometry.vertices, dtype=float) @ normal
+    # Contiguous runs of the sorted planes, so each group covers one band of the mesh.
+    groups = [group for group in np.array_split(order, min(workers or os.cpu_count() or 1, len(order))) if len(group)]
+
+    def run(planes: np.ndarray) -> List[SectionCurve]:
+        return _slice_planes(geometry, index, heights, normal, offsets, planes)
+
+    if len(groups) > 1:
+        with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix="slicing") as executor:
+            results = list(executor.map(run, groups))
+    else:
+        results = [run(group) for group in groups]
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    curves = sorted((curve for result in results for curve in result), key=lambda curve: rank[curve.plane])
+    logger.debug("Sliced %d planes into %d curves on %d threads", len(offsets), len(curves), len(groups))
+    return curves
+
+
+def sections_to_segments(
+    geometry: "MeshGeometry",
+    curves: Sequence[SectionCurve],
+    normal: Sequence[float],
+    zigzag: bool = True,
+    tool_offset: float = 0.0,
+    name: str = "截面",
+) -> List[PathSegment]:
+    """Turn section curves into path segments.
+
+    With ``zigzag`` all curves are linked into one segment, alternating their
+    direction from plane to plane; otherwise every curve becomes its own
+    segment. Waypoints are offset by ``tool_offset`` along the surface normal
+    with the tool axis pointing against it.
+    """
+
+    if not curves:
+        return []
+    curves = _raster_order(curves, _unit_normal(normal)) if zigzag else list(curves)
+    points = np.concatenate([curve.points for curve in curves])
+    normals = surface_normals(geometry, points, np.concatenate([curve.faces for curve in curves]))
+    poses = np.hstack([points + tool_offset * normals, rotation_vectors_from_normals(normals)])
+    if zigzag:
+        parts = [poses]
+    else:
+        parts = np.split(poses, np.cumsum([len(curve.points) for curve in curves])[:-1])
+    segments = []
+    for number, part in enumerate(parts, start=1):
+        segment = PathSegment(name=name if zigzag else f"{name} {number}", tool_offset=tool_offset)
+        segment.points.extend_array(part)
+        segments.append(segment)
+    return segments
+
+
+def _unit_normal(normal: Sequence[float]) -> np.ndarray:
+    normal = np.asarray(normal, dtype=float).reshape(3)
+    length = np.linalg.norm(normal)
+    if length == 0:
+        raise ValueError("Plane normal must not be zero")
+    return normal / length
+
+
+def _raster_order(curves: Sequence[SectionCurve], normal: np.ndarray) -> List[SectionCurve]:
+    """Curves ordered and oriented along a common in-plane direction, reversed every other plane."""
+
+    chords = [curve.points[-1] - curve.points[0] for curve in curves]
+    longest = max(chords, key=lambda chord: float(np.linalg.norm(chord)))
+    direction = longest - normal * float(longest @ normal)
+    if np.linalg.norm(direction) < 1e-9:
+        # Only closed loops: use any direction in the planes.
+        axis = np.eye(3)[int(np.argmin(np.abs(normal)))]
+        direction = np.cross(normal, axis)
+    planes = sorted({curve.plane for curve in curves}, key=[curve.plane for curve in curves].index)
+    ordered: List[SectionCurve] = []
+    for parity, plane in enumerate(planes):
+        sign = -1.0 if parity % 2 else 1.0
+        members = sorted(
+            (curve for curve in curves if curve.plane == plane),
+            key=lambda curve: sign * float(curve.points.mean(axis=0) @ direction),
+        )
+        for curve in members:
+            if sign * float((curve.points[-1] - curve.points[0]) @ direction) < 0:
+                curve = SectionCurve(curve.plane, curve.points[::-1], curve.faces[::-1], curve.closed)
+            ordered.append(curve)
+    return ordered
+
+
+def _slice_planes(
+    geometry: "MeshGeometry",
+    index: "MeshIndex",
+    heights: np.ndarray,
+    normal: np.ndarray,
+    offsets: np.ndarray,
+    planes: np.ndarray,
+) -> List[SectionCurve]:
+    """Section curves of the given planes (indices into ``offsets``, sorted by offset)."""
+
+    levels = offsets[planes]
+    candidates = index.faces_near_planes(normal, levels)
+    corners = np.asarray(geometry.faces[candidates], dtype=np.int64)
+    corner_heights = heights[corners]
+    # Every (triangle, plane) pair whose height range contains the plane, without a loop over planes.
+    first = np.searchsorted(levels, corner_heights.min(axis=1), "left")
+    counts = np.searchsorted(levels, corner_heights.max(axis=1), "right") - first
+    pair_faces = np.repeat(np.arange(len(candidates)), counts)
+    pair_planes = np.repeat(first, counts) + _ragged_arange(counts)
+    above = corner_heights[pair_faces] >= levels[pair_planes, None]
+    above_count = above.sum(axis=1)
+    cut = (above_count == 1) | (above_count == 2)
+    pair_faces, pair_planes, above, above_count = pair_faces[cut], pair_planes[cut], above[cut], above_count[cut]
+    if not len(pair_faces):
+        return []
+
+    # The vertex on its own side of the plane is shared by both cut edges.
+    lone = np.where(above_count == 1, np.argmax(above, axis=1), np.argmin(above, axis=1))
+    lone_vertex = corners[pair_faces, lone]
+    ends = np.concatenate([corners[pair_faces, (lone + 1) % 3], corners[pair_faces, (lone + 2) % 3]])
+    starts = np.concatenate([lone_vertex, lone_vertex])
+    edge_low, edge_high = np.minimum(starts, ends), np.maximum(starts, ends)
+    node_planes = np.concatenate([pair_planes, pair_planes])
+    # Cut points are identified by (plane, edge), which neighbouring triangles share.
+    edge_keys = edge_low * len(geometry.vertices) + edge_high
+    order = np.lexsort((edge_keys, node_planes))
+    new_node = np.ones(len(order), dtype=bool)
+    new_node[1:] = (np.diff(edge_keys[order]) != 0) | (np.diff(node_planes[order]) != 0)
+    nodes = np.empty(len(order), dtype=np.int64)
+    nodes[order] = np.cumsum(new_node) - 1
+    representative = order[new_node]
+
+    low_heights = heights[edge_low[representative]] - levels[node_planes[representative]]
+    high_heights = heights[edge_high[representative]] - levels[node_planes[representative]]
+    t = low_heights / (low_heights - high_heights)
+    low_points = np.asarray(geometry.vertices[edge_low[representative]], dtype=float)
+    high_points = np.asarray(geometry.vertices[edge_high[representative]], dtype=float)
+    node_points = low_points + t[:, None] * (high_points - low_points)
+    node_plane = planes[node_planes[representative]]
+
+    segment_count = len(pair_faces)
+    tails, heads = nodes[:segment_count], nodes[segment_count:]
+    arcs, chain_starts, closed = _chain_segments(tails, heads, len(node_points))
+    # Arc a runs tail -> head of segment a, arc a + n runs backwards.
+    arc_from = np.concatenate([tails, heads])
+    arc_to = np.concatenate([heads, tails])
+    arc_faces = np.tile(candidates[pair_faces], 2)
+    point_nodes = np.insert(arc_to[arcs], chain_starts, arc_from[arcs[chain_starts]])
+    point_faces = np.insert(arc_faces[arcs], chain_starts, arc_faces[arcs[chain_starts]])
+    bounds = np.append(chain_starts + np.arange(len(chain_starts)), len(point_nodes))
+
+    curves = []
+    for chain in range(len(chain_starts)):
+        chain_nodes = point_nodes[bounds[chain] : bounds[chain + 1]]
+        points = node_points[chain_nodes]
+        keep = np.ones(len(points), dtype=bool)
+        keep[1:] = np.linalg.norm(np.diff(points, axis=0), axis=1) > MERGE_DISTANCE
+        if keep.sum() < 2:
+            continue
+        faces = point_faces[bounds[chain] : bounds[chain + 1]]
+        curves.append(SectionCurve(int(node_plane[chain_nodes[0]]), points[keep], faces[keep], bool(closed[chain])))
+    return curves
+
+
+def _ragged_arange(counts: np.ndarray) -> np.ndarray:
+    """``concatenate([arange(n) for n in counts])`` without the Python loop."""
+
+    return np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+
+
+def _chain_segments(tails: np.ndarray, heads: np.ndarray, node_count: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Order segments between nodes into chains.
+
+    Each segment gives two arcs (``a`` forwards, ``a + n`` backwards). An arc
+    continues through its end node with the node's other segment when the
+    node joins exactly two segments; elsewhere chains end. Returns the arcs
+    of one orientation of every chain, chain by chain, the index where each
+    chain starts and whether it is a closed loop.
+    """
+
+    count = len(tails)
+    arc_from = np.concatenate([tails, heads])
+    arc_to = np.concatenate([heads, tails])
+    segment_of = np.tile(np.arange(count), 2)
+    degree = np.bincount(arc_from, minlength=node_count)
+    # The two segments meeting at each node (meaningful where the degree is 2).
+    incident = np.argsort(arc_from, kind="stable")
+    first_slot = np.cumsum(degree) - degree
+    first_segment = segment_of[incident[first_slot]]
+    second_segment = segment_of[incident[np.minimum(first_slot + 1, len(incident) - 1)]]
+    through = arc_to
+    other = np.where(first_segment[through] == segment_of, second_segment[through], first_segment[through])
+    successor = np.where(tails[other] == through, other, other + count)
+    successor = np.where(degree[through] == 2, successor, -1)
+
+    arcs, starts, closed = _order_lists(successor)
+    # Both orientations of a chain contain the same segments: keep one of them.
+    keys = np.minimum.reduceat(segment_of[arcs], starts)
+    _, keep = np.unique(keys, return_index=True)
+    keep.sort()
+    lengths = np.diff(np.append(starts, len(arcs)))
+    kept_arcs = np.concatenate([arcs[starts[chain] : starts[chain] + lengths[chain]] for chain in keep])
+    kept_starts = np.cumsum(lengths[keep]) - lengths[keep]
+    return kept_arcs, kept_starts, closed[keep]
+
+
+def _order_lists(successor: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Order the elements of linked lists and loops given each element's successor (``-1`` at the end).
+
+    Pointer jumping needs O(log n) vectorized rounds instead of a Python walk.
+    Loops are opened before their smallest element. Returns the elements list
+    by list from head to tail, the index where each list starts and whether
+    it was a loop.
+    """
+
+    count = len(successor)
+    ids = np.arange(count)
+    rounds = max(count.bit_length(), 1)
+    jump = successor.copy()
+    smallest = ids.copy()
+    live = np.flatnonzero(jump >= 0)
+    for _ in range(rounds):
+        ahead = jump[live]
+        lower = np.minimum(smallest[live], smallest[ahead])
+        settled = np.array_equal(lower, smallest[live])
+        smallest[live] = lower
+        jump[live] = jump[ahead]
+        remaining = live[jump[live] >= 0]
+        # Once no list end is reached in a round only loops are left, and
+        # they are done when their minimum stops changing.
+        if settled and len(remaining) == len(live):
+            break
+        live = remaining
+    # Elements of loops never reach a list end.
+    on_loop = jump >= 0
+    closing = on_loop & (successor >= 0) & (smallest[np.maximum(successor, 0)] == successor)
+    successor = np.where(closing, -1, successor)
+
+    jump = np.where(successor >= 0, successor, ids)
+    distance = (successor >= 0).astype(np.int64)
+    for _ in range(rounds):
+        ahead = jump[jump]
+        if np.array_equal(ahead, jump):
+            break
+        distance = distance + distance[jump]
+        jump = ahead
+    order = np.lexsort((-distance, jump))
+    tails = jump[order]
+    starts = np.flatnonzero(np.r_[True, tails[1:] != tails[:-1]])
+    return order, starts, closing[tails[starts]]
@@ -0,0 +1,523 @@
+"""Bounding volume hierarchy over mesh triangles for picking and snapping."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+logger = logging.getLogger(__name__)
+
+LEAF_SIZE = 8
+# Queries are processed in chunks to bound the size of the candidate arrays. Measured against a
+# 1.3M-triangle mesh, 1024 was no faster than 256 for rays, nearest-surface and capsule queries.
+QUERY_CHUNK = 256
+_AXIS_SAMPLES = 64
+
+# leaf_distance(points, triangles) -> (distances, closest points, feature tag per pair)
+LeafDistance = Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray, np.ndarray]]
+
+
+@dataclass
+class SurfaceQuery:
+    """Per query: closest/hit point, triangle id (``-1`` if none) and distance."""
+
+    points: np.ndarray
+    faces: np.ndarray
+    distances: np.ndarray
+
+    @property
+    def found(self) -> np.ndarray:
+        return self.faces >= 0
+
+
+@dataclass
+class VertexQuery:
+    indices: np.ndarray
+    points: np.ndarray
+    distances: np.ndarray
+
+
+@dataclass
+class EdgeQuery:
+    """Per query: closest point on the nearest edge and the edge's vertex ids."""
+
+    points: np.ndarray
+    edges: np.ndarray
+    distances: np.ndarray
+
+
+def _row_dot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.einsum("ij,ij->i", a, b)
+
+
+def _unit(vectors: np.ndarray) -> np.ndarray:
+    lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0)
+
+
+def _leaf_reduce(values: np.ndarray, leaf_count: int, op: np.ufunc) -> np.ndarray:
+    """Combine per-slot ``values`` into one value per leaf with ``op``.
+
+    Padding slots contribute zero, which suits sums and maxima of non-negative values.
+    """
+
+    padded = np.zeros((leaf_count * LEAF_SIZE,) + values.shape[1:])
+    padded[: len(values)] = values
+    while len(padded) > leaf_count:
+        padded = op(padded[0::2], padded[1::2])
+    return padded
+
+
+def closest_points_on_triangles(points: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """Closest point on each triangle ``(K, 3, 3)`` to the matching point ``(K, 3)``."""
+
+    a, b, c = triangles[:, 0], triangles[:, 1], triangles[:, 2]
+    ab, ac, ap = b - a, c - a, points - a
+    d1, d2 = _row_dot(ab, ap), _row_dot(ac, ap)
+    bp = points - b
+    d3, d4 = _row_dot(ab, bp), _row_dot(ac, bp)
+    cp = points - c
+    d5, d6 = _row_dot(ab, cp), _row_dot(ac, cp)
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denom = va + vb + vc
+        v = np.where(denom != 0, vb / denom, 0.0)
+        w = np.where(denom != 0, vc / denom, 0.0)
+        result = a + ab * v[:, None] + ac * w[:, None]
+        # Regions are applied from lowest to highest priority.
+        edge_bc = (va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0)
+        t = (d4 - d3) / ((d4 - d3) + (d5 - d6))
+        result = np.where(edge_bc[:, None], b + (c - b) * np.nan_to_num(t)[:, None], result)
+        edge_ac = (vb <= 0) & (d2 >= 0) & (d6 <= 0)
+        t = d2 / (d2 - d6)
+        result = np.where(edge_ac[:, None], a + ac * np.nan_to_num(t)[:, None], result)
+        edge_ab = (vc <= 0) & (d1 >= 0) & (d3 <= 0)
+        t = d1 / (d1 - d3)
+        result = np.where(edge_ab[:, None], a + ab * np.nan_to_num(t)[:, None], result)
+    result = np.where(((d6 >= 0) & (d5 <= d6))[:, None], c, result)
+    result = np.where(((d3 >= 0) & (d4 <= d3))[:, None], b, result)
+    result = np.where(((d1 <= 0) & (d2 <= 0))[:, None], a, result)
+    return result
+
+
+def closest_points_on_segments(points: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    direction = ends - starts
+    length_sq = _row_dot(direction, direction)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(length_sq > 0, _row_dot(points - starts, direction) / length_sq, 0.0)
+    return starts + direction * np.clip(t, 0.0, 1.0)[:, None]
+
+
+def segment_distances(p0: np.ndarray, p1: np.ndarray, q0: np.ndarray, q1: np.ndarray) -> np.ndarray:
+    """Distance between the segments ``p0``–``p1`` and ``q0``–``q1`` of each row."""
+
+    d1, d2, r = p1 - p0, q1 - q0, p0 - q0
+    a, e = _row_dot(d1, d1), _row_dot(d2, d2)
+    b, c, f = _row_dot(d1, d2), _row_dot(d1, r), _row_dot(d2, r)
+    eps = 1e-12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Closest parameters of the infinite lines, then clamped onto both segments in turn.
+        denom = a * e - b * b
+        s = np.where(denom > eps * np.maximum(a * e, eps), np.clip((b * f - c * e) / denom, 0.0, 1.0), 0.0)
+        t = np.where(e > eps, (b * s + f) / e, 0.0)
+        s = np.where(t < 0.0, np.clip(-c / a, 0.0, 1.0), np.where(t > 1.0, np.clip((b - c) / a, 0.0, 1.0), s))
+        s = np.where(a > eps, np.nan_to_num(s), 0.0)
+        t = np.where(e > eps, np.clip((b * s + f) / e, 0.0, 1.0), 0.0)
+    gap = p0 + d1 * s[:, None] - (q0 + d2 * t[:, None])
+    return np.sqrt(_row_dot(gap, gap))
+
+
+def segment_triangle_distances(starts: np.ndarray, ends: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """Distance between each segment and the matching triangle ``(K, 3, 3)``; zero where they cross."""
+
+    distances = np.minimum(
+        np.linalg.norm(closest_points_on_triangles(starts, triangles) - starts, axis=1),
+        np.linalg.norm(closest_points_on_triangles(ends, triangles) - ends, axis=1),
+    )
+    for first, second in ((0, 1), (1, 2), (2, 0)):
+        edges = segment_distances(starts, ends, triangles[:, first], triangles[:, second])
+        np.minimum(distances, edges, out=distances)
+    crossing = MeshIndex._ray_triangle(starts, ends - starts, triangles) <= 1.0
+    return np.where(crossing, 0.0, distances)
+
+
+class MeshIndex:
+    """Triangle BVH with batched ray, nearest-surface, vertex and edge queries.
+
+    Triangles are ordered by recursive median splits along the longest axis
+    and grouped into leaves of :data:`LEAF_SIZE`; the leaves form the bottom
+    of a complete binary tree
+    stored in heap order (children of node ``i`` are ``2i + 1`` and
+    ``2i + 2``). Queries descend the tree one level at a time for all query
+    points together, so a batch costs a few dozen numpy operations rather than
+    a Python loop per query. The arrays returned by :meth:`to_arrays` are
+    stored in the mesh cache next to the geometry.
+    """
+
+    def __init__(
+        self, vertices: np.ndarray, faces: np.ndarray, order: np.ndarray, node_min: np.ndarray, node_max: np.ndarray
+    ) -> None:
+        self._vertices = vertices
+        self._faces = faces
+        self._order = np.asarray(order, dtype=np.int64)
+        self._sorted_faces = faces[self._order]
+        self._node_min = node_min
+        self._node_max = node_max
+        self._node_valid = np.all(node_min <= node_max, axis=1)
+        self._leaf_count = (len(node_min) + 1) // 2
+        self._depth = int(np.log2(self._leaf_count))
+        self._vertex_tree: Optional[cKDTree] = None
+        self._used_vertices: Optional[np.ndarray] = None
+        self._triangle_discs: Optional[np.ndarray] = None
+        self._leaf_discs: Optional[np.ndarray] = None
+        # Guards the lookup structures built lazily by the first query.
+        self._lazy_lock = threading.Lock()
+
+    # region Construction
+    @classmethod
+    def build(cls, vertices: np.ndarray, faces: np.ndarray) -> "MeshIndex":
+        corners = [vertices[faces[:, corner]] for corner in range(3)]
+        count = len(faces)
+        leaves = max(1, -(-count // LEAF_SIZE))
+        padded_leaves = 1 << int(np.ceil(np.log2(leaves)))
+        slots = padded_leaves * LEAF_SIZE
+        # Padding slots repeat the last centroid (leaving extents unchanged) and
+        # get infinite split keys so they stay at the end of the order.
+        centroids = np.empty((3, slots), dtype=np.float32)
+        centroids[:, :count] = ((corners[0] + corners[1] + corners[2]) / 3.0).T
+        centroids[:, count:] = centroids[:, count - 1 : count]
+        order = np.arange(slots)
+        block = slots
+        # Median split of every node along its longest axis, one tree level at a time.
+        while block > LEAF_SIZE:
+            nodes = order.reshape(-1, block)
+            # A strided sample of each node is enough to pick the split axis.
+            sample = centroids[:, nodes[:, :: max(1, block // _AXIS_SAMPLES)]]
+            axis = np.argmax(sample.max(axis=2) - sample.min(axis=2), axis=0)
+            keys = centroids[np.repeat(axis, block), order].reshape(-1, block)
+            keys[nodes >= count] = np.inf
+            half = np.argpartition(keys, block // 2 - 1, axis=1)
+            order = np.take_along_axis(nodes, half, axis=1).ravel()
+            block //= 2
+        order = order[:count]
+        low = np.full((slots, 3), np.inf, dtype=np.float32)
+        high = np.full((slots, 3), -np.inf, dtype=np.float32)
+        sorted_corners = [corner[order] for corner in corners]
+        low[:count] = np.minimum(np.minimum(sorted_corners[0], sorted_corners[1]), sorted_corners[2])
+        high[:count] = np.maximum(np.maximum(sorted_corners[0], sorted_corners[1]), sorted_corners[2])
+        # Pairwise reductions up to the leaves, then up to the root.
+        levels_min, levels_max = [low], [high]
+        while len(levels_min[-1]) > 1:
+            levels_min.append(np.minimum(levels_min[-1][0::2], levels_min[-1][1::2]))
+            levels_max.append(np.maximum(levels_max[-1][0::2], levels_max[-1][1::2]))
+        skip = int(np.log2(LEAF_SIZE))
+        node_min = np.concatenate(levels_min[skip:][::-1])
+        node_max = np.concatenate(levels_max[skip:][::-1])
+        logger.info("Built BVH over %d triangles (%d leaves)", count, padded_leaves)
+        return cls(vertices, faces, order.astype(np.uint32), node_min, node_max)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {"order": self._order.astype(np.uint32), "node_min": self._node_min, "node_max": self._node_max}
+
+    @classmethod
+    def from_arrays(cls, vertices: np.ndarray, faces: np.ndarray, arrays: Dict[str, np.ndarray]) -> "MeshIndex":
+        return cls(vertices, faces, arrays["order"], arrays["node_min"], arrays["node_max"])
+
+    # endregion
+
+    # region Queries
+    def intersect_rays(self, origins: np.ndarray, directions: np.ndarray) -> SurfaceQuery:
+        """Return the first triangle hit by each ray (``distances`` are ray parameters)."""
+
+        origins = np.atleast_2d(np.asarray(origins, dtype=float))
+        directions = np.atleast_2d(np.asarray(directions, dtype=float))
+        points, faces, distances = self._chunked(self._intersect_chunk, origins, directions)
+        return SurfaceQuery(points=points, faces=faces, distances=distances)
+
+    def nearest_surface(self, points: np.ndarray) -> SurfaceQuery:
+        """Return the closest point on the mesh surface for each query point."""
+
+        def leaf_distance(queries: np.ndarray, triangles: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            closest = closest_points_on_triangles(queries, triangles)
+            return np.linalg.norm(closest - queries, axis=1), closest, np.zeros(len(queries), dtype=np.int64)
+
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        distances, closest, slots, _tags = self._chunked(lambda chunk: self._nearest(chunk, leaf_distance), points)
+        return SurfaceQuery(points=closest, faces=self._order[slots], distances=distances)
+
+    def nearest_vertex(self, points: np.ndarray) -> VertexQuery:
+        """Return the closest mesh vertex (used by at least one face) for each query point."""
+
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        tree, used = self._vertex_lookup()
+        distances, indices = tree.query(points)
+        indices = used[indices]
+        closest = np.asarray(self._vertices[indices], dtype=float)
+        return VertexQuery(indices=indices, points=closest, distances=distances)
+
+    def nearest_edge(self, points: np.ndarray) -> EdgeQuery:
+        """Return the closest point on any triangle edge for each query point."""
+
+        def leaf_distance(queries: np.ndarray, triangles: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+            candidates = np.stack(
+                [
+                    closest_points_on_segments(queries, triangles[:, start], triangles[:, end])
+                    for start, end in ((0, 1), (1, 2), (2, 0))
+                ],
+                axis=1,
+            )
+            distances = np.linalg.norm(candidates - queries[:, None], axis=2)
+            edge = distances.argmin(axis=1)
+            rows = np.arange(len(queries))
+            return distances[rows, edge], candidates[rows, edge], edge
+
+        points = np.atleast_2d(np.asarray(points, dtype=float))
+        distances, closest, slots, corner = self._chunked(lambda chunk: self._nearest(chunk, leaf_distance), points)
+        faces = self._sorted_faces[slots].astype(np.int64)
+        rows = np.arange(len(points))
+        edges = np.stack([faces[rows, corner], faces[rows, (corner + 1) % 3]], axis=1)
+        return EdgeQuery(points=closest, edges=edges, distances=distances)
+
+    def segments_within(self, starts: np.ndarray, ends: np.ndarray, radius: float) -> np.ndarray:
+        """Whether any triangle lies within ``radius`` of each segment, i.e. touches its capsule."""
+
+        starts = np.atleast_2d(np.asarray(starts, dtype=float))
+        ends = np.atleast_2d(np.asarray(ends, dtype=float))
+        (hits,) = self._chunked(lambda first, last: (self._capsule_chunk(first, last, float(radius)),), starts, ends)
+        return hits
+
+    def faces_near_planes(self, normal: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """Triangle ids in the leaves whose box meets a plane ``normal . x = offset``.
+
+        A superset of the triangles cut by the planes, found from the leaf
+        boxes alone. ``offsets`` must be sorted.
+        """
+
+        normal = np.asarray(normal, dtype=float)
+        offsets = np.asarray(offsets, dtype=float)
+        low = self._node_min[self._leaf_count - 1 :].astype(float)
+        high = self._node_max[self._leaf_count - 1 :].astype(float)
+        # Padding leaves have inverted infinite boxes; their NaN extents match no plane.
+        with np.errstate(invalid="ignore"):
+            middle = 0.5 * (low + high) @ normal
+            reach = 0.5 * (high - low) @ np.abs(normal) * (1.0 + 1e-9) + 1e-9
+        crossing = np.searchsorted(offsets, middle - reach, "left") < np.searchsorted(offsets, middle + reach, "right")
+        slots = (np.flatnonzero(crossing)[:, None] * LEAF_SIZE + np.arange(LEAF_SIZE)).ravel()
+        return self._order[slots[slots < len(self._order)]].astype(np.int64)
+
+    # endregion
+
+    # region Traversal
+    @staticmethod
+    def _chunked(query: Callable[..., Tuple[np.ndarray, ...]], *arrays: np.ndarray) -> Tuple[np.ndarray, ...]:
+        """Run ``query`` over slices of at most :data:`QUERY_CHUNK` rows and join the results."""
+
+        count = len(arrays[0])
+        if count <= QUERY_CHUNK:
+            return query(*arrays)
+        parts = [
+            query(*(array[start : start + QUERY_CHUNK] for array in arrays)) for start in range(0, count, QUERY_CHUNK)
+        ]
+        return tuple(np.concatenate(columns) for columns in zip(*parts))
+
+    def _children(self, query_ids: np.ndarray, nodes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return np.repeat(query_ids, 2), (2 * nodes[:, None] + np.array([1, 2])).ravel()
+
+    def _leaf_slots(self, query_ids: np.ndarray, nodes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        leaves = nodes - (self._leaf_count - 1)
+        slots = leaves[:, None] * LEAF_SIZE + np.arange(LEAF_SIZE)
+        query_ids = np.repeat(query_ids, LEAF_SIZE)
+        slots = slots.ravel()
+        valid = slots < len(self._order)
+        return query_ids[valid], slots[valid]
+
+    def _triangles(self, slots: np.ndarray) -> np.ndarray:
+        return np.asarray(self._vertices[self._sorted_faces[slots]], dtype=float)
+
+    def _box_distance(self, points: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+        gap = np.maximum(np.maximum(self._node_min[nodes] - points, points - self._node_max[nodes]), 0.0)
+        distance = np.sqrt(_row_dot(gap, gap))
+        return np.where(self._node_valid[nodes], distance, np.inf)
+
+    def _lower_bounds(self, points: np.ndarray, discs: np.ndarray) -> np.ndarray:
+        """Lower bound of the distance from each point to the geometry inside its disc.
+
+        ``discs`` rows are ``center, unit normal, radius, half thickness``: a
+        point splits into its offset along the normal and its in-plane offset,
+        and neither can be closer than the disc's extent allows.
+        """
+
+        offset = points - discs[:, :3]
+        height = _row_dot(offset, discs[:, 3:6])
+        in_plane = offset - discs[:, 3:6] * height[:, None]
+        outside = np.maximum(np.sqrt(_row_dot(in_plane, in_plane)) - discs[:, 6], 0.0)
+        above = np.maximum(np.abs(height) - discs[:, 7], 0.0)
+        return np.sqrt(above * above + outside * outside)
+
+    def _discs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Bounding discs of every triangle slot and of every leaf, built on first use."""
+
+        with self._lazy_lock:
+            if self._triangle_discs is None:
+                self._build_discs()
+        return self._triangle_discs, self._leaf_discs
+
+    def _build_discs(self) -> None:
+        a, b, c = (np.asarray(self._vertices[self._sorted_faces[:, corner]], dtype=float) for corner in range(3))
+        centers = (a + b + c) / 3.0
+        normals = np.cross(b - a, c - a)
+        radii = np.sqrt(
+            np.maximum.reduce([_row_dot(corner - centers, corner - centers) for corner in (a, b, c)])
+        )
+        # Triangle discs are stored as float32; the slack keeps the bound conservative.
+        slack = 1e-5 * (float((centers.max(axis=0) - centers.min(axis=0)).max()) + float(radii.max()))
+        self._triangle_discs = np.column_stack(
+            [centers, _unit(normals), radii + slack, np.full(len(radii), slack)]
+        ).astype(np.float32)
+
+        # Padding leaves have empty (inverted) boxes and are never visited.
+        with np.errstate(invalid="ignore"):
+            leaf_centers = 0.5 * (self._node_min[self._leaf_count - 1 :] + self._node_max[self._leaf_count - 1 :])
+        leaf_centers = np.nan_to_num(leaf_centers.astype(float), nan=0.0)
+        leaf_normals = _unit(_leaf_reduce(normals, self._leaf_count, np.add))
+        leaves = np.arange(len(centers)) // LEAF_SIZE
+        reach = np.zeros(len(centers))
+        thickness = np.zeros(len(centers))
+        for corner in (a, b, c):
+            offsets = corner - leaf_centers[leaves]
+            np.maximum(reach, _row_dot(offsets, offsets), out=reach)
+            np.maximum(thickness, np.abs(_row_dot(offsets, leaf_normals[leaves])), out=thickness)
+        self._leaf_discs = np.column_stack(
+            [
+                leaf_centers,
+                leaf_normals,
+                np.sqrt(_leaf_reduce(reach, self._leaf_count, np.maximum)),
+                _leaf_reduce(thickness, self._leaf_count, np.maximum),
+            ]
+        )
+
+    def _vertex_lookup(self) -> Tuple[cKDTree, np.ndarray]:
+        with self._lazy_lock:
+            if self._vertex_tree is None:
+                used = np.flatnonzero(np.bincount(self._faces.ravel(), minlength=len(self._vertices)))
+                self._used_vertices = used
+                self._vertex_tree = cKDTree(self._vertices[used])
+        return self._vertex_tree, self._used_vertices
+
+    def _intersect_chunk(self, origins: np.ndarray, directions: np.ndarray) -> Tuple[np.ndarray, ...]:
+        count = len(origins)
+        with np.errstate(divide="ignore"):
+            inverse = 1.0 / directions
+        query_ids = np.arange(count)
+        nodes = np.zeros(count, dtype=np.int64)
+        for depth in range(self._depth + 1):
+            with np.errstate(invalid="ignore"):
+                low = (self._node_min[nodes] - origins[query_ids]) * inverse[query_ids]
+                high = (self._node_max[nodes] - origins[query_ids]) * inverse[query_ids]
+            # 0 * inf (a ray running inside a slab plane) yields NaN: treat the slab as unbounded.
+            on_plane = np.isnan(low) | np.isnan(high)
+            near = np.where(on_plane, -np.inf, np.minimum(low, high)).max(axis=1)
+            far = np.where(on_plane, np.inf, np.maximum(low, high)).min(axis=1)
+            keep = self._node_valid[nodes] & (far >= np.maximum(near, 0.0))
+            query_ids, nodes = query_ids[keep], nodes[keep]
+            if depth < self._depth:
+                query_ids, nodes = self._children(query_ids, nodes)
+        query_ids, slots = self._leaf_slots(query_ids, nodes)
+        t = self._ray_triangle(origins[query_ids], directions[query_ids], self._triangles(slots))
+        hit = np.isfinite(t)
+        query_ids, slots, t = query_ids[hit], slots[hit], t[hit]
+        best = np.full(count, np.inf)
+        np.minimum.at(best, query_ids, t)
+        faces = np.full(count, -1, dtype=np.int64)
+        winner = t == best[query_ids]
+        faces[query_ids[winner]] = self._order[slots[winner]]
+        found = np.isfinite(best)
+        points = np.full((count, 3), np.nan)
+        points[found] = origins[found] + directions[found] * best[found, None]
+        return points, faces, best
+
+    def _capsule_chunk(self, starts: np.ndarray, ends: np.ndarray, radius: float) -> np.ndarray:
+        count = len(starts)
+        low = np.minimum(starts, ends) - radius
+        high = np.maximum(starts, ends) + radius
+        query_ids = np.arange(count)
+        nodes = np.zeros(count, dtype=np.int64)
+        for depth in range(self._depth + 1):
+            overlap = (self._node_min[nodes] <= high[query_ids]) & (self._node_max[nodes] >= low[query_ids])
+            keep = self._node_valid[nodes] & overlap.all(axis=1)
+            query_ids, nodes = query_ids[keep], nodes[keep]
+            if depth < self._depth:
+                query_ids, nodes = self._children(query_ids, nodes)
+        # A segment is no closer to anything than its midpoint less half its length.
+        middles = 0.5 * (starts + ends)
+        halves = 0.5 * np.linalg.norm(ends - starts, axis=1) + radius
+        triangle_discs, leaf_discs = self._discs()
+        keep = self._lower_bounds(middles[query_ids], leaf_discs[nodes - (self._leaf_count - 1)]) <= halves[query_ids]
+        query_ids, slots = self._leaf_slots(query_ids[keep], nodes[keep])
+        keep = self._lower_bounds(middles[query_ids], triangle_discs[slots]) <= halves[query_ids]
+        query_ids, slots = query_ids[keep], slots[keep]
+        distances = segment_triangle_distances(starts[query_ids], ends[query_ids], self._triangles(slots))
+        hits = np.zeros(count, dtype=bool)
+        hits[query_ids[distances <= radius]] = True
+        return hits
+
+    def _nearest(
+        self, points: np.ndarray, leaf_distance: LeafDistance
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        count = len(points)
+        # Every vertex lies on the surface and on its edges, so the distance to
+        # the nearest vertex bounds the search radius.
+        tree, _used = self._vertex_lookup()
+        bound = tree.query(points)[0] * (1.0 + 1e-9) + 1e-9
+        query_ids = np.arange(count)
+        nodes = np.zeros(count, dtype=np.int64)
+        for depth in range(self._depth + 1):
+            keep = self._box_distance(points[query_ids], nodes) <= bound[query_ids]
+            query_ids, nodes = query_ids[keep], nodes[keep]
+            if depth < self._depth:
+                query_ids, nodes = self._children(query_ids, nodes)
+        triangle_discs, leaf_discs = self._discs()
+        keep = self._lower_bounds(points[query_ids], leaf_discs[nodes - (self._leaf_count - 1)]) <= bound[query_ids]
+        query_ids, slots = self._leaf_slots(query_ids[keep], nodes[keep])
+        keep = self._lower_bounds(points[query_ids], triangle_discs[slots]) <= bound[query_ids]
+        query_ids, slots = query_ids[keep], slots[keep]
+        distances, closest, tags = leaf_distance(points[query_ids], self._triangles(slots))
+        best = np.full(count, np.inf)
+        np.minimum.at(best, query_ids, distances)
+        winner = distances == best[query_ids]
+        # Keep one winner per query when several triangles tie.
+        query_ids, first = np.unique(query_ids[winner], return_index=True)
+        result_points = np.empty((count, 3))
+        result_slots = np.empty(count, dtype=np.int64)
+        result_tags = np.empty(count, dtype=np.int64)
+        result_points[query_ids] = closest[winner][first]
+        result_slots[query_ids] = slots[winner][first]
+        result_tags[query_ids] = tags[winner][first]
+        return best, result_points, result_slots, result_tags
+
+    @staticmethod
+    def _ray_triangle(origins: np.ndarray, directions: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+        """Möller–Trumbore intersection; returns ``inf`` where a ray misses."""
+
+        edge1 = triangles[:, 1] - triangles[:, 0]
+        edge2 = triangles[:, 2] - triangles[:, 0]
+        pvec = np.cross(directions, edge2)
+        det = _row_dot(edge1, pvec)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv_det = 1.0 / det
+            tvec = origins - triangles[:, 0]
+            u = _row_dot(tvec, pvec) * inv_det
+            qvec = np.cross(tvec, edge1)
+            v = _row_dot(directions, qvec) * inv_det
+            t = _row_dot(edge2, qvec) * inv_det
+            hit = (np.abs(det) > 1e-12) & (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0)
+        return np.where(hit, t, np.inf)
+
+    # endregion
@@ -0,0 +1,222 @@
+"""Follow-surface (贴地线) paths generated from points picked on the mesh."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .projection import project_points
+from .rotations import rotation_vectors_from_normals
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .model_loader import MeshGeometry
+
+logger = logging.getLogger(__name__)
+
+# Chord samples per output step; the projected chord is resampled from these.
+OVERSAMPLING = 4
+# Bisection rounds closing gaps where the projected chord jumps across an edge.
+REFINE_ROUNDS = 12
+
+
+@dataclass
+class PathUpdate:
+    """Rows ``start:stop`` of the previously generated poses are replaced by ``poses``."""
+
+    start: int
+    stop: int
+    poses: np.ndarray
+
+
+class SurfacePathGenerator:
+    """Dense surface-following waypoints through a list of control points.
+
+    The chord between two consecutive control points is projected onto the
+    mesh, resampled to steps of ``spacing`` along the projected curve and
+    projected again. Waypoints sit ``offset`` above the surface along its
+    normal with the tool axis pointing against the normal.
+
+    The generated poses are kept per control point: piece ``k`` holds the
+    span from control point ``k`` up to (excluding) control point ``k + 1``,
+    and the last piece is the last control point alone. Moving, adding or
+    removing a control point only regenerates the pieces next to it and
+    reports the replaced rows as a :class:`PathUpdate`.
+    """
+
+    def __init__(
+        self,
+        geometry: "MeshGeometry",
+        spacing: float = 1.0,
+        offset: float = 0.0,
+        workers: Optional[int] = None,
+    ) -> None:
+        self._geometry = geometry
+        self._spacing = self._check_spacing(spacing)
+        self._offset = float(offset)
+        self._workers = workers
+        self._controls = np.empty((0, 3))
+        self._pieces: List[np.ndarray] = []
+
+    @property
+    def control_points(self) -> np.ndarray:
+        return self._controls.copy()
+
+    @property
+    def spacing(self) -> float:
+        return self._spacing
+
+    @property
+    def offset(self) -> float:
+        return self._offset
+
+    def __len__(self) -> int:
+        return sum(len(piece) for piece in self._pieces)
+
+    def poses(self) -> np.ndarray:
+        """All generated ``(N, 6)`` poses."""
+
+        if not self._pieces:
+            return np.empty((0, 6))
+        return np.concatenate(self._pieces)
+
+    # region Editing
+    def set_control_points(self, points: Sequence[Sequence[float]] | np.ndarray) -> PathUpdate:
+        """Replace every control point and regenerate the whole path."""
+
+        previous = len(self._pieces)
+        self._controls = self._snap(points)
+        return self._rebuild(0, previous, len(self._controls))
+
+    def set_parameters(self, spacing: Optional[float] = None, offset: Optional[float] = None) -> PathUpdate:
+        """Change the sample spacing and/or normal offset and regenerate the whole path."""
+
+        if spacing is not None:
+            self._spacing = self._check_spacing(spacing)
+        if offset is not None:
+            self._offset = float(offset)
+        return self._rebuild(0, len(self._pieces), len(self._pieces))
+
+    def append_control_point(self, point: Sequence[float] | np.ndarray) -> PathUpdate:
+        return self.insert_control_point(len(self._controls), point)
+
+    def insert_control_point(self, index: int, point: Sequence[float] | np.ndarray) -> PathUpdate:
+        """Insert a control point before ``index`` (``len`` appends)."""
+
+        if not 0 <= index <= len(self._controls):
+            raise IndexError(f"Control point {index} out of range")
+        self._controls = np.insert(self._controls, index, self._snap(point), axis=0)
+        # The span now ending at the new point is regenerated with the new point's own piece.
+        return self._rebuild(max(index - 1, 0), index, index + 1)
+
+    def move_control_point(self, index: int, point: Sequence[float] | np.ndarray) -> PathUpdate:
+        """Move one control point; only the spans on either side are regenerated."""
+
+        self._check_index(index)
+        self._controls[index] = self._snap(point)[0]
+        return self._rebuild(max(index - 1, 0), index + 1, index + 1)
+
+    def remove_control_point(self, index: int) -> PathUpdate:
+        self._check_index(index)
+        self._controls = np.delete(self._controls, index, axis=0)
+        return self._rebuild(max(index - 1, 0), index + 1, index)
+
+    # endregion
+
+    # region Generation
+    def _rebuild(self, first: int, old_stop: int, new_stop: int) -> PathUpdate:
+        """Replace pieces ``first:old_stop`` by freshly generated pieces ``first:new_stop``."""
+
+        start = sum(len(piece) for piece in self._pieces[:first])
+        stop = start + sum(len(piece) for piece in self._pieces[first:old_stop])
+        pieces = self._generate(range(first, new_stop))
+        self._pieces[first:old_stop] = pieces
+        poses = np.concatenate(pieces) if pieces else np.empty((0, 6))
+        logger.debug("Regenerated control pieces %d-%d into %d waypoints", first, new_stop, len(poses))
+        return PathUpdate(start, stop, poses)
+
+    def _generate(self, pieces: range) -> List[np.ndarray]:
+        """Poses of the given pieces, projecting all of them in two batched queries."""
+
+        if not len(pieces):
+            return []
+        chords = [self._chord(index) for index in pieces]
+        projected = project_points(self._geometry, np.concatenate(chords), workers=self._workers).points
+        curves = self._refine(list(_split(projected, chords)))
+        samples = [_resample(curve, self._spacing) for curve in curves]
+        projection = project_points(self._geometry, np.concatenate(samples), workers=self._workers)
+        positions = projection.points + self._offset * projection.normals
+        poses = np.hstack([positions, rotation_vectors_from_normals(projection.normals)])
+        return list(_split(poses, samples))
+
+    def _refine(self, curves: List[np.ndarray]) -> List[np.ndarray]:
+        """Bisect steps longer than the chord sampling until the projected curves are continuous.
+
+        Where a chord passes a convex or concave edge its projection jumps from
+        one face to the other; the projected midpoints of such steps converge
+        onto the edge.
+        """
+
+        limit = self._spacing / OVERSAMPLING * 1.5
+        for _ in range(REFINE_ROUNDS):
+            gaps = [np.flatnonzero(np.linalg.norm(np.diff(curve, axis=0), axis=1) > limit) for curve in curves]
+            midpoints = [(curve[gap] + curve[gap + 1]) / 2.0 for curve, gap in zip(curves, gaps)]
+            if not any(len(gap) for gap in gaps):
+                break
+            projected = project_points(self._geometry, np.concatenate(midpoints), workers=self._workers).points
+            curves = [
+                np.insert(curve, gap + 1, part, axis=0)
+                for curve, gap, part in zip(curves, gaps, _split(projected, midpoints))
+            ]
+        return curves
+
+    def _chord(self, index: int) -> np.ndarray:
+        """Points along the straight line from control point ``index`` to the next one."""
+
+        start = self._controls[index]
+        if index + 1 == len(self._controls):
+            return start[None].copy()
+        end = self._controls[index + 1]
+        steps = max(int(np.ceil(np.linalg.norm(end - start) / self._spacing)), 1) * OVERSAMPLING
+        return start + np.linspace(0.0, 1.0, steps + 1)[:, None] * (end - start)
+
+    # endregion
+
+    def _snap(self, points: Sequence[float] | np.ndarray) -> np.ndarray:
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if not len(points):
+            return np.empty((0, 3))
+        return project_points(self._geometry, points, workers=self._workers).points
+
+    def _check_index(self, index: int) -> None:
+        if not 0 <= index < len(self._controls):
+            raise IndexError(f"Control point {index} out of range")
+
+    @staticmethod
+    def _check_spacing(spacing: float) -> float:
+        if spacing <= 0:
+            raise ValueError("Spacing must be positive")
+        return float(spacing)
+
+
+def _split(values: np.ndarray, parts: Sequence[np.ndarray]) -> Tuple[np.ndarray, ...]:
+    return tuple(np.split(values, np.cumsum([len(part) for part in parts])[:-1]))
+
+
+def _resample(polyline: np.ndarray, spacing: float) -> np.ndarray:
+    """Points at equal arc-length steps of at most ``spacing``, excluding the end point.
+
+    A single point is returned as is (the last control point); a polyline of
+    zero length yields nothing so duplicated control points are not doubled.
+    """
+
+    if len(polyline) == 1:
+        return polyline
+    arc = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(polyline, axis=0), axis=1))])
+    if arc[-1] <= 1e-9:
+        return np.empty((0, 3))
+    count = max(int(np.ceil(arc[-1] / spacing - 1e-9)), 1)
+    targets = np.linspace(0.0, arc[-1], count + 1)[:-1]
+    return np.stack([np.interp(targets, arc, polyline[:, axis]) for axis in range(3)], axis=1)
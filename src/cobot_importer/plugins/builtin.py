@@ -3,18 +3,30 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
+from typing import List, Optional
+
+import numpy as np
 
 from .base import ExportResult, RobotProgramExporter
 from ..core import Project, PathSegment
+from ..core.rotations import canonical_rotation_vectors
+from ..simulation.plan import MotionPlanCache, shared_plans
 
 
 class URScriptExporter:
-    """Generate a simplified URScript program from project paths."""
+    """Generate a simplified URScript program from project paths.
+
+    Each segment is emitted from its compiled motion plan: linear moves to
+    the approach point, through the waypoints (blended where the plan
+    blends) and up to the retract point, matching what the simulation plays.
+    """
 
     id = "builtin.urscript"
     display_name = "Universal Robots URScript"
 
+    def __init__(self, plans: Optional[MotionPlanCache] = None) -> None:
+        self.plans = plans or shared_plans()
+
     def supported_extensions(self) -> List[str]:
         return [".script"]
 
@@ -40,27 +52,21 @@ class URScriptExporter:
     def _emit_segment(self, segment: PathSegment) -> List[str]:
         commands: List[str] = []
         commands.append(f"  # Segment: {segment.name}")
-        if not segment.points:
+        plan = self.plans.plan(segment)
+        if plan is None:
             commands.append("  # (跳过 - 无点位)")
             return commands
-        for point in segment.points:
-            pose = [point.x / 1000.0, point.y / 1000.0, point.z / 1000.0, point.rx, point.ry, point.rz]
-            commands.append(
-                "  movej({pose}, a=1.2, v={speed})".format(
-                    pose=str(pose), speed=max(segment.speed / 1000.0, 0.05)
-                )
-            )
-        commands.append("  # retract")
-        last = segment.points[-1]
-        retract_pose = [
-            last.x / 1000.0,
-            last.y / 1000.0,
-            (last.z + segment.retract_height) / 1000.0,
-            last.rx,
-            last.ry,
-            last.rz,
-        ]
-        commands.append("  movej({pose}, a=1.2, v=0.1)".format(pose=str(retract_pose)))
+        acceleration = plan.limits.acceleration / 1000.0
+        # URScript expects rotation vectors with angles up to pi.
+        targets = np.hstack([plan.targets[:, :3] / 1000.0, canonical_rotation_vectors(plan.targets[:, 3:])])
+        rows = zip(targets.tolist(), plan.target_speeds.tolist(), plan.target_blends.tolist())
+        for index, (pose, speed, blend) in enumerate(rows):
+            if index == len(targets) - 1 and segment.retract_height > 0:
+                commands.append("  # retract")
+            command = f"  movel(p{pose}, a={acceleration:g}, v={speed / 1000.0:g}"
+            if blend > 0:
+                command += f", r={blend / 1000.0:g}"
+            commands.append(command + ")")
         return commands
 
 
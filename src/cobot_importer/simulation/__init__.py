@@ -1,5 +1,34 @@
 """Simple simulation helpers."""
 
-from .player import PathPlayer
+from .collision import CollisionChecker, CollisionReport, ToolShape
+from .cycle_time import CycleTimeEstimate, CycleTimeEstimator, SegmentTime
+from .kinematics import DHJoint, IKSolution, RobotModel, solve_ik
+from .plan import MotionLimits, MotionPlanCache, MotionProfiles, SegmentPlan, VelocityProfile, shared_plans
+from .player import FrameArrays, PathPlayer
+from .reachability import ReachabilityAnalyzer, ReachabilityReport
+from .trajectory import Trajectory, TrajectorySample
 
-__all__ = ["PathPlayer"]
+__all__ = [
+    "CollisionChecker",
+    "CollisionReport",
+    "CycleTimeEstimate",
+    "CycleTimeEstimator",
+    "DHJoint",
+    "FrameArrays",
+    "IKSolution",
+    "MotionLimits",
+    "MotionPlanCache",
+    "MotionProfiles",
+    "PathPlayer",
+    "ReachabilityAnalyzer",
+    "ReachabilityReport",
+    "RobotModel",
+    "SegmentPlan",
+    "SegmentTime",
+    "ToolShape",
+    "Trajectory",
+    "TrajectorySample",
+    "VelocityProfile",
+    "shared_plans",
+    "solve_ik",
+]
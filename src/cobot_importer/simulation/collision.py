@@ -0,0 +1,194 @@
+"""Swept tool-workpiece collision checking along the compiled motion plans."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..core import PathSegment
+from ..core.rotations import TOOL_AXIS, quaternion_matrices
+from ..core.spatial import MeshIndex
+from .plan import MotionPlanCache, SegmentPlan, shared_plans
+from .player import sweep_frames
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ToolShape:
+    """Capsule around the tool axis (mm).
+
+    It reaches from ``clearance`` behind the tool tip, where the tool may
+    touch the part, back to ``length`` behind the tip.
+    """
+
+    radius: float = 5.0
+    length: float = 100.0
+    clearance: float = 2.0
+
+    def axis_segments(self, positions: np.ndarray, orientations: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Start and end points of the capsule axis for tips at ``positions`` with quaternion ``orientations``."""
+
+        axes = quaternion_matrices(orientations) @ TOOL_AXIS
+        # The capsule's rounded end reaches ``radius`` past the axis start.
+        near = self.clearance + self.radius
+        far = max(self.length - self.radius, near)
+        return positions - near * axes, positions - far * axes
+
+
+@dataclass
+class CollisionReport:
+    """Frames of one segment's motion whose tool capsule touches the workpiece.
+
+    ``frame_vertex_indices`` maps every frame to the plan vertex it starts
+    from and ``frame_point_indices`` to that vertex's waypoint, with the
+    approach counted to the first and the retract to the last waypoint.
+    """
+
+    segment_id: str
+    revision: int
+    colliding: np.ndarray
+    frame_point_indices: np.ndarray
+    frame_vertex_indices: np.ndarray
+
+    @property
+    def has_collisions(self) -> bool:
+        return bool(self.colliding.any())
+
+    @property
+    def frame_ranges(self) -> List[Tuple[int, int]]:
+        """``(start, stop)`` frame ranges of consecutive colliding frames."""
+
+        edges = np.diff(np.concatenate([[0], self.colliding.astype(np.int8), [0]]))
+        return list(zip(np.flatnonzero(edges == 1).tolist(), np.flatnonzero(edges == -1).tolist()))
+
+    @property
+    def point_ranges(self) -> List[Tuple[int, int]]:
+        """Inclusive ``(first, last)`` waypoint ranges whose motion collides."""
+
+        return [
+            (int(self.frame_point_indices[start]), int(self.frame_point_indices[stop - 1]))
+            for start, stop in self.frame_ranges
+        ]
+
+    def point_flags(self, count: int) -> np.ndarray:
+        """Per waypoint: whether it or the motion to the next waypoint collides."""
+
+        return np.bincount(self.frame_point_indices, weights=self.colliding, minlength=count) > 0
+
+
+class CollisionChecker:
+    """Sweep a :class:`ToolShape` along each segment's motion and test it against the mesh.
+
+    The tool follows the segment's compiled :class:`~.plan.SegmentPlan`, the
+    motion the player and the exporters run: approach, waypoints with
+    blended corners and retract. Frames are spaced at half the tool radius so
+    consecutive capsules overlap, and all of a segment's frames are tested in
+    one batched BVH query. Reports are cached per segment id together with
+    the plan they were swept along; after an edit only the plan edges between
+    the unchanged head and tail of the segment are swept again.
+    """
+
+    def __init__(
+        self, index: MeshIndex, tool: Optional[ToolShape] = None, plans: Optional[MotionPlanCache] = None
+    ) -> None:
+        self._index = index
+        self._tool = tool or ToolShape()
+        self._plans = plans or shared_plans()
+        # segment id -> (report, plan it was swept along)
+        self._cache: Dict[str, Tuple[CollisionReport, SegmentPlan]] = {}
+
+    @property
+    def tool(self) -> ToolShape:
+        return self._tool
+
+    def set_tool(self, tool: ToolShape) -> None:
+        self._tool = tool
+        self._cache.clear()
+
+    def check(self, segments: Iterable[PathSegment]) -> List[CollisionReport]:
+        """Reports of the enabled segments with points, in order."""
+
+        reports = []
+        live = set()
+        for segment in segments:
+            if not segment.enabled or not len(segment.points):
+                continue
+            live.add(segment.id)
+            reports.append(self.check_segment(segment))
+        for stale in set(self._cache) - live:
+            del self._cache[stale]
+        return reports
+
+    def check_segment(self, segment: PathSegment) -> CollisionReport:
+        plan = self._plans.plan(segment)
+        if plan is None:
+            raise ValueError(f"Segment {segment.name!r} has no points")
+        cached = self._cache.get(segment.id)
+        if cached is not None and cached[1] is plan:
+            return cached[0]
+        rows = _plan_rows(plan)
+        if cached is None:
+            head, tail = 0, len(rows)
+            colliding, vertex_indices = self._sweep(plan.vertices, plan.orientations)
+        else:
+            report, previous = cached
+            old = _plan_rows(previous)
+            head, tail = _changed_span(old, rows)
+            # Edges before ``head`` and from ``tail`` on keep their frames; the last vertex counts as an edge.
+            middle_colliding, middle_indices = self._sweep(
+                plan.vertices[head : tail + 1], plan.orientations[head : tail + 1]
+            )
+            if tail < len(rows):
+                keep = middle_indices < tail - head
+                middle_colliding, middle_indices = middle_colliding[keep], middle_indices[keep]
+            before = report.frame_vertex_indices < head
+            after = report.frame_vertex_indices >= tail + len(old) - len(rows)
+            colliding = np.concatenate([report.colliding[before], middle_colliding, report.colliding[after]])
+            vertex_indices = np.concatenate(
+                [
+                    report.frame_vertex_indices[before],
+                    middle_indices + head,
+                    report.frame_vertex_indices[after] + len(rows) - len(old),
+                ]
+            )
+        point_indices = plan.waypoint_indices[vertex_indices]
+        report = CollisionReport(segment.id, plan.revision, colliding, point_indices, vertex_indices)
+        logger.debug(
+            "Swept plan vertices %d-%d of %s: %d ranges collide", head, tail, segment.name, len(report.frame_ranges)
+        )
+        self._cache[segment.id] = (report, plan)
+        return report
+
+    def _sweep(self, positions: np.ndarray, orientations: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per frame along a polyline: whether the tool collides, and the vertex the frame starts from."""
+
+        frames = sweep_frames(positions, orientations, max(0.5 * self._tool.radius, 0.1))
+        starts, ends = self._tool.axis_segments(frames.positions, frames.orientations)
+        return self._index.segments_within(starts, ends, self._tool.radius), frames.point_indices
+
+
+def _plan_rows(plan: SegmentPlan) -> np.ndarray:
+    """One row per plan vertex: position and orientation."""
+
+    return np.hstack([plan.vertices, plan.orientations])
+
+
+def _changed_span(old: np.ndarray, new: np.ndarray) -> Tuple[int, int]:
+    """Vertex pairs ``head:tail`` of ``new`` that differ from ``old``.
+
+    Pair ``i`` joins rows ``i`` and ``i + 1``; pairs before ``head`` match
+    ``old`` from the start and pairs from ``tail`` on match it from the end,
+    with pair ``len - 1`` standing for the last row alone.
+    """
+
+    shortest = min(len(old), len(new))
+    same = np.all(old[:shortest] == new[:shortest], axis=1)
+    prefix = int(np.argmin(same)) if not same.all() else shortest
+    same = np.all(old[len(old) - shortest :] == new[len(new) - shortest :], axis=1)[::-1]
+    suffix = int(np.argmin(same)) if not same.all() else shortest
+    suffix = min(suffix, shortest - prefix)
+    return max(prefix - 1, 0), len(new) - suffix
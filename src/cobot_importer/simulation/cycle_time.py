@@ -0,0 +1,88 @@
+"""Analytic cycle-time estimate of the project paths, updated per segment."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..core import PathSegment
+from .plan import MotionLimits, MotionPlanCache, MotionProfiles, shared_plans
+
+
+@dataclass
+class SegmentTime:
+    """Time (s) of one segment: its own motion from approach to retract, and the transit move into it."""
+
+    segment_id: str
+    name: str
+    motion: float
+    transit: float
+
+    @property
+    def total(self) -> float:
+        return self.motion + self.transit
+
+
+@dataclass
+class CycleTimeEstimate:
+    """Per-segment times of the enabled segments with points, in program order."""
+
+    segments: List[SegmentTime]
+
+    @property
+    def total(self) -> float:
+        return float(sum(item.total for item in self.segments))
+
+    @property
+    def transit(self) -> float:
+        return float(sum(item.transit for item in self.segments))
+
+
+class CycleTimeEstimator:
+    """Estimate the program duration from the segments' compiled motion plans.
+
+    Segment motion times come from the plans (speed, blends, approach and
+    retract under the acceleration and jerk limits) and are cached with the
+    segment's first and last vertex by segment id and revision, so an edit
+    re-times only that segment. Transit moves between consecutive segments
+    are timed together in one vectorized pass. The estimate equals the
+    duration of the :class:`~.trajectory.Trajectory` built from the same plans.
+    """
+
+    def __init__(self, plans: Optional[MotionPlanCache] = None) -> None:
+        self._plans = plans or shared_plans()
+        # segment id -> (revision, limits, motion time, first vertex, last vertex)
+        self._cache: Dict[str, Tuple[int, MotionLimits, float, np.ndarray, np.ndarray]] = {}
+
+    def estimate(self, segments: Iterable[PathSegment]) -> CycleTimeEstimate:
+        limits = self._plans.limits
+        live: List[Tuple[PathSegment, float, np.ndarray, np.ndarray]] = []
+        for segment in segments:
+            if not segment.enabled or not len(segment.points):
+                continue
+            cached = self._cache.get(segment.id)
+            if cached is None or cached[0] != segment.revision or cached[1] is not limits:
+                plan = self._plans.plan(segment)
+                cached = (plan.revision, limits, plan.duration, plan.vertices[0], plan.vertices[-1])
+                self._cache[segment.id] = cached
+            live.append((segment, cached[2], cached[3], cached[4]))
+        if len(self._cache) > len(live):
+            ids = {segment.id for segment, *_ in live}
+            self._cache = {key: value for key, value in self._cache.items() if key in ids}
+        if not live:
+            return CycleTimeEstimate([])
+
+        transit = np.zeros(len(live))
+        if len(live) > 1:
+            starts = np.array([item[2] for item in live[1:]])
+            ends = np.array([item[3] for item in live[:-1]])
+            gaps = np.linalg.norm(starts - ends, axis=1)
+            transit[1:] = MotionProfiles.transit(gaps, limits).durations
+        return CycleTimeEstimate(
+            [
+                SegmentTime(segment.id, segment.name, motion, float(moving))
+                for (segment, motion, _, _), moving in zip(live, transit.tolist())
+            ]
+        )
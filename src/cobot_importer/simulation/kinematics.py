@@ -0,0 +1,329 @@
+"""Batched forward and inverse kinematics of serial (DH) robot arms."""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.rotations import rotation_matrices
+
+logger = logging.getLogger(__name__)
+
+# Waypoints are reachable when the solved pose is this close (mm, rad) to the target.
+POSITION_TOLERANCE = 0.1
+ORIENTATION_TOLERANCE = 1e-3
+# Damping of the least-squares step and the largest joint change (rad) per iteration.
+DAMPING = 0.05
+MAX_JOINT_STEP = 0.3
+MAX_ITERATIONS = 60
+# Targets whose best residual has not shrunk by this fraction for this many iterations have stalled.
+STALL_PROGRESS = 1e-3
+STALL_ITERATIONS = 5
+# Every this many frames one is solved on its own from the previous one; the
+# frames in between start from the nearest of these.
+KEYFRAME_STRIDE = 16
+# Smallest singular value of the reach-normalized Jacobian counted as singular.
+SINGULARITY_THRESHOLD = 0.02
+# Joints closer than this (rad) to a limit are flagged.
+JOINT_LIMIT_MARGIN = np.radians(2.0)
+
+
+@dataclass
+class DHJoint:
+    """One revolute joint in standard Denavit-Hartenberg form (lengths in mm, angles in rad)."""
+
+    a: float = 0.0
+    alpha: float = 0.0
+    d: float = 0.0
+    offset: float = 0.0
+    lower: float = -2.0 * np.pi
+    upper: float = 2.0 * np.pi
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "a": self.a,
+            "alpha": self.alpha,
+            "d": self.d,
+            "offset": self.offset,
+            "lower": self.lower,
+            "upper": self.upper,
+        }
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "DHJoint":
+        return DHJoint(
+            a=float(data.get("a", 0.0)),
+            alpha=float(data.get("alpha", 0.0)),
+            d=float(data.get("d", 0.0)),
+            offset=float(data.get("offset", 0.0)),
+            lower=float(data.get("lower", -2.0 * np.pi)),
+            upper=float(data.get("upper", 2.0 * np.pi)),
+        )
+
+
+@dataclass
+class RobotModel:
+    """A serial arm of revolute DH joints.
+
+    ``base`` places the robot in the workpiece frame and ``tcp`` is the tool
+    centre point relative to the flange, both as ``x, y, z, rx, ry, rz``
+    poses like the waypoints. ``home`` is where inverse kinematics starts.
+    """
+
+    name: str
+    joints: List[DHJoint]
+    home: List[float] = field(default_factory=list)
+    base: List[float] = field(default_factory=lambda: [0.0] * 6)
+    tcp: List[float] = field(default_factory=lambda: [0.0] * 6)
+
+    def __post_init__(self) -> None:
+        if not self.home:
+            self.home = [0.0] * len(self.joints)
+        if len(self.home) != len(self.joints):
+            raise ValueError("home must have one value per joint")
+
+    # region Serialization
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "joints": [joint.to_dict() for joint in self.joints],
+            "home": list(self.home),
+            "base": list(self.base),
+            "tcp": list(self.tcp),
+        }
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "RobotModel":
+        return RobotModel(
+            name=data.get("name", "robot"),
+            joints=[DHJoint.from_dict(joint) for joint in data.get("joints", [])],
+            home=[float(value) for value in data.get("home", [])],
+            base=[float(value) for value in data.get("base", [0.0] * 6)],
+            tcp=[float(value) for value in data.get("tcp", [0.0] * 6)],
+        )
+
+    @staticmethod
+    def load(path: str | Path) -> "RobotModel":
+        """Read a model from a JSON file in the :meth:`to_dict` layout."""
+
+        with open(path, "r", encoding="utf-8") as handle:
+            model = RobotModel.from_dict(json.load(handle))
+        logger.info("Loaded robot model %s with %d joints from %s", model.name, len(model.joints), path)
+        return model
+
+    @staticmethod
+    def default() -> "RobotModel":
+        """A Universal Robots UR5e with its flange as TCP."""
+
+        return RobotModel(
+            name="UR5e",
+            joints=[
+                DHJoint(d=162.5, alpha=np.pi / 2),
+                DHJoint(a=-425.0, lower=-np.pi, upper=np.pi),
+                DHJoint(a=-392.2, lower=-np.pi, upper=np.pi),
+                DHJoint(d=133.3, alpha=np.pi / 2),
+                DHJoint(d=99.7, alpha=-np.pi / 2),
+                DHJoint(d=99.6),
+            ],
+            home=[0.0, -np.pi / 2, np.pi / 2, -np.pi / 2, -np.pi / 2, 0.0],
+        )
+
+    # endregion
+
+    @property
+    def dof(self) -> int:
+        return len(self.joints)
+
+    @property
+    def reach(self) -> float:
+        """Upper bound of the distance from the base to the flange (mm)."""
+
+        return float(sum(abs(joint.a) + abs(joint.d) for joint in self.joints)) or 1.0
+
+    @property
+    def lower_limits(self) -> np.ndarray:
+        return np.array([joint.lower for joint in self.joints])
+
+    @property
+    def upper_limits(self) -> np.ndarray:
+        return np.array([joint.upper for joint in self.joints])
+
+    def forward(self, joints: np.ndarray) -> np.ndarray:
+        """``(N, 4, 4)`` TCP transforms in the workpiece frame for ``(N, dof)`` joint values."""
+
+        return self._frames(np.atleast_2d(np.asarray(joints, dtype=float)))[:, -1]
+
+    def _frames(self, joints: np.ndarray) -> np.ndarray:
+        """``(N, dof + 2, 4, 4)`` frames: the base, every joint frame, then the TCP."""
+
+        count = len(joints)
+        frames = np.empty((count, self.dof + 2, 4, 4))
+        frames[:, 0] = _pose_matrix(self.base)
+        for index, joint in enumerate(self.joints):
+            theta = joints[:, index] + joint.offset
+            cos_t, sin_t = np.cos(theta), np.sin(theta)
+            cos_a, sin_a = np.cos(joint.alpha), np.sin(joint.alpha)
+            link = np.empty((count, 4, 4))
+            link[:, 0] = np.stack([cos_t, -sin_t * cos_a, sin_t * sin_a, joint.a * cos_t], axis=1)
+            link[:, 1] = np.stack([sin_t, cos_t * cos_a, -cos_t * sin_a, joint.a * sin_t], axis=1)
+            link[:, 2] = [0.0, sin_a, cos_a, joint.d]
+            link[:, 3] = [0.0, 0.0, 0.0, 1.0]
+            frames[:, index + 1] = frames[:, index] @ link
+        frames[:, -1] = frames[:, -2] @ _pose_matrix(self.tcp)
+        return frames
+
+    def jacobian(self, joints: np.ndarray) -> np.ndarray:
+        """``(N, 6, dof)`` geometric Jacobians (linear rows in mm/rad first) at the TCP."""
+
+        return _jacobian(self._frames(np.atleast_2d(np.asarray(joints, dtype=float))))
+
+
+@dataclass
+class IKSolution:
+    """Joint values solving a batch of target poses, with per-target diagnostics.
+
+    ``reachable`` targets are matched within the tolerances; ``singular``
+    ones are close to a kinematic singularity and ``at_limit`` ones have a
+    joint within :data:`JOINT_LIMIT_MARGIN` of its limit.
+    """
+
+    joints: np.ndarray
+    position_errors: np.ndarray
+    orientation_errors: np.ndarray
+    reachable: np.ndarray
+    singular: np.ndarray
+    at_limit: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.joints)
+
+
+def solve_ik(
+    model: RobotModel,
+    positions: np.ndarray,
+    rotations: np.ndarray,
+    seed: Optional[Sequence[float]] = None,
+) -> IKSolution:
+    """Damped least-squares inverse kinematics for consecutive target poses.
+
+    ``positions`` are ``(N, 3)`` TCP positions and ``rotations`` ``(N, 3, 3)``
+    orientations, in path order. Every :data:`KEYFRAME_STRIDE`-th target is
+    solved on its own, warm-started from the previous one (the first from
+    ``seed``, default the model's home); the remaining targets are then solved
+    together, each starting from the keyframe before it. Consecutive frames
+    thereby stay on the same arm configuration.
+    """
+
+    positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+    rotations = np.asarray(rotations, dtype=float).reshape(-1, 3, 3)
+    count = len(positions)
+    joints = np.empty((count, model.dof))
+    if not count:
+        empty = np.zeros(0, dtype=bool)
+        return IKSolution(joints, np.empty(0), np.empty(0), empty, empty, empty.copy())
+
+    current = np.asarray(model.home if seed is None else seed, dtype=float)
+    keyframes = np.arange(0, count, KEYFRAME_STRIDE)
+    for index in keyframes:
+        current = _solve(model, positions[index : index + 1], rotations[index : index + 1], current[None])[0]
+        joints[index] = current
+    others = np.setdiff1d(np.arange(count), keyframes)
+    if len(others):
+        seeds = joints[others - others % KEYFRAME_STRIDE]
+        joints[others] = _solve(model, positions[others], rotations[others], seeds)
+
+    frames = model._frames(joints)
+    position_errors, orientation_errors = _pose_errors(frames[:, -1], positions, rotations)
+    jacobians = _jacobian(frames)
+    jacobians[:, :3] /= model.reach
+    smallest = np.linalg.svd(jacobians, compute_uv=False)[:, -1]
+    lower, upper = model.lower_limits, model.upper_limits
+    at_limit = np.any((joints - lower < JOINT_LIMIT_MARGIN) | (upper - joints < JOINT_LIMIT_MARGIN), axis=1)
+    reachable = (position_errors <= POSITION_TOLERANCE) & (orientation_errors <= ORIENTATION_TOLERANCE)
+    return IKSolution(
+        joints=joints,
+        position_errors=position_errors,
+        orientation_errors=orientation_errors,
+        reachable=reachable,
+        singular=smallest < SINGULARITY_THRESHOLD,
+        at_limit=at_limit,
+    )
+
+
+def _solve(model: RobotModel, positions: np.ndarray, rotations: np.ndarray, joints: np.ndarray) -> np.ndarray:
+    """Iterate damped least-squares steps until every target converges or the iterations run out."""
+
+    joints = joints.copy()
+    lower, upper = model.lower_limits, model.upper_limits
+    active = np.arange(len(joints))
+    best = np.full(len(joints), np.inf)
+    waited = np.zeros(len(joints), dtype=np.int64)
+    damping = np.eye(6) * DAMPING**2
+    for _ in range(MAX_ITERATIONS):
+        frames = model._frames(joints[active])
+        tcp = frames[:, -1]
+        position_error = positions[active] - tcp[:, :3, 3]
+        rotation_error = rotations[active] @ np.swapaxes(tcp[:, :3, :3], 1, 2)
+        # Axis times sine of the remaining rotation; exact zero at the target.
+        orientation_error = 0.5 * np.stack(
+            [
+                rotation_error[:, 2, 1] - rotation_error[:, 1, 2],
+                rotation_error[:, 0, 2] - rotation_error[:, 2, 0],
+                rotation_error[:, 1, 0] - rotation_error[:, 0, 1],
+            ],
+            axis=1,
+        )
+        error = np.hstack([position_error / model.reach, orientation_error])
+        residual = np.linalg.norm(error, axis=1)
+        done = (np.linalg.norm(position_error, axis=1) < 0.1 * POSITION_TOLERANCE) & (
+            np.linalg.norm(orientation_error, axis=1) < 0.1 * ORIENTATION_TOLERANCE
+        )
+        # Unreachable targets settle near the closest pose; stop iterating them once they stop improving.
+        improved = residual < best[active] * (1.0 - STALL_PROGRESS)
+        best[active] = np.minimum(best[active], residual)
+        waited[active] = np.where(improved, 0, waited[active] + 1)
+        stalled = waited[active] >= STALL_ITERATIONS
+        keep = ~(done | stalled)
+        if not keep.any():
+            break
+        active, frames, error = active[keep], frames[keep], error[keep]
+        jacobians = _jacobian(frames)
+        jacobians[:, :3] /= model.reach
+        transposed = np.swapaxes(jacobians, 1, 2)
+        steps = transposed @ np.linalg.solve(jacobians @ transposed + damping, error[:, :, None])
+        steps = steps[:, :, 0]
+        largest = np.abs(steps).max(axis=1, keepdims=True)
+        steps *= np.minimum(1.0, MAX_JOINT_STEP / np.maximum(largest, 1e-12))
+        joints[active] = np.clip(joints[active] + steps, lower, upper)
+    return joints
+
+
+def _jacobian(frames: np.ndarray) -> np.ndarray:
+    """Geometric Jacobians from the frames of :meth:`RobotModel._frames`."""
+
+    axes = frames[:, :-2, :3, 2]
+    origins = frames[:, :-2, :3, 3]
+    tip = frames[:, -1, :3, 3]
+    linear = np.cross(axes, tip[:, None, :] - origins)
+    return np.concatenate([np.swapaxes(linear, 1, 2), np.swapaxes(axes, 1, 2)], axis=1)
+
+
+def _pose_errors(transforms: np.ndarray, positions: np.ndarray, rotations: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Distances (mm) and rotation angles (rad) between ``transforms`` and the targets."""
+
+    distances = np.linalg.norm(transforms[:, :3, 3] - positions, axis=1)
+    traces = np.einsum("nij,nij->n", transforms[:, :3, :3], rotations)
+    angles = np.arccos(np.clip(0.5 * (traces - 1.0), -1.0, 1.0))
+    return distances, angles
+
+
+def _pose_matrix(pose: Sequence[float]) -> np.ndarray:
+    matrix = np.eye(4)
+    matrix[:3, :3] = rotation_matrices(np.asarray(pose[3:6], dtype=float))[0]
+    matrix[:3, 3] = pose[:3]
+    return matrix
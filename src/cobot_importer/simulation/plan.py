@@ -0,0 +1,404 @@
+"""Compiled motion plans: the approach, blended waypoints and retract of each segment with timing."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..core import PathSegment
+from ..core.rotations import quaternions_from_rotation_vectors
+
+logger = logging.getLogger(__name__)
+
+# Points sampled along each blended corner.
+BLEND_SAMPLES = 9
+UP = np.array([0.0, 0.0, 1.0])
+
+
+class VelocityProfile(str, Enum):
+    """Speed profile of a stop-to-stop move."""
+
+    TRAPEZOID = "trapezoid"
+    S_CURVE = "s_curve"
+
+
+@dataclass
+class MotionLimits:
+    """Tool acceleration (mm/s²) and jerk (mm/s³) limits, and the speed (mm/s) of moves between segments."""
+
+    acceleration: float = 1200.0
+    jerk: float = 12000.0
+    travel_speed: float = 250.0
+    profile: VelocityProfile = VelocityProfile.S_CURVE
+
+    @property
+    def effective_jerk(self) -> float:
+        """Jerk limit of the selected profile; infinite for the trapezoidal profile."""
+
+        return self.jerk if self.profile == VelocityProfile.S_CURVE else np.inf
+
+
+@dataclass
+class SegmentPlan:
+    """Compiled motion of one segment, shared by playback, drawing and export.
+
+    ``vertices`` is the tool polyline from ``approach_height`` above the first
+    waypoint over the waypoints, with corners rounded within ``blend_radius``,
+    to ``retract_height`` above the last one. Per vertex it holds the
+    orientation quaternion ``(w, x, y, z)``, the waypoint it belongs to
+    (``-1`` on approach and retract), the speed of the outgoing edge and
+    whether the tool stops there. ``profiles`` times the stop-to-stop moves,
+    which start at ``start_times`` (followed by the total duration).
+
+    ``targets`` are the poses a robot program moves through: approach point,
+    waypoints and retract point, with the speed of the move that reaches each
+    one and the blend radius it is passed with (``0`` where the tool stops).
+    """
+
+    segment_id: str
+    revision: int
+    limits: MotionLimits
+    vertices: np.ndarray
+    orientations: np.ndarray
+    point_indices: np.ndarray
+    speeds: np.ndarray
+    stops: np.ndarray
+    arc: np.ndarray
+    profiles: "MotionProfiles"
+    start_times: np.ndarray
+    targets: np.ndarray
+    target_point_indices: np.ndarray
+    target_speeds: np.ndarray
+    target_blends: np.ndarray
+
+    @property
+    def duration(self) -> float:
+        """Time in seconds from the approach point to the retract point."""
+
+        return float(self.start_times[-1])
+
+    @property
+    def length(self) -> float:
+        """Tool path length in mm."""
+
+        return float(self.arc[-1])
+
+    @property
+    def stop_indices(self) -> np.ndarray:
+        return np.flatnonzero(self.stops)
+
+    @property
+    def waypoint_indices(self) -> np.ndarray:
+        """Waypoint of every vertex, counting the approach to the first and the retract to the last waypoint."""
+
+        first = np.arange(len(self.point_indices)) == 0
+        return np.where(self.point_indices >= 0, self.point_indices, np.where(first, 0, self.point_indices.max()))
+
+
+def compile_segment(segment: PathSegment, limits: MotionLimits) -> SegmentPlan:
+    """Compile the motion of a segment with at least one waypoint."""
+
+    poses = np.array(segment.points.poses, dtype=float)
+    if not len(poses):
+        raise ValueError(f"Segment {segment.name!r} has no points")
+    # Segments without a speed of their own move at the travel speed.
+    speed = float(segment.speed) if segment.speed > 0 else limits.travel_speed
+    positions = poses[:, :3]
+    quaternions = quaternions_from_rotation_vectors(poses[:, 3:])
+    vertices, stops, point_ids, corner_radii = _waypoint_run(positions, segment.blend_radius, speed, limits)
+    orientations = quaternions[point_ids]
+
+    # Approach and retract points keep the orientation of the waypoint they lead to or come from.
+    target_poses = [poses]
+    target_ids = [np.arange(len(poses))]
+    blends = [np.concatenate([[0.0], corner_radii, [0.0]]) if len(poses) > 1 else np.zeros(1)]
+    target_speeds = [np.concatenate([[limits.travel_speed], np.full(len(poses) - 1, speed)])]
+    if segment.approach_height > 0:
+        approach = positions[:1] + UP * segment.approach_height
+        vertices = np.concatenate([approach, vertices])
+        orientations = np.concatenate([quaternions[:1], orientations])
+        stops = np.concatenate([[True], stops])
+        point_ids = np.concatenate([[-1], point_ids])
+        target_poses.insert(0, np.hstack([approach, poses[:1, 3:]]))
+        target_ids.insert(0, np.full(1, -1))
+        blends.insert(0, np.zeros(1))
+        target_speeds[0][0] = speed
+        target_speeds.insert(0, np.full(1, limits.travel_speed))
+    if segment.retract_height > 0:
+        retract = positions[-1:] + UP * segment.retract_height
+        vertices = np.concatenate([vertices, retract])
+        orientations = np.concatenate([orientations, quaternions[-1:]])
+        stops = np.concatenate([stops, [True]])
+        point_ids = np.concatenate([point_ids, [-1]])
+        target_poses.append(np.hstack([retract, poses[-1:, 3:]]))
+        target_ids.append(np.full(1, -1))
+        blends.append(np.zeros(1))
+        target_speeds.append(np.full(1, speed))
+
+    arc = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(vertices, axis=0), axis=1))])
+    stop_indices = np.flatnonzero(stops)
+    profiles = MotionProfiles(
+        np.diff(arc[stop_indices]),
+        np.full(len(stop_indices) - 1, speed),
+        limits.acceleration,
+        limits.effective_jerk,
+    )
+    return SegmentPlan(
+        segment_id=segment.id,
+        revision=segment.revision,
+        limits=limits,
+        vertices=vertices,
+        orientations=orientations,
+        point_indices=point_ids,
+        speeds=np.full(len(vertices), speed),
+        stops=stops,
+        arc=arc,
+        profiles=profiles,
+        start_times=np.concatenate([[0.0], np.cumsum(profiles.durations)]),
+        targets=np.concatenate(target_poses),
+        target_point_indices=np.concatenate(target_ids),
+        target_speeds=np.concatenate(target_speeds),
+        target_blends=np.concatenate(blends),
+    )
+
+
+class MotionPlanCache:
+    """Compiled segment plans by segment id, recompiled when the segment revision changes.
+
+    Snapshots of a segment share its id and revision and therefore its plan.
+    Plans are kept for every segment ever planned until :meth:`retain` or
+    :meth:`invalidate` drops the ones of deleted segments, so a rebuild over
+    the whole project only compiles the segments edited since the last one.
+    """
+
+    def __init__(self, limits: Optional[MotionLimits] = None) -> None:
+        self._limits = limits or MotionLimits()
+        self._plans: Dict[str, SegmentPlan] = {}
+        self._compiled = 0
+
+    @property
+    def limits(self) -> MotionLimits:
+        return self._limits
+
+    @property
+    def compiled(self) -> int:
+        """Number of plans compiled so far."""
+
+        return self._compiled
+
+    def set_limits(self, limits: MotionLimits) -> None:
+        self._limits = limits
+        self._plans.clear()
+
+    def plan(self, segment: PathSegment) -> Optional[SegmentPlan]:
+        """Plan of ``segment``, or ``None`` when it has no points."""
+
+        if not len(segment.points):
+            self._plans.pop(segment.id, None)
+            return None
+        plan = self._plans.get(segment.id)
+        if plan is not None and plan.revision == segment.revision:
+            return plan
+        plan = compile_segment(segment, self._limits)
+        self._compiled += 1
+        logger.debug("Compiled %s: %d vertices, %.2f s", segment.name, len(plan.vertices), plan.duration)
+        self._plans[segment.id] = plan
+        return plan
+
+    def plans(self, segments: Iterable[PathSegment]) -> List[Tuple[int, SegmentPlan]]:
+        """``(segment index, plan)`` of the enabled segments with points, in order."""
+
+        result = []
+        for s_index, segment in enumerate(segments):
+            if not segment.enabled:
+                continue
+            plan = self.plan(segment)
+            if plan is not None:
+                result.append((s_index, plan))
+        return result
+
+    def invalidate(self, segment_id: Optional[str] = None) -> None:
+        """Drop the plan of one segment, or every plan."""
+
+        if segment_id is None:
+            self._plans.clear()
+        else:
+            self._plans.pop(segment_id, None)
+
+    def retain(self, segments: Iterable[PathSegment]) -> None:
+        """Drop the plans of segments other than ``segments`` (the live project)."""
+
+        live = {segment.id for segment in segments}
+        for segment_id in [key for key in self._plans if key not in live]:
+            del self._plans[segment_id]
+
+
+_shared_plans = MotionPlanCache()
+
+
+def shared_plans() -> MotionPlanCache:
+    """Process-wide cache used by consumers that are not given one, so they all read the same plans."""
+
+    return _shared_plans
+
+
+def _waypoint_run(
+    positions: np.ndarray, blend_radius: float, speed: float, limits: MotionLimits
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Vertices of one segment's waypoints with blended corners, their stop flags and waypoint ids.
+
+    Also returns the blend radius of every inner waypoint, ``0`` where the
+    tool has to stop.
+    """
+
+    count = len(positions)
+    if blend_radius <= 0 or count < 3:
+        return positions, np.ones(count, dtype=bool), np.arange(count), np.zeros(max(count - 2, 0))
+    corners = positions[1:-1]
+    to_previous = positions[:-2] - corners
+    to_next = positions[2:] - corners
+    previous_length = np.linalg.norm(to_previous, axis=1, keepdims=True)
+    next_length = np.linalg.norm(to_next, axis=1, keepdims=True)
+    radius = np.minimum(blend_radius, 0.5 * np.minimum(previous_length, next_length))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        entry_direction = np.nan_to_num(to_previous / previous_length)
+        exit_direction = np.nan_to_num(to_next / next_length)
+    entry = corners + radius * entry_direction
+    exit_ = corners + radius * exit_direction
+    # Quadratic Bezier from the entry to the exit point with the waypoint as control point.
+    u = np.linspace(0.0, 1.0, BLEND_SAMPLES)[None, :, None]
+    blends = (1 - u) ** 2 * entry[:, None] + 2 * u * (1 - u) * corners[:, None] + u**2 * exit_[:, None]
+
+    # The tightest radius of a round blend is radius * tan(angle / 2) for the angle between the legs.
+    cosine = np.clip(np.einsum("ij,ij->i", entry_direction, exit_direction), -1.0, 1.0)
+    half_angle = 0.5 * np.arccos(cosine)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        curvature_radius = np.where(cosine > -1.0, radius[:, 0] * np.tan(half_angle), np.inf)
+    corner_speed = np.sqrt(limits.acceleration * np.nan_to_num(curvature_radius, nan=0.0, posinf=np.inf))
+    stopping = corner_speed < speed
+    corner_stops = np.zeros((len(corners), BLEND_SAMPLES), dtype=bool)
+    corner_stops[:, BLEND_SAMPLES // 2] = stopping
+
+    vertices = np.concatenate([positions[:1], blends.reshape(-1, 3), positions[-1:]])
+    stops = np.concatenate([[True], corner_stops.ravel(), [True]])
+    point_ids = np.concatenate([[0], np.repeat(np.arange(1, count - 1), BLEND_SAMPLES), [count - 1]])
+    return vertices, stops, point_ids, np.where(stopping, 0.0, radius[:, 0])
+
+
+class MotionProfiles:
+    """Symmetric rest-to-rest speed profiles of many moves, evaluated vectorized.
+
+    Each move accelerates with jerk ``jerk`` up to at most ``acceleration``,
+    cruises and decelerates mirror-symmetrically; an infinite jerk gives the
+    trapezoidal profile. Moves too short to reach their speed peak lower.
+    ``durations`` holds the time of every move; :meth:`evaluate` gives the
+    distance and speed of any moves at any times. Segment plans carry the
+    profiles of their moves, :meth:`transit` builds the moves between
+    segments and :meth:`concatenate` joins them into one program.
+    """
+
+    _FIELDS = (
+        "lengths",
+        "peak",
+        "jerk_time",
+        "constant_time",
+        "peak_acceleration",
+        "ramp_time",
+        "ramp_distance",
+        "cruise_time",
+        "durations",
+    )
+
+    def __init__(self, lengths: np.ndarray, speeds: np.ndarray, acceleration: float, jerk: float) -> None:
+        a, j = float(acceleration), float(jerk)
+        lengths = np.maximum(lengths, 0.0)
+        # Highest peak speed whose acceleration and deceleration fit into the move.
+        if np.isinf(j):
+            reachable = np.sqrt(lengths * a)
+        else:
+            ratio = a / j
+            full = 0.5 * a * (np.sqrt(ratio * ratio + 4.0 * lengths / a) - ratio)
+            reachable = np.where(full >= a * ratio, full, (0.5 * lengths * np.sqrt(j)) ** (2.0 / 3.0))
+        peak = np.minimum(speeds, reachable)
+        if np.isinf(j):
+            jerk_time = np.zeros_like(peak)
+        else:
+            jerk_time = np.where(peak * j >= a * a, a / j, np.sqrt(peak / j))
+        peak_acceleration = j * jerk_time if not np.isinf(j) else np.full_like(peak, a)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            constant_time = np.where(peak > 0, peak / peak_acceleration - jerk_time, 0.0)
+        constant_time = np.maximum(np.nan_to_num(constant_time), 0.0)
+        ramp_time = 2.0 * jerk_time + constant_time
+        ramp_distance = 0.5 * peak * ramp_time
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cruise_time = np.where(peak > 0, (lengths - 2.0 * ramp_distance) / peak, 0.0)
+        self._jerk = j
+        self.lengths = lengths
+        self.peak = peak
+        self.jerk_time = jerk_time
+        self.constant_time = constant_time
+        self.peak_acceleration = peak_acceleration
+        self.ramp_time = ramp_time
+        self.ramp_distance = ramp_distance
+        self.cruise_time = np.maximum(cruise_time, 0.0)
+        self.durations = 2.0 * ramp_time + self.cruise_time
+
+    @classmethod
+    def transit(cls, lengths: np.ndarray, limits: MotionLimits) -> "MotionProfiles":
+        """Moves of ``lengths`` between segments at the travel speed of ``limits``."""
+
+        lengths = np.asarray(lengths, dtype=float)
+        return cls(lengths, np.full(len(lengths), limits.travel_speed), limits.acceleration, limits.effective_jerk)
+
+    @classmethod
+    def concatenate(cls, blocks: List["MotionProfiles"], jerk: float) -> "MotionProfiles":
+        """The moves of ``blocks`` in order; they must share the acceleration and ``jerk`` limits."""
+
+        profiles = cls.__new__(cls)
+        profiles._jerk = float(jerk)
+        for name in cls._FIELDS:
+            setattr(profiles, name, np.concatenate([np.empty(0)] + [getattr(block, name) for block in blocks]))
+        return profiles
+
+    def evaluate(self, moves: np.ndarray, times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Distance travelled and speed of ``moves`` at ``times`` after their start."""
+
+        times = np.clip(times, 0.0, self.durations[moves])
+        ramp = self.ramp_time[moves]
+        cruise_end = ramp + self.cruise_time[moves]
+        decelerating = times > cruise_end
+        # The deceleration mirrors the acceleration, measured back from the end.
+        ramp_times = np.where(decelerating, self.durations[moves] - times, np.minimum(times, ramp))
+        ramp_distance, ramp_speed = self._ramp(moves, ramp_times)
+        peak = self.peak[moves]
+        cruising = (times > ramp) & ~decelerating
+        distance = np.where(
+            decelerating,
+            self.lengths[moves] - ramp_distance,
+            np.where(cruising, self.ramp_distance[moves] + peak * (times - ramp), ramp_distance),
+        )
+        speed = np.where(cruising, peak, ramp_speed)
+        return distance, speed
+
+    def _ramp(self, moves: np.ndarray, times: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Distance and speed ``times`` into the acceleration phase."""
+
+        jerk_time = self.jerk_time[moves]
+        constant_time = self.constant_time[moves]
+        a = self.peak_acceleration[moves]
+        j = self._jerk if not np.isinf(self._jerk) else 0.0
+        # Phase 1: jerk up; phase 2: constant acceleration; phase 3: jerk down.
+        t1 = np.minimum(times, jerk_time)
+        distance = j * t1**3 / 6.0
+        speed = 0.5 * j * t1**2
+        t2 = np.clip(times - jerk_time, 0.0, constant_time)
+        distance = distance + speed * t2 + 0.5 * a * t2**2
+        speed = speed + a * t2
+        t3 = np.clip(times - jerk_time - constant_time, 0.0, jerk_time)
+        distance = distance + speed * t3 + 0.5 * a * t3**2 - j * t3**3 / 6.0
+        speed = speed + a * t3 - 0.5 * j * t3**2
+        return distance, speed
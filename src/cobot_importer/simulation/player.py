@@ -3,11 +3,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Callable, Iterable, List
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 import numpy as np
 
-from ..core import PathPoint, PathSegment
+from ..core import PathSegment
+from ..core.rotations import slerp
+from .plan import MotionPlanCache, shared_plans
+
+# Frames computed per chunk by :meth:`PathPlayer.iter_chunks`.
+FRAME_CHUNK = 4096
 
 
 @dataclass
@@ -15,35 +20,151 @@ class PathFrame:
     position: np.ndarray
     segment_index: int
     point_index: int
+    orientation: Optional[np.ndarray] = None
+
+
+@dataclass
+class FrameArrays:
+    """Consecutive frames as parallel arrays.
+
+    ``(N, 3)`` positions, ``(N, 4)`` orientation quaternions ``(w, x, y, z)``
+    and the segment/point each frame lies on.
+    """
+
+    positions: np.ndarray
+    orientations: np.ndarray
+    segment_indices: np.ndarray
+    point_indices: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @staticmethod
+    def empty() -> "FrameArrays":
+        return FrameArrays(
+            np.empty((0, 3)), np.empty((0, 4)), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        )
+
+    @staticmethod
+    def concatenate(blocks: Iterable["FrameArrays"]) -> "FrameArrays":
+        blocks = list(blocks)
+        if not blocks:
+            return FrameArrays.empty()
+        return FrameArrays(
+            np.concatenate([block.positions for block in blocks]),
+            np.concatenate([block.orientations for block in blocks]),
+            np.concatenate([block.segment_indices for block in blocks]),
+            np.concatenate([block.point_indices for block in blocks]),
+        )
+
+
+def sweep_frames(positions: np.ndarray, orientations: np.ndarray, resolution: float) -> FrameArrays:
+    """Frames along a polyline at ``resolution`` followed by its last vertex, so the whole path is covered.
+
+    ``orientations`` holds the quaternion of every vertex; ``point_indices``
+    of the result is the vertex each frame starts from. The frames between
+    two vertices only depend on that pair, which lets callers re-sweep part
+    of a path.
+    """
+
+    if not len(positions):
+        return FrameArrays.empty()
+    last = FrameArrays(
+        positions[-1:],
+        orientations[-1:],
+        np.zeros(1, dtype=np.int64),
+        np.full(1, len(positions) - 1, dtype=np.int64),
+    )
+    if len(positions) < 2:
+        return last
+    plan = _plan(0, positions, orientations, np.arange(len(positions)), max(resolution, 0.1))
+    return FrameArrays.concatenate([PathPlayer._block(plan, 0, int(plan[4][-1])), last])
+
+
+# Segment index, vertex positions, quaternions and waypoint ids, and the first frame of every edge plus the total.
+_FramePlan = Tuple[int, np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+
+
+def _plan(
+    s_index: int, positions: np.ndarray, quaternions: np.ndarray, point_ids: np.ndarray, resolution: float
+) -> _FramePlan:
+    """Frame plan of one polyline, splitting each edge into steps of about ``resolution``."""
+
+    lengths = np.linalg.norm(np.diff(positions, axis=0), axis=1)
+    steps = np.maximum((lengths / resolution).astype(np.int64), 1)
+    return s_index, positions, quaternions, point_ids, np.concatenate([[0], np.cumsum(steps)])
 
 
 class PathPlayer:
-    """Generate interpolated frames across project paths."""
+    """Generate interpolated frames across project paths.
+
+    Frames follow each segment's compiled :class:`~.plan.SegmentPlan`: the
+    approach, the waypoints with blended corners and the retract. Every edge
+    is split into steps of about ``resolution``; positions are interpolated
+    linearly and orientations by SLERP. Only the step counts are computed up
+    front; frames are produced with NumPy on demand, either all at once
+    (:meth:`frames`) or in bounded chunks (:meth:`iter_chunks`). Plans are
+    immutable, so later edits do not affect the player.
+    """
 
-    def __init__(self, segments: Iterable[PathSegment], resolution: float = 1.0) -> None:
+    def __init__(
+        self, segments: Iterable[PathSegment], resolution: float = 1.0, plans: Optional[MotionPlanCache] = None
+    ) -> None:
         self._segments = list(segments)
         self._resolution = max(resolution, 0.1)
-        self._frames: List[PathFrame] = []
-        self._prepare_frames()
+        self._plans: List[_FramePlan] = []
+        self._prepare_frames(plans or shared_plans())
 
-    def _prepare_frames(self) -> None:
-        frames: List[PathFrame] = []
-        for s_index, segment in enumerate(self._segments):
-            if not segment.enabled or len(segment.points) < 2:
+    def _prepare_frames(self, plans: MotionPlanCache) -> None:
+        for s_index, plan in plans.plans(self._segments):
+            if len(plan.vertices) < 2:
                 continue
-            for p_index in range(len(segment.points) - 1):
-                start = self._point_to_array(segment.points[p_index])
-                end = self._point_to_array(segment.points[p_index + 1])
-                steps = max(int(np.linalg.norm(end - start) / self._resolution), 1)
-                for step in range(steps):
-                    t = step / steps
-                    position = start * (1 - t) + end * t
-                    frames.append(PathFrame(position=position, segment_index=s_index, point_index=p_index))
-        self._frames = frames
-
-    def iter_frames(self) -> Iterable[PathFrame]:
-        return iter(self._frames)
+            self._plans.append(
+                _plan(s_index, plan.vertices, plan.orientations, plan.point_indices, self._resolution)
+            )
+
+    @property
+    def frame_count(self) -> int:
+        return int(sum(plan[4][-1] for plan in self._plans))
+
+    def frames(self) -> FrameArrays:
+        """Every frame as contiguous arrays."""
+
+        return FrameArrays.concatenate(self._block(plan, 0, int(plan[4][-1])) for plan in self._plans)
+
+    def segment_frames(self, segment_index: int) -> FrameArrays:
+        """Frames of one segment (empty when it is disabled or too short to play)."""
+
+        for plan in self._plans:
+            if plan[0] == segment_index:
+                return self._block(plan, 0, int(plan[4][-1]))
+        return FrameArrays.empty()
+
+    def iter_chunks(self, chunk_size: int = FRAME_CHUNK) -> Iterator[FrameArrays]:
+        """Yield the frames in order, at most ``chunk_size`` at a time and never spanning two segments."""
+
+        chunk_size = max(int(chunk_size), 1)
+        for plan in self._plans:
+            total = int(plan[4][-1])
+            for start in range(0, total, chunk_size):
+                yield self._block(plan, start, min(start + chunk_size, total))
+
+    def iter_frames(self) -> Iterator[PathFrame]:
+        for chunk in self.iter_chunks():
+            rows = zip(chunk.positions, chunk.orientations, chunk.segment_indices, chunk.point_indices)
+            for position, orientation, s_index, p_index in rows:
+                yield PathFrame(
+                    position=position, segment_index=int(s_index), point_index=int(p_index), orientation=orientation
+                )
 
     @staticmethod
-    def _point_to_array(point: PathPoint) -> np.ndarray:
-        return np.array([point.x, point.y, point.z], dtype=float)
+    def _block(plan: _FramePlan, start: int, stop: int) -> FrameArrays:
+        """Frames ``start:stop`` of one segment."""
+
+        s_index, positions, quaternions, point_ids, offsets = plan
+        frames = np.arange(start, stop)
+        edges = np.searchsorted(offsets, frames, side="right") - 1
+        t = (frames - offsets[edges]) / (offsets[edges + 1] - offsets[edges])
+        points = positions[edges] + t[:, None] * (positions[edges + 1] - positions[edges])
+        orientations = slerp(quaternions[edges], quaternions[edges + 1], t)
+        return FrameArrays(points, orientations, np.full(len(frames), s_index, dtype=np.int64), point_ids[edges])
@@ -0,0 +1,124 @@
+"""Per-segment joint trajectories and reachability flags, cached by point revision."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..core import PathSegment
+from ..core.rotations import quaternion_matrices
+from .kinematics import IKSolution, RobotModel, solve_ik
+from .plan import MotionPlanCache, shared_plans
+from .player import sweep_frames
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReachabilityReport:
+    """Joint trajectory of one segment's motion and the flags of its waypoints.
+
+    ``joints`` holds one row per simulation frame and ``frame_point_indices``
+    the waypoint each frame starts from, with the approach counted to the
+    first and the retract to the last waypoint. A waypoint is flagged when it
+    or any frame on the way to the next waypoint is.
+    """
+
+    segment_id: str
+    revision: int
+    joints: np.ndarray
+    frame_point_indices: np.ndarray
+    reachable: np.ndarray
+    singular: np.ndarray
+    at_limit: np.ndarray
+
+    @property
+    def unreachable_count(self) -> int:
+        return int(np.count_nonzero(~self.reachable))
+
+    @property
+    def singular_count(self) -> int:
+        return int(np.count_nonzero(self.singular))
+
+    @property
+    def at_limit_count(self) -> int:
+        return int(np.count_nonzero(self.at_limit))
+
+
+class ReachabilityAnalyzer:
+    """Solve inverse kinematics over the simulation frames of each segment.
+
+    Frames follow the segment's compiled :class:`~.plan.SegmentPlan`, so the
+    approach, the blended corners and the retract the robot runs are checked
+    too. Reports are cached per segment id and reused while the segment keeps
+    its revision, so re-checking a project only solves edited segments.
+    Changing the robot model clears the cache.
+    """
+
+    def __init__(
+        self, model: Optional[RobotModel] = None, resolution: float = 5.0, plans: Optional[MotionPlanCache] = None
+    ) -> None:
+        self._model = model or RobotModel.default()
+        self._resolution = resolution
+        self._plans = plans or shared_plans()
+        self._cache: Dict[str, ReachabilityReport] = {}
+
+    @property
+    def model(self) -> RobotModel:
+        return self._model
+
+    def set_model(self, model: RobotModel) -> None:
+        self._model = model
+        self._cache.clear()
+
+    def analyze(self, segments: Iterable[PathSegment]) -> List[ReachabilityReport]:
+        """Reports of the enabled segments with points, in order."""
+
+        reports = []
+        live = set()
+        for segment in segments:
+            if not segment.enabled or not len(segment.points):
+                continue
+            live.add(segment.id)
+            reports.append(self.analyze_segment(segment))
+        for stale in set(self._cache) - live:
+            del self._cache[stale]
+        return reports
+
+    def analyze_segment(self, segment: PathSegment) -> ReachabilityReport:
+        plan = self._plans.plan(segment)
+        if plan is None:
+            raise ValueError(f"Segment {segment.name!r} has no points")
+        cached = self._cache.get(segment.id)
+        if cached is not None and cached.revision == plan.revision:
+            return cached
+        frames = sweep_frames(plan.vertices, plan.orientations, self._resolution)
+        solution = solve_ik(self._model, frames.positions, quaternion_matrices(frames.orientations))
+        report = self._report(segment, plan.revision, solution, plan.waypoint_indices[frames.point_indices])
+        logger.debug(
+            "IK for %s: %d frames, %d unreachable points", segment.name, len(solution), report.unreachable_count
+        )
+        self._cache[segment.id] = report
+        return report
+
+    @staticmethod
+    def _report(
+        segment: PathSegment, revision: int, solution: IKSolution, point_indices: np.ndarray
+    ) -> ReachabilityReport:
+        count = len(segment.points)
+
+        def per_point(flags: np.ndarray) -> np.ndarray:
+            return np.bincount(point_indices, weights=flags, minlength=count) > 0
+
+        return ReachabilityReport(
+            segment_id=segment.id,
+            revision=revision,
+            joints=solution.joints,
+            frame_point_indices=point_indices,
+            reachable=~per_point(~solution.reachable),
+            singular=per_point(solution.singular),
+            at_limit=per_point(solution.at_limit),
+        )
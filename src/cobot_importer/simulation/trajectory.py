@@ -0,0 +1,128 @@
+"""Time-parameterized tool motion through the project paths."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+import numpy as np
+
+from ..core import PathSegment
+from ..core.rotations import slerp
+from .plan import MotionLimits, MotionPlanCache, MotionProfiles, shared_plans
+
+
+@dataclass
+class TrajectorySample:
+    """Tool state at the sampled times.
+
+    Orientations are ``(N, 4)`` quaternions ``(w, x, y, z)``; ``point_indices``
+    is ``-1`` on approach, retract and travel moves.
+    """
+
+    positions: np.ndarray
+    orientations: np.ndarray
+    speeds: np.ndarray
+    segment_indices: np.ndarray
+    point_indices: np.ndarray
+
+
+class Trajectory:
+    """Tool path through every enabled segment, timed with velocity profiles.
+
+    Each segment is entered from ``approach_height`` above its first waypoint
+    and left to ``retract_height`` above its last one (along +Z); consecutive
+    segments are linked at ``travel_speed``. Without a ``blend_radius`` the
+    tool stops at every waypoint; with one, corners are rounded within the
+    radius and passed at the segment speed unless the acceleration limit
+    requires stopping there. Every stop-to-stop move follows a trapezoidal or
+    S-curve (jerk limited) speed profile. The segments' motion comes from
+    their compiled :class:`~.plan.SegmentPlan`, read from ``plans`` (by
+    default the shared cache), so only edited segments are compiled again.
+    :meth:`sample` evaluates any number of times at once, so playback can
+    sample by wall-clock time.
+    """
+
+    def __init__(
+        self,
+        segments: Iterable[PathSegment],
+        limits: Optional[MotionLimits] = None,
+        plans: Optional[MotionPlanCache] = None,
+    ) -> None:
+        if plans is None:
+            shared = shared_plans()
+            plans = shared if limits is None or limits == shared.limits else MotionPlanCache(limits)
+        self._limits = plans.limits
+        vertices, orientations, segment_ids, point_ids, stops, profiles = [], [], [], [], [], []
+        offset = 0
+        for s_index, plan in plans.plans(segments):
+            if vertices:
+                # Travel from the previous retract point, stopping on arrival.
+                gap = np.linalg.norm(plan.vertices[:1] - vertices[-1][-1:], axis=1)
+                profiles.append(MotionProfiles.transit(gap, self._limits))
+            vertices.append(plan.vertices)
+            orientations.append(plan.orientations)
+            segment_ids.append(np.full(len(plan.vertices), s_index))
+            point_ids.append(plan.point_indices)
+            stops.append(plan.stop_indices + offset)
+            profiles.append(plan.profiles)
+            offset += len(plan.vertices)
+        if vertices:
+            self._vertices = np.concatenate(vertices)
+            self._orientations = np.concatenate(orientations)
+            self._segment_ids = np.concatenate(segment_ids)
+            self._point_ids = np.concatenate(point_ids)
+        else:
+            self._vertices, self._orientations = np.empty((0, 3)), np.empty((0, 4))
+            self._segment_ids = self._point_ids = np.empty(0, dtype=np.int64)
+        self._arc = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(self._vertices, axis=0), axis=1))])
+        self._stops = np.concatenate([np.empty(0, dtype=np.int64)] + stops)
+        self._profiles = MotionProfiles.concatenate(profiles, self._limits.effective_jerk)
+        self._start_times = np.concatenate([[0.0], np.cumsum(self._profiles.durations)])
+
+    @property
+    def duration(self) -> float:
+        """Total motion time in seconds."""
+
+        return float(self._start_times[-1])
+
+    @property
+    def length(self) -> float:
+        """Total tool path length in mm."""
+
+        return float(self._arc[-1])
+
+    @property
+    def limits(self) -> MotionLimits:
+        return self._limits
+
+    def __bool__(self) -> bool:
+        return len(self._vertices) > 0
+
+    def sample(self, times: np.ndarray | float) -> TrajectorySample:
+        """Tool poses and speeds at ``times`` (seconds, clamped to the trajectory)."""
+
+        times = np.clip(np.atleast_1d(np.asarray(times, dtype=float)), 0.0, self.duration)
+        if len(self._vertices) == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return TrajectorySample(np.empty((0, 3)), np.empty((0, 4)), np.empty(0), empty, empty)
+        if len(self._stops) < 2:
+            count = len(times)
+            return TrajectorySample(
+                np.repeat(self._vertices[:1], count, axis=0),
+                np.repeat(self._orientations[:1], count, axis=0),
+                np.zeros(count),
+                np.full(count, self._segment_ids[0]),
+                np.full(count, self._point_ids[0]),
+            )
+        moves = np.clip(np.searchsorted(self._start_times, times, side="right") - 1, 0, len(self._stops) - 2)
+        distance, speed = self._profiles.evaluate(moves, times - self._start_times[moves])
+        arc = self._arc[self._stops[moves]] + distance
+        edges = np.clip(np.searchsorted(self._arc, arc, side="right") - 1, 0, len(self._vertices) - 2)
+        lengths = self._arc[edges + 1] - self._arc[edges]
+        fraction = np.divide(arc - self._arc[edges], lengths, out=np.zeros_like(arc), where=lengths > 0)
+        starts, ends = self._vertices[edges], self._vertices[edges + 1]
+        fraction = np.clip(fraction, 0.0, 1.0)
+        positions = starts + fraction[:, None] * (ends - starts)
+        orientations = slerp(self._orientations[edges], self._orientations[edges + 1], fraction)
+        return TrajectorySample(positions, orientations, speed, self._segment_ids[edges], self._point_ids[edges])
@@ -4,32 +4,88 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import numpy as np
-from PySide6.QtCore import QTimer, Qt
-from PySide6.QtGui import QAction
+from PySide6.QtCore import QElapsedTimer, QTimer, Qt, Signal
+from PySide6.QtGui import QAction, QCloseEvent, QKeySequence
 from PySide6.QtWidgets import (
     QFileDialog,
     QInputDialog,
+    QLabel,
     QMainWindow,
     QMessageBox,
+    QProgressBar,
+    QPushButton,
     QSplitter,
 )
 
-from ..core import ModelLoader, Project, ProjectSerializer
+from ..core import (
+    AsyncModelLoader,
+    ChangeSet,
+    EditHistory,
+    EditJournal,
+    LoadCancelled,
+    MeshCache,
+    MeshLoadTask,
+    PathSegment,
+    Project,
+    ProjectEditor,
+    ProjectSerializer,
+)
+from ..core.edits import Edit
+from ..core.projection import project_segment
+from ..core.slicing import plane_offsets, sections_to_segments, slice_mesh
+from ..core.surface_path import PathUpdate, SurfacePathGenerator
 from ..plugins import PluginLoader
 from ..plugins.builtin import BUILTIN_EXPORTERS
-from ..simulation import PathPlayer
+from ..simulation import (
+    CollisionChecker,
+    CycleTimeEstimate,
+    CycleTimeEstimator,
+    ReachabilityAnalyzer,
+    RobotModel,
+    ToolShape,
+    Trajectory,
+    shared_plans,
+)
 from .path_manager import PathManagerWidget
+from .perf_monitor import PerfMonitor
 from .scene_view import SceneView
+from .update_scheduler import UpdateScheduler
 
 logger = logging.getLogger(__name__)
 
+CONTAINER_FILTER = "Cobot3D Project (*.cobot3d)"
+JSON_FILTER = "Cobot3D JSON Project (*.cobot3d)"
+UNDO_MEMORY_LIMIT = 64 * 1024 * 1024
+MODEL_LOAD_STAGES = {
+    "hash": "校验模型文件",
+    "parse": "解析模型",
+    "lod": "生成细节层级",
+    "index": "构建空间索引",
+    "cache": "写入模型缓存",
+    "done": "完成",
+}
+# Simulation ticks aim for ~60 fps; the marker position follows the wall clock regardless.
+SIMULATION_INTERVAL_MS = 16
+SECTION_AXES = {"X": (1.0, 0.0, 0.0), "Y": (0.0, 1.0, 0.0), "Z": (0.0, 0.0, 1.0)}
+# Longest segments listed in the cycle-time tooltip.
+CYCLE_TIME_TOOLTIP_ROWS = 20
+# Views refreshed after project edits, in flush order.
+UPDATE_CHANNELS = ("scene", "simulation", "status", "validation")
+
 
 class MainWindow(QMainWindow):
     """Primary window orchestrating UI components."""
 
+    # (error, project revision written by the compaction)
+    _compaction_finished = Signal(object, object)
+    # Model loading, forwarded from the loader thread: (token, ...)
+    _model_progress = Signal(int, float, str)
+    _model_bounds = Signal(int, object)
+    _model_finished = Signal(int, object, object)
+
     def __init__(self) -> None:
         super().__init__()
         self.setWindowTitle("Cobot Importer 3D")
@@ -37,12 +93,32 @@ class MainWindow(QMainWindow):
 
         self._project = Project()
         self._project_path: Optional[Path] = None
+        self._project_format = ProjectSerializer.FORMAT_CONTAINER
+        self._editor = ProjectEditor(self._project)
+        self._editor.subscribe(self._on_project_changed)
+        self._history = EditHistory(self._editor, memory_limit=UNDO_MEMORY_LIMIT)
+        self._journal: Optional[EditJournal] = None
+        self._saved_revision: Optional[int] = self._project.revision
         self._mesh_geometry = None
-
-        self._scene_view = SceneView()
+        self._mesh_cache = MeshCache()
+        self._model_loader = AsyncModelLoader(self._mesh_cache)
+        self._model_task: Optional[MeshLoadTask] = None
+        self._model_imported = False
+        self._model_token = 0
+        self._surface_generator: Optional[SurfacePathGenerator] = None
+        self._surface_segment: Optional[PathSegment] = None
+        self._surface_writing = False
+        self._compaction_finished.connect(self._on_compaction_finished)
+        self._model_progress.connect(self._on_model_progress)
+        self._model_bounds.connect(self._on_model_bounds)
+        self._model_finished.connect(self._on_model_finished)
+
+        self._perf = PerfMonitor()
+        self._scene_view = SceneView(perf=self._perf)
+        self._scene_view.surface_picked.connect(self._on_surface_picked)
         self._path_manager = PathManagerWidget()
-        self._path_manager.set_project(self._project)
-        self._path_manager.project_modified.connect(self._on_project_modified)
+        self._path_manager.set_editor(self._editor)
+        self._path_manager.project_modified.connect(lambda: self._updates.invalidate("status"))
 
         splitter = QSplitter()
         splitter.addWidget(self._scene_view)
@@ -57,11 +133,39 @@ class MainWindow(QMainWindow):
 
         self._simulation_timer = QTimer(self)
         self._simulation_timer.timeout.connect(self._advance_simulation)
-        self._simulation_frames: List[np.ndarray] = []
-        self._simulation_index = 0
+        self._simulation_trajectory: Optional[Trajectory] = None
+        self._simulation_clock = QElapsedTimer()
+        self._reachability = ReachabilityAnalyzer()
+        self._collision_tool = ToolShape()
+        self._collision_checker: Optional[CollisionChecker] = None
+        self._cycle_time = CycleTimeEstimator()
+        # Edits only mark views stale; they are refreshed together at most once per frame.
+        self._updates = UpdateScheduler(parent=self)
+        self._updates.register("scene", lambda changes: self._scene_view.update_paths(self._project, changes))
+        self._updates.register("simulation", self._refresh_simulation)
+        self._updates.register("status", lambda _changes: self._refresh_status())
+        self._updates.register("validation", lambda _changes: self._validate_paths())
+        self._perf.add_gauge("coalesced_updates", lambda: self._updates.coalesced)
+
+        self._model_progress_bar = QProgressBar()
+        self._model_progress_bar.setRange(0, 100)
+        self._model_progress_bar.setMaximumWidth(200)
+        self._model_progress_bar.hide()
+        self._cancel_model_button = QPushButton("取消加载")
+        self._cancel_model_button.clicked.connect(self._cancel_model_load)
+        self._cancel_model_button.hide()
+        self._cycle_time_label = QLabel()
+        self.statusBar().addPermanentWidget(self._model_progress_bar)
+        self.statusBar().addPermanentWidget(self._cancel_model_button)
+        self.statusBar().addPermanentWidget(self._cycle_time_label)
 
         self._build_menu()
+        self._history.add_listener(self._update_undo_actions)
+        self._update_undo_actions()
+        self._update_window_title()
+        self._update_cycle_time()
         self.statusBar().showMessage("准备就绪")
+        self._updates.reset_stats()
 
     # region Menu and actions
     def _build_menu(self) -> None:
@@ -101,10 +205,44 @@ class MainWindow(QMainWindow):
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
 
+        edit_menu = menu.addMenu("编辑(&E)")
+        self._undo_action = QAction("撤销", self)
+        self._undo_action.setShortcut(QKeySequence.Undo)
+        self._undo_action.triggered.connect(self._undo)
+        edit_menu.addAction(self._undo_action)
+
+        self._redo_action = QAction("重做", self)
+        self._redo_action.setShortcut(QKeySequence.Redo)
+        self._redo_action.triggered.connect(self._redo)
+        edit_menu.addAction(self._redo_action)
+
+        edit_menu.addSeparator()
+        project_action = QAction("投影当前路径到模型表面", self)
+        project_action.triggered.connect(self._project_current_path)
+        edit_menu.addAction(project_action)
+
+        self._surface_path_action = QAction("绘制贴地线", self)
+        self._surface_path_action.setCheckable(True)
+        self._surface_path_action.toggled.connect(self._toggle_surface_path)
+        edit_menu.addAction(self._surface_path_action)
+
+        section_action = QAction("生成截面路径...", self)
+        section_action.triggered.connect(self._generate_section_paths)
+        edit_menu.addAction(section_action)
+
         view_menu = menu.addMenu("视图(&V)")
         reset_camera_action = QAction("重置相机", self)
         reset_camera_action.triggered.connect(self._scene_view.reset_camera)
         view_menu.addAction(reset_camera_action)
+        view_menu.addSeparator()
+        self._perf_action = QAction("性能监视", self)
+        self._perf_action.setCheckable(True)
+        self._perf_action.setShortcut(QKeySequence("F12"))
+        self._perf_action.toggled.connect(self._scene_view.set_perf_overlay)
+        view_menu.addAction(self._perf_action)
+        export_perf_action = QAction("导出性能记录(CSV)...", self)
+        export_perf_action.triggered.connect(self._export_perf_history)
+        view_menu.addAction(export_perf_action)
 
         simulation_menu = menu.addMenu("仿真(&S)")
         start_sim_action = QAction("开始仿真", self)
@@ -115,6 +253,28 @@ class MainWindow(QMainWindow):
         stop_sim_action.triggered.connect(self._stop_simulation)
         simulation_menu.addAction(stop_sim_action)
 
+        simulation_menu.addSeparator()
+        reachability_action = QAction("检查可达性", self)
+        reachability_action.triggered.connect(self._check_reachability)
+        simulation_menu.addAction(reachability_action)
+
+        collision_action = QAction("检查碰撞", self)
+        collision_action.triggered.connect(self._check_collisions)
+        simulation_menu.addAction(collision_action)
+
+        self._auto_collision_action = QAction("编辑后自动检查碰撞", self)
+        self._auto_collision_action.setCheckable(True)
+        self._auto_collision_action.toggled.connect(self._toggle_auto_collision)
+        simulation_menu.addAction(self._auto_collision_action)
+
+        tool_action = QAction("设置碰撞工具...", self)
+        tool_action.triggered.connect(self._edit_collision_tool)
+        simulation_menu.addAction(tool_action)
+
+        robot_action = QAction("加载机器人模型...", self)
+        robot_action.triggered.connect(self._load_robot_model)
+        simulation_menu.addAction(robot_action)
+
     # endregion
 
     # region Project management
@@ -124,9 +284,7 @@ class MainWindow(QMainWindow):
         name, ok = QInputDialog.getText(self, "新建项目", "项目名称", text="New Project")
         if not ok:
             return
-        self._project = Project(name=name or "New Project")
-        self._project_path = None
-        self._path_manager.set_project(self._project)
+        self._set_project(Project(name=name or "New Project"), None, ProjectSerializer.FORMAT_CONTAINER)
         self._scene_view.set_mesh(None)
         self._scene_view.clear_paths()
         self._on_project_modified()
@@ -143,42 +301,206 @@ class MainWindow(QMainWindow):
         if not path:
             return
         try:
+            project_format = ProjectSerializer.detect_format(path)
             project = ProjectSerializer.load(path)
         except Exception as exc:
             QMessageBox.critical(self, "打开失败", f"无法加载项目: {exc}")
             return
-        self._project = project
-        self._project_path = Path(path)
-        self._path_manager.set_project(self._project)
+        recovered = self._recover_journal(project, Path(path))
+        self._set_project(project, Path(path), project_format, recovered)
         self._load_model_if_exists()
         self._on_project_modified()
 
+    def _set_project(
+        self,
+        project: Project,
+        path: Optional[Path],
+        project_format: str,
+        recovered: Sequence[Tuple[int, Edit]] = (),
+    ) -> None:
+        self._close_journal()
+        self._cancel_model_load()
+        self._stop_surface_path()
+        self._project = project
+        self._project_path = path
+        self._project_format = project_format
+        self._history.detach()
+        self._editor.unsubscribe(self._on_project_changed)
+        self._editor = ProjectEditor(project)
+        self._editor.subscribe(self._on_project_changed)
+        # Recovered journal records are edits the project file does not contain yet.
+        self._saved_revision = None if recovered else project.revision
+        self._history = EditHistory(self._editor, memory_limit=UNDO_MEMORY_LIMIT)
+        self._history.add_listener(self._update_undo_actions)
+        self._update_undo_actions()
+        if path is not None:
+            self._start_journal(recovered)
+        self._path_manager.set_editor(self._editor)
+        self._update_window_title()
+
+    def _recover_journal(self, project: Project, path: Path) -> List[Tuple[int, Edit]]:
+        try:
+            records = EditJournal.read_pending(path, project)
+        except OSError as exc:
+            logger.warning("Cannot read edit journal for %s: %s", path, exc)
+            return []
+        if not records:
+            return []
+        answer = QMessageBox.question(
+            self,
+            "恢复未保存的修改",
+            f"检测到 {len(records)} 条未保存的编辑记录（可能来自上次异常退出），是否恢复？",
+        )
+        if answer != QMessageBox.Yes:
+            return []
+        try:
+            EditJournal.replay(project, records)
+        except Exception as exc:
+            QMessageBox.warning(self, "恢复失败", f"无法重放编辑记录: {exc}")
+            logger.exception("Failed to replay edit journal")
+            return []
+        return records
+
+    def _start_journal(self, recovered: Sequence[Tuple[int, Edit]] = ()) -> None:
+        assert self._project_path is not None
+        journal = EditJournal(self._project_path, self._project_format)
+        try:
+            journal.start(self._project, self._editor, recovered)
+        except OSError as exc:
+            logger.warning("Edit journal disabled for %s: %s", self._project_path, exc)
+            self.statusBar().showMessage("无法创建编辑日志，崩溃恢复不可用", 5000)
+            return
+        self._journal = journal
+
+    def _close_journal(self, discard: bool = False) -> None:
+        if self._journal is None:
+            return
+        journal, self._journal = self._journal, None
+        journal.detach(self._editor)
+        try:
+            if discard:
+                journal.discard()
+            else:
+                journal.close()
+        except Exception:  # pragma: no cover - best effort
+            logger.exception("Failed to close edit journal")
+
     def _save_project(self) -> None:
         if self._project_path is None:
             self._save_project_as()
             return
+        if self._journal is None:
+            self._write_project(self._project_path, self._project_format)
+            return
+        revision = self._project.revision
         try:
-            ProjectSerializer.save(self._project, self._project_path)
+            future = self._journal.compact()
         except Exception as exc:
             QMessageBox.critical(self, "保存失败", f"写入项目文件失败: {exc}")
             return
+        future.add_done_callback(lambda done: self._compaction_finished.emit(done.exception(), revision))
+        self.statusBar().showMessage("正在后台保存项目...", 0)
+
+    def _write_project(self, path: Path, project_format: str) -> bool:
+        """Save synchronously and restart the journal for ``path``."""
+
+        if self._journal is not None:
+            self._journal.wait()
+        try:
+            ProjectSerializer.save(self._project, path, format=project_format)
+        except Exception as exc:
+            QMessageBox.critical(self, "保存失败", f"写入项目文件失败: {exc}")
+            return False
+        # Edits journaled for the previous file are now part of the new one.
+        self._close_journal(discard=True)
+        self._project_path = path
+        self._project_format = project_format
+        self._start_journal()
+        self._saved_revision = self._project.revision
+        self._update_window_title()
+        self.statusBar().showMessage("项目已保存", 3000)
+        return True
+
+    def _on_compaction_finished(self, error: Optional[BaseException], revision: int) -> None:
+        if error is not None:
+            QMessageBox.critical(self, "保存失败", f"写入项目文件失败: {error}")
+            return
+        self._saved_revision = revision
+        self._update_window_title()
         self.statusBar().showMessage("项目已保存", 3000)
 
     def _save_project_as(self) -> None:
-        path, _ = QFileDialog.getSaveFileName(
+        path, selected_filter = QFileDialog.getSaveFileName(
             self,
             "项目另存为",
             str(Path.cwd() / f"{self._project.name}.cobot3d"),
-            "Cobot3D Project (*.cobot3d)",
+            ";;".join([CONTAINER_FILTER, JSON_FILTER]),
+            CONTAINER_FILTER if self._project_format == ProjectSerializer.FORMAT_CONTAINER else JSON_FILTER,
         )
         if not path:
             return
-        self._project_path = Path(path)
-        self._save_project()
+        project_format = (
+            ProjectSerializer.FORMAT_JSON if selected_filter == JSON_FILTER else ProjectSerializer.FORMAT_CONTAINER
+        )
+        self._write_project(Path(path), project_format)
+
+    def _is_modified(self) -> bool:
+        return self._project.revision != self._saved_revision
 
     def _confirm_discard_changes(self) -> bool:
-        # This simplified version always allows; extend with change tracking.
-        return True
+        """Ask what to do with unsaved changes; return ``False`` to abort."""
+
+        if not self._is_modified():
+            return True
+        answer = QMessageBox.question(
+            self,
+            "未保存的修改",
+            f"项目“{self._project.name}”有未保存的修改，是否保存？",
+            QMessageBox.Save | QMessageBox.Discard | QMessageBox.Cancel,
+            QMessageBox.Save,
+        )
+        if answer == QMessageBox.Cancel:
+            return False
+        if answer == QMessageBox.Discard:
+            # The journal only holds the edits the user just chose to drop.
+            self._close_journal(discard=True)
+            return True
+        if self._project_path is None:
+            self._save_project_as()
+        else:
+            self._write_project(self._project_path, self._project_format)
+        return not self._is_modified()
+
+    def _update_window_title(self) -> None:
+        self.setWindowTitle(f"Cobot Importer 3D - {self._project.name}[*]")
+        self.setWindowModified(self._is_modified())
+
+    # endregion
+
+    # region Undo/redo
+    def _undo(self) -> None:
+        try:
+            changed = self._history.undo()
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.exception("Undo failed")
+            QMessageBox.warning(self, "撤销失败", str(exc))
+            return
+        if changed:
+            self._path_manager.refresh()
+
+    def _redo(self) -> None:
+        try:
+            changed = self._history.redo()
+        except Exception as exc:  # pragma: no cover - defensive
+            logger.exception("Redo failed")
+            QMessageBox.warning(self, "重做失败", str(exc))
+            return
+        if changed:
+            self._path_manager.refresh()
+
+    def _update_undo_actions(self) -> None:
+        self._undo_action.setEnabled(self._history.can_undo())
+        self._redo_action.setEnabled(self._history.can_redo())
 
     # endregion
 
@@ -192,31 +514,189 @@ class MainWindow(QMainWindow):
         )
         if not path:
             return
-        try:
-            geometry = ModelLoader.load_mesh(path)
-        except Exception as exc:
-            QMessageBox.critical(self, "导入失败", f"无法加载模型: {exc}")
-            logger.exception("Failed to load model")
-            return
-        self._mesh_geometry = geometry
-        self._project.model_path = path
-        self._scene_view.set_mesh(geometry)
-        self._on_project_modified()
+        self._start_model_load(path, imported=True)
 
     def _load_model_if_exists(self) -> None:
         if self._project.model_path:
-            try:
-                geometry = ModelLoader.load_mesh(self._project.model_path)
-            except Exception as exc:  # pragma: no cover - best effort
-                QMessageBox.warning(self, "模型缺失", f"无法加载模型: {exc}")
-                self._mesh_geometry = None
-                self._scene_view.set_mesh(None)
-                return
-            self._mesh_geometry = geometry
-            self._scene_view.set_mesh(geometry)
+            self._start_model_load(self._project.model_path, imported=False)
         else:
             self._scene_view.set_mesh(None)
 
+    def _start_model_load(self, path: str, imported: bool) -> None:
+        """Load ``path`` in the background; paths stay visible and editable meanwhile.
+
+        ``imported`` models are assigned to the project once they load.
+        """
+
+        self._cancel_model_load()
+        self._stop_surface_path()
+        self._model_token += 1
+        token = self._model_token
+        self._mesh_geometry = None
+        self._collision_checker = None
+        self._scene_view.set_mesh(None)
+        task = self._model_loader.submit(
+            path,
+            progress=lambda fraction, stage: self._model_progress.emit(token, fraction, stage),
+            on_bounds=lambda bounds: self._model_bounds.emit(token, bounds),
+        )
+        task.add_done_callback(lambda done: self._model_finished.emit(token, done, done.exception()))
+        self._model_task = task
+        self._model_imported = imported
+        self._model_progress_bar.setValue(0)
+        self._model_progress_bar.show()
+        self._cancel_model_button.show()
+        self.statusBar().showMessage(f"正在加载模型 {Path(path).name}...", 0)
+
+    def _cancel_model_load(self) -> None:
+        if self._model_task is None:
+            return
+        self._model_task.cancel()
+        self._model_task = None
+        self._model_token += 1
+        self._finish_model_load()
+        self.statusBar().showMessage("模型加载已取消", 3000)
+
+    def _finish_model_load(self) -> None:
+        self._model_progress_bar.hide()
+        self._cancel_model_button.hide()
+        self._scene_view.show_placeholder(None)
+
+    def _on_model_progress(self, token: int, fraction: float, stage: str) -> None:
+        if token != self._model_token:
+            return
+        self._model_progress_bar.setValue(int(fraction * 100))
+        self._model_progress_bar.setFormat(f"{MODEL_LOAD_STAGES.get(stage, stage)} %p%")
+
+    def _on_model_bounds(self, token: int, bounds: np.ndarray) -> None:
+        if token == self._model_token:
+            self._scene_view.show_placeholder(bounds)
+
+    def _on_model_finished(self, token: int, task: MeshLoadTask, error: Optional[BaseException]) -> None:
+        if token != self._model_token:
+            return
+        self._model_task = None
+        self._finish_model_load()
+        if isinstance(error, LoadCancelled):
+            return
+        if error is not None:
+            logger.error("Failed to load model %s", task.path, exc_info=error)
+            if self._model_imported:
+                QMessageBox.critical(self, "导入失败", f"无法加载模型: {error}")
+            else:
+                QMessageBox.warning(self, "模型缺失", f"无法加载模型: {error}")
+            return
+        geometry = task.result()
+        self._mesh_geometry = geometry
+        self._collision_checker = CollisionChecker(geometry.build_index(), self._collision_tool)
+        self._scene_view.set_mesh(geometry)
+        if self._model_imported:
+            self._editor.set_project_fields(model_path=str(task.path))
+        self.statusBar().showMessage("模型已加载", 3000)
+
+    # endregion
+
+    # region Surface tools
+    def _project_current_path(self) -> None:
+        segment = self._path_manager.current_segment()
+        if segment is None or not segment.points:
+            QMessageBox.information(self, "投影路径", "请先选择包含点位的路径")
+            return
+        if self._mesh_geometry is None:
+            QMessageBox.information(self, "投影路径", "请先导入3D模型")
+            return
+        poses = project_segment(segment, self._mesh_geometry, orient=True)
+        self._editor.set_poses(self._editor.index_of(segment), 0, poses)
+        self._path_manager.refresh()
+        self.statusBar().showMessage(f"已将 {len(poses)} 个点投影到模型表面", 3000)
+
+    def _generate_section_paths(self) -> None:
+        if self._mesh_geometry is None:
+            QMessageBox.information(self, "截面路径", "请先导入3D模型")
+            return
+        axis, ok = QInputDialog.getItem(self, "截面路径", "切割平面法向", list(SECTION_AXES), editable=False)
+        if not ok:
+            return
+        spacing, ok = QInputDialog.getDouble(self, "截面路径", "截面间距 (mm)", 10.0, 0.01, 10000.0, 3)
+        if not ok:
+            return
+        mode, ok = QInputDialog.getItem(self, "截面路径", "连接方式", ["往复连接 (Zigzag)", "独立路径"], editable=False)
+        if not ok:
+            return
+        normal = SECTION_AXES[axis]
+        curves = slice_mesh(self._mesh_geometry, normal, plane_offsets(self._mesh_geometry, normal, spacing))
+        segments = sections_to_segments(
+            self._mesh_geometry,
+            curves,
+            normal,
+            zigzag=mode.startswith("往复"),
+            name=f"截面 {len(self._project.paths) + 1}",
+        )
+        if not segments:
+            QMessageBox.information(self, "截面路径", "截面与模型没有交线")
+            return
+        self._editor.add_paths(segments)
+        self._path_manager.select_segment(segments[0])
+        self.statusBar().showMessage(f"已生成 {len(curves)} 条截面曲线，{len(segments)} 条路径", 3000)
+
+    def _toggle_surface_path(self, checked: bool) -> None:
+        if not checked:
+            self._stop_surface_path()
+            return
+        if self._surface_generator is not None:
+            return
+        if self._mesh_geometry is None:
+            QMessageBox.information(self, "贴地线", "请先导入3D模型")
+            self._surface_path_action.setChecked(False)
+            return
+        segment = self._editor.add_path(PathSegment(name=f"贴地线 {len(self._project.paths) + 1}"))
+        self._surface_segment = segment
+        self._surface_generator = SurfacePathGenerator(
+            self._mesh_geometry, spacing=segment.point_density, offset=segment.tool_offset
+        )
+        self._path_manager.select_segment(segment)
+        self.statusBar().showMessage("贴地线：在模型表面依次单击添加控制点，再次选择菜单项结束", 0)
+
+    def _stop_surface_path(self) -> None:
+        if self._surface_generator is None:
+            return
+        self._surface_generator = None
+        self._surface_segment = None
+        self._surface_path_action.setChecked(False)
+        self.statusBar().showMessage("贴地线绘制已结束", 3000)
+
+    def _apply_surface_update(self, update: PathUpdate) -> None:
+        assert self._surface_segment is not None
+        self._surface_writing = True
+        try:
+            self._editor.replace_points(
+                self._editor.index_of(self._surface_segment), update.start, update.stop, update.poses
+            )
+        finally:
+            self._surface_writing = False
+        self._path_manager.refresh()
+
+    def _regenerate_surface_path(self) -> None:
+        if self._surface_generator is None or self._surface_segment is None:
+            return
+        segment = self._surface_segment
+        self._apply_surface_update(
+            self._surface_generator.set_parameters(spacing=segment.point_density, offset=segment.tool_offset)
+        )
+
+    def _track_surface_changes(self, changes: ChangeSet) -> None:
+        """Keep the generator in sync with the segment it writes to."""
+
+        if self._surface_segment is None or self._surface_writing:
+            return
+        segment_id = self._surface_segment.id
+        if segment_id in changes.removed or segment_id in changes.points_changed:
+            # Undo or manual edits: the generator no longer describes the points.
+            self._stop_surface_path()
+        elif changes.params_changed.get(segment_id, set()) & {"point_density", "tool_offset"}:
+            # Regenerate after the current edit has finished notifying.
+            QTimer.singleShot(0, self._regenerate_surface_path)
+
     # endregion
 
     # region Export
@@ -254,41 +734,206 @@ class MainWindow(QMainWindow):
         )
         if not path:
             return
+        self._updates.flush()
         result = exporter.export(self._project, path)
         if result.success:
             self.statusBar().showMessage(result.message, 5000)
         else:
             QMessageBox.warning(self, "导出失败", result.message)
 
+    def _export_perf_history(self) -> None:
+        if not self._perf.history:
+            QMessageBox.information(self, "性能记录", "没有性能记录，请先开启“性能监视”")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "导出性能记录", str(Path.cwd() / "perf.csv"), "CSV (*.csv)")
+        if not path:
+            return
+        try:
+            frames = self._perf.export_csv(path)
+        except OSError as exc:
+            QMessageBox.critical(self, "导出失败", f"无法写入性能记录: {exc}")
+            return
+        self.statusBar().showMessage(f"已导出 {frames} 帧性能记录到 {path}", 5000)
+
     # endregion
 
     # region Simulation
     def _start_simulation(self) -> None:
-        player = PathPlayer(self._project.paths, resolution=5.0)
-        frames = [frame.position for frame in player.iter_frames()]
-        if not frames:
+        self._updates.flush()
+        trajectory = Trajectory(self._project.paths)
+        if trajectory.duration <= 0:
             QMessageBox.information(self, "仿真", "没有足够的路径点用于仿真")
             return
-        self._simulation_frames = frames
-        self._simulation_index = 0
-        self._simulation_timer.start(30)
-        self.statusBar().showMessage("仿真进行中...", 0)
+        # The marker is placed where the tool is at the elapsed wall-clock time; late ticks skip frames.
+        self._simulation_trajectory = trajectory
+        self._simulation_clock.start()
+        self._simulation_timer.start(SIMULATION_INTERVAL_MS)
+        self._advance_simulation()
 
     def _stop_simulation(self) -> None:
         self._simulation_timer.stop()
+        self._simulation_trajectory = None
         self._scene_view.show_simulation_marker(None)
         self.statusBar().showMessage("仿真已停止", 3000)
 
+    def _refresh_simulation(self, changes: Optional[ChangeSet] = None) -> None:
+        """Let a running simulation follow the edited paths and forget the plans of deleted segments."""
+
+        if changes is None or changes.removed:
+            shared_plans().retain(self._project.paths)
+        if self._simulation_trajectory is None:
+            return
+        trajectory = Trajectory(self._project.paths)
+        if trajectory.duration <= 0:
+            self._stop_simulation()
+        else:
+            self._simulation_trajectory = trajectory
+
+    def _check_reachability(self) -> None:
+        """Solve IK over every enabled segment and color unreachable, singular and limit waypoints."""
+
+        self._updates.flush()
+        reports = self._reachability.analyze(self._project.paths)
+        if not reports:
+            QMessageBox.information(self, "可达性", "没有可检查的路径点")
+            return
+        for report in reports:
+            self._scene_view.show_reachability(report)
+        unreachable = sum(report.unreachable_count for report in reports)
+        singular = sum(report.singular_count for report in reports)
+        at_limit = sum(report.at_limit_count for report in reports)
+        self.statusBar().showMessage(
+            f"{self._reachability.model.name} 可达性检查：{unreachable} 个不可达点，"
+            f"{singular} 个奇异点，{at_limit} 个接近关节限位",
+            0,
+        )
+
+    def _check_collisions(self, quiet: bool = False) -> None:
+        """Sweep the tool along every enabled segment and color the waypoints whose motion gouges the part.
+
+        With ``quiet`` (automatic checks after edits) nothing is reported when there is no model or path.
+        """
+
+        if self._collision_checker is None:
+            if not quiet:
+                QMessageBox.information(self, "碰撞检查", "请先导入3D模型")
+            return
+        self._updates.flush()
+        reports = self._collision_checker.check(self._project.paths)
+        if not reports and not quiet:
+            QMessageBox.information(self, "碰撞检查", "没有可检查的路径点")
+            return
+        for report in reports:
+            self._scene_view.show_collisions(report)
+        ranges = sum(len(report.frame_ranges) for report in reports)
+        if ranges:
+            self.statusBar().showMessage(f"碰撞检查：发现 {ranges} 处刀具与工件碰撞", 0)
+        elif reports:
+            self.statusBar().showMessage("碰撞检查：未发现碰撞", 3000)
+
+    def _toggle_auto_collision(self, checked: bool) -> None:
+        if checked:
+            self._check_collisions(quiet=True)
+
+    def _edit_collision_tool(self) -> None:
+        tool = self._collision_tool
+        radius, ok = QInputDialog.getDouble(self, "碰撞工具", "工具半径 (mm)", tool.radius, 0.01, 1000.0, 2)
+        if not ok:
+            return
+        length, ok = QInputDialog.getDouble(self, "碰撞工具", "工具长度 (mm)", tool.length, 0.01, 10000.0, 1)
+        if not ok:
+            return
+        clearance, ok = QInputDialog.getDouble(self, "碰撞工具", "刀尖允许接触长度 (mm)", tool.clearance, 0.0, 1000.0, 2)
+        if not ok:
+            return
+        self._collision_tool = ToolShape(radius=radius, length=length, clearance=clearance)
+        if self._collision_checker is not None:
+            self._collision_checker.set_tool(self._collision_tool)
+
+    def _load_robot_model(self) -> None:
+        path, _ = QFileDialog.getOpenFileName(self, "加载机器人模型", str(Path.cwd()), "Robot Model (*.json)")
+        if not path:
+            return
+        try:
+            model = RobotModel.load(path)
+        except Exception as exc:
+            QMessageBox.critical(self, "加载失败", f"无法加载机器人模型: {exc}")
+            return
+        self._reachability.set_model(model)
+        self.statusBar().showMessage(f"已加载机器人模型 {model.name}（{model.dof} 轴）", 5000)
+
+    def _update_cycle_time(self) -> None:
+        """Show the estimated program duration, with the longest segments in the tooltip."""
+
+        estimate = self._cycle_time.estimate(self._project.paths)
+        self._cycle_time_label.setText(f"预计节拍 {_format_seconds(estimate.total)}")
+        self._cycle_time_label.setToolTip(_cycle_time_breakdown(estimate))
+
     def _advance_simulation(self) -> None:
-        if not self._simulation_frames:
+        trajectory = self._simulation_trajectory
+        if trajectory is None:
             self._stop_simulation()
             return
-        position = self._simulation_frames[self._simulation_index]
-        self._scene_view.show_simulation_marker(position)
-        self._simulation_index = (self._simulation_index + 1) % len(self._simulation_frames)
+        with self._perf.measure("simulation"):
+            # Loop the program from the start.
+            elapsed = (self._simulation_clock.elapsed() / 1000.0) % trajectory.duration
+            sample = trajectory.sample(elapsed)
+            self._scene_view.show_simulation_marker(sample.positions[0], sample.orientations[0])
+            self.statusBar().showMessage(
+                f"仿真进行中... {elapsed:.1f} / {trajectory.duration:.1f} s, 速度 {sample.speeds[0]:.0f} mm/s", 0
+            )
 
     # endregion
 
-    def _on_project_modified(self) -> None:
-        self._scene_view.update_paths(self._project)
-        self.statusBar().showMessage("项目已更新", 1500)
+    def closeEvent(self, event: QCloseEvent) -> None:  # noqa: N802 - Qt override
+        if not self._confirm_discard_changes():
+            event.ignore()
+            return
+        self._cancel_model_load()
+        self._model_loader.shutdown(wait=False)
+        self._close_journal()
+        super().closeEvent(event)
+
+    def _on_surface_picked(self, point: np.ndarray, face: int) -> None:
+        if self._surface_generator is not None:
+            self._apply_surface_update(self._surface_generator.append_control_point(point))
+            controls = len(self._surface_generator.control_points)
+            self.statusBar().showMessage(f"贴地线：{controls} 个控制点，{len(self._surface_generator)} 个路径点", 0)
+            return
+        x, y, z = (float(value) for value in point)
+        self.statusBar().showMessage(f"拾取点: X={x:.3f}, Y={y:.3f}, Z={z:.3f} (面 {face})", 5000)
+
+    def _on_project_changed(self, changes: ChangeSet) -> None:
+        self._track_surface_changes(changes)
+        self._on_project_modified(changes)
+
+    def _on_project_modified(self, changes: Optional[ChangeSet] = None) -> None:
+        self._updates.invalidate(UPDATE_CHANNELS, changes)
+
+    def _validate_paths(self) -> None:
+        if self._auto_collision_action.isChecked():
+            # Only the edited waypoints are swept again.
+            self._check_collisions(quiet=True)
+
+    def _refresh_status(self) -> None:
+        self._update_window_title()
+        self._update_cycle_time()
+        # A running simulation or surface tool keeps its own message in the status bar.
+        if self._simulation_trajectory is None and self._surface_generator is None:
+            self.statusBar().showMessage("项目已更新", 1500)
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(seconds, 60.0)
+    return f"{int(minutes)} min {seconds:.1f} s" if minutes else f"{seconds:.1f} s"
+
+
+def _cycle_time_breakdown(estimate: CycleTimeEstimate) -> str:
+    if not estimate.segments:
+        return "没有可执行的路径"
+    lines = [f"共 {len(estimate.segments)} 段，段间移动 {_format_seconds(estimate.transit)}"]
+    longest = sorted(estimate.segments, key=lambda item: item.total, reverse=True)[:CYCLE_TIME_TOOLTIP_ROWS]
+    lines.extend(f"{item.name}: {_format_seconds(item.motion)}（移入 {item.transit:.1f} s）" for item in longest)
+    if len(estimate.segments) > len(longest):
+        lines.append(f"…… 其余 {len(estimate.segments) - len(longest)} 段")
+    return "\n".join(lines)
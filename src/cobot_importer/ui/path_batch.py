@@ -0,0 +1,238 @@
+"""All path polylines packed into one vertex/color buffer pair."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Tuple, Union
+
+import numpy as np
+import pyqtgraph.opengl as gl
+from pyqtgraph.opengl.items.GLLinePlotItem import DirtyFlag
+
+# Extra slots reserved behind each range (as a fraction of its vertices) so growing edits stay in place.
+RANGE_SLACK = 0.25
+# Buffers start with this many vertices and double when full.
+INITIAL_CAPACITY = 4096
+# Ranges are repacked once freed slots make up this share of the used buffer.
+COMPACT_RATIO = 0.5
+# Beyond this many pending partial writes the whole buffers are uploaded instead.
+MAX_DIRTY_RANGES = 1024
+
+Color = Union[Tuple[float, float, float, float], np.ndarray]
+
+
+@dataclass
+class _Range:
+    start: int
+    size: int
+    count: int
+    color: Color
+    visible: bool = True
+
+
+class PathBatchItem(gl.GLLinePlotItem):
+    """Polylines of many keys drawn as one line strip with a single draw call.
+
+    Every key owns a slot range ``start:start + size`` of shared position and
+    color buffers; its ``count`` vertices are framed by transparent copies of
+    the first and last one, so the strip's edges between ranges stay
+    invisible. Unused and hidden slots are transparent as well. Updates that
+    fit into a range, recoloring and hiding rewrite only that range and
+    :meth:`paint` uploads just the touched slots; the GPU buffers are only
+    reallocated when the capacity grows or ranges are repacked.
+    """
+
+    def __init__(self, width: float = 2.0, antialias: bool = True) -> None:
+        self._positions = np.zeros((INITIAL_CAPACITY, 3), dtype=np.float32)
+        self._colors = np.zeros((INITIAL_CAPACITY, 4), dtype=np.float32)
+        self._ranges: Dict[Hashable, _Range] = {}
+        self._used = 0
+        self._freed = 0
+        self._vertices = 0
+        # Slot ranges written since the last paint, uploaded with partial buffer writes.
+        self._dirty: List[Tuple[int, int]] = []
+        super().__init__(
+            pos=self._positions, color=self._colors, width=width, antialias=antialias, mode="line_strip"
+        )
+
+    # region Ranges
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._ranges
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    @property
+    def capacity(self) -> int:
+        return len(self._positions)
+
+    @property
+    def vertex_count(self) -> int:
+        """Path vertices held by all ranges, guards and slack excluded."""
+
+        return self._vertices
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the position and color buffers uploaded to the GPU."""
+
+        return self._positions.nbytes + self._colors.nbytes
+
+    def vertex_range(self, key: Hashable) -> Optional[Tuple[int, int]]:
+        """Buffer slots ``(start, stop)`` holding the vertices of ``key``."""
+
+        entry = self._ranges.get(key)
+        return None if entry is None else (entry.start + 1, entry.start + 1 + entry.count)
+
+    def set_polyline(self, key: Hashable, positions: np.ndarray, color: Color) -> None:
+        """Draw ``positions`` for ``key``, in its current range when they fit."""
+
+        positions = np.asarray(positions, dtype=np.float32)
+        count = len(positions)
+        entry = self._ranges.get(key)
+        self._vertices += count - (entry.count if entry is not None else 0)
+        if entry is None or entry.size < count + 2:
+            if entry is not None:
+                self._release(entry)
+            entry = self._allocate(key, count)
+        entry.count = count
+        entry.color = color
+        entry.visible = True
+        start, stop = entry.start, entry.start + entry.size
+        block = self._positions[start:stop]
+        block[0] = positions[0]
+        block[1 : count + 1] = positions
+        block[count + 1 :] = positions[-1]
+        self._write_colors(entry)
+        self._touch(start, stop)
+        self._maybe_compact()
+
+    def set_color(self, key: Hashable, color: Color) -> None:
+        """Recolor ``key`` with one color or one ``(count, 4)`` row per vertex."""
+
+        entry = self._ranges.get(key)
+        if entry is None:
+            return
+        entry.color = color
+        self._write_colors(entry)
+        self._touch(entry.start, entry.start + entry.size)
+
+    def set_visible(self, key: Hashable, visible: bool) -> None:
+        entry = self._ranges.get(key)
+        if entry is None or entry.visible == visible:
+            return
+        entry.visible = visible
+        self._write_colors(entry)
+        self._touch(entry.start, entry.start + entry.size)
+
+    def remove(self, key: Hashable) -> None:
+        entry = self._ranges.pop(key, None)
+        if entry is not None:
+            self._vertices -= entry.count
+            self._release(entry)
+            self._maybe_compact()
+
+    def clear(self) -> None:
+        self._ranges.clear()
+        self._used = self._freed = self._vertices = 0
+        self._colors[:] = 0.0
+        self._dirty.clear()
+        self.setData(color=self._colors)
+
+    def _allocate(self, key: Hashable, count: int) -> _Range:
+        size = count + 2 + int(count * RANGE_SLACK)
+        if self._used + size > self.capacity:
+            self._grow(self._used + size)
+        entry = _Range(self._used, size, count, (0.0, 0.0, 0.0, 0.0))
+        self._used += size
+        self._ranges[key] = entry
+        return entry
+
+    def _release(self, entry: _Range) -> None:
+        self._colors[entry.start : entry.start + entry.size] = 0.0
+        self._touch(entry.start, entry.start + entry.size)
+        self._freed += entry.size
+
+    def _write_colors(self, entry: _Range) -> None:
+        block = self._colors[entry.start : entry.start + entry.size]
+        block[:] = 0.0
+        if entry.visible:
+            block[1 : entry.count + 1] = entry.color
+
+    def _grow(self, needed: int) -> None:
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        positions = np.zeros((capacity, 3), dtype=np.float32)
+        colors = np.zeros((capacity, 4), dtype=np.float32)
+        positions[: self._used] = self._positions[: self._used]
+        colors[: self._used] = self._colors[: self._used]
+        self._positions, self._colors = positions, colors
+        self._dirty.clear()
+        # New arrays are uploaded as a whole.
+        self.setData(pos=self._positions, color=self._colors)
+
+    def _maybe_compact(self) -> None:
+        if self._freed <= COMPACT_RATIO * max(self._used, INITIAL_CAPACITY):
+            return
+        order = sorted(self._ranges.values(), key=lambda entry: entry.start)
+        total = sum(entry.size for entry in order)
+        positions = np.zeros_like(self._positions)
+        colors = np.zeros_like(self._colors)
+        start = 0
+        for entry in order:
+            stop = start + entry.size
+            positions[start:stop] = self._positions[entry.start : entry.start + entry.size]
+            colors[start:stop] = self._colors[entry.start : entry.start + entry.size]
+            entry.start = start
+            start = stop
+        self._positions, self._colors = positions, colors
+        self._used, self._freed = total, 0
+        self._dirty.clear()
+        self.setData(pos=self._positions, color=self._colors)
+
+    def _touch(self, start: int, stop: int) -> None:
+        if len(self._dirty) < MAX_DIRTY_RANGES:
+            self._dirty.append((start, stop))
+            self.update()
+        else:
+            self._dirty.clear()
+            self.setData(pos=self._positions, color=self._colors)
+
+    # endregion
+
+    def paint(self) -> None:
+        self._write_dirty()
+        super().paint()
+
+    def _write_dirty(self) -> None:
+        """Write the touched slots into the GPU buffers; needs a current GL context."""
+
+        if self._dirty:
+            ranges = _merge(self._dirty)
+            buffers = (
+                (DirtyFlag.POSITION, self.m_vbo_position, self._positions),
+                (DirtyFlag.COLOR, self.m_vbo_color, self._colors),
+            )
+            for flag, vbo, array in buffers:
+                # A pending whole-buffer upload (first paint, growth, repacking, clear) covers the touched slots.
+                if flag in self.dirty_bits or not vbo.isCreated() or vbo.size() != array.nbytes:
+                    continue
+                vbo.bind()
+                for start, stop in ranges:
+                    block = array[start:stop]
+                    vbo.write(start * array.strides[0], block, block.nbytes)
+                vbo.release()
+        self._dirty.clear()
+
+
+def _merge(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Sorted union of ``(start, stop)`` ranges."""
+
+    merged: List[Tuple[int, int]] = []
+    for start, stop in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
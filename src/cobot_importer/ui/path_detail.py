@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
-from typing import Optional
+from typing import List, Optional
 
+import numpy as np
 from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import QAction, QKeySequence
 from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QApplication,
     QCheckBox,
     QDoubleSpinBox,
     QFormLayout,
@@ -15,13 +19,13 @@ from PySide6.QtWidgets import (
     QLineEdit,
     QPushButton,
     QSizePolicy,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
     QWidget,
 )
 
-from ..core import PathPoint, PathSegment
+from ..core import PathSegment, ProjectEditor
+from .points_model import PointsTableModel
 
 
 class PathDetailWidget(QWidget):
@@ -33,6 +37,9 @@ class PathDetailWidget(QWidget):
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
         self._path: Optional[PathSegment] = None
+        self._editor: Optional[ProjectEditor] = None
+        # Set while widgets are filled from the segment, so their signals are not taken as edits.
+        self._updating = False
         layout = QVBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
 
@@ -67,16 +74,36 @@ class PathDetailWidget(QWidget):
         self._retract_spin.valueChanged.connect(self._on_retract_changed)
         general_layout.addRow("离开高度 (mm)", self._retract_spin)
 
+        self._offset_spin = self._create_spin(-100.0, 100.0, 0.5, 0.0)
+        self._offset_spin.valueChanged.connect(self._on_offset_changed)
+        general_layout.addRow("工具偏移 (mm)", self._offset_spin)
+
         layout.addWidget(self._general_group)
 
         self._points_group = QGroupBox("路径点")
         points_layout = QVBoxLayout(self._points_group)
-        self._points_table = QTableWidget(0, 6)
-        self._points_table.setHorizontalHeaderLabels(["X", "Y", "Z", "Rx", "Ry", "Rz"])
+        self._points_model = PointsTableModel(self)
+        self._points_model.dataChanged.connect(self._on_points_model_changed)
+        self._points_model.rowsInserted.connect(self._on_points_model_changed)
+        self._points_model.rowsRemoved.connect(self._on_points_model_changed)
+        self._points_table = QTableView()
+        self._points_table.setModel(self._points_model)
         self._points_table.horizontalHeader().setStretchLastSection(True)
         self._points_table.verticalHeader().setVisible(False)
-        self._points_table.setEditTriggers(QTableWidget.AllEditTriggers)
-        self._points_table.itemChanged.connect(self._on_point_edited)
+        # Uniform rows let the view skip measuring every row.
+        self._points_table.verticalHeader().setDefaultSectionSize(22)
+        self._points_table.setEditTriggers(QAbstractItemView.AllEditTriggers)
+        for text, shortcut, slot in (
+            ("复制", QKeySequence.Copy, self._on_copy_points),
+            ("粘贴", QKeySequence.Paste, self._on_paste_points),
+            ("删除选中点", QKeySequence.Delete, self._on_remove_point),
+        ):
+            action = QAction(text, self._points_table)
+            action.setShortcut(shortcut)
+            action.setShortcutContext(Qt.WidgetShortcut)
+            action.triggered.connect(slot)
+            self._points_table.addAction(action)
+        self._points_table.setContextMenuPolicy(Qt.ActionsContextMenu)
         points_layout.addWidget(self._points_table)
 
         buttons_layout = QHBoxLayout()
@@ -100,17 +127,21 @@ class PathDetailWidget(QWidget):
         spin.setKeyboardTracking(False)
         return spin
 
+    def set_editor(self, editor: Optional[ProjectEditor]) -> None:
+        self._editor = editor
+        self._points_model.set_editor(editor)
+
     def set_path(self, path: Optional[PathSegment]) -> None:
         self._path = path
+        self._points_model.set_segment(path)
         self._update_ui()
 
     def _update_ui(self) -> None:
-        updating = getattr(self, "_updating", False)
+        updating = self._updating
         self._updating = True
         try:
             if self._path is None:
                 self.setEnabled(False)
-                self._points_table.setRowCount(0)
                 return
             self.setEnabled(True)
             self._name_edit.setText(self._path.name)
@@ -120,15 +151,7 @@ class PathDetailWidget(QWidget):
             self._blend_spin.setValue(self._path.blend_radius)
             self._approach_spin.setValue(self._path.approach_height)
             self._retract_spin.setValue(self._path.retract_height)
-            self._points_table.blockSignals(True)
-            self._points_table.setRowCount(len(self._path.points))
-            for row, point in enumerate(self._path.points):
-                values = [point.x, point.y, point.z, point.rx, point.ry, point.rz]
-                for column, value in enumerate(values):
-                    item = QTableWidgetItem(f"{value:.3f}")
-                    item.setData(Qt.EditRole, float(value))
-                    self._points_table.setItem(row, column, item)
-            self._points_table.blockSignals(False)
+            self._offset_spin.setValue(self._path.tool_offset)
         finally:
             self._updating = updating
 
@@ -137,94 +160,70 @@ class PathDetailWidget(QWidget):
             return
         self.path_updated.emit(self._path)
 
-    def _on_name_changed(self) -> None:
-        if not self._path or getattr(self, "_updating", False):
+    def _path_index(self) -> int:
+        assert self._path is not None and self._editor is not None
+        return self._editor.index_of(self._path)
+
+    def _set_fields(self, **fields: object) -> None:
+        if not self._path or not self._editor or self._updating:
             return
-        self._path.name = self._name_edit.text() or self._path.name
+        self._editor.set_segment_fields(self._path_index(), **fields)
         self._notify_update()
 
-    def _on_enabled_changed(self, state: int) -> None:
-        if not self._path or getattr(self, "_updating", False):
+    def _on_name_changed(self) -> None:
+        if not self._path:
             return
-        self._path.enabled = state == Qt.Checked
-        self._notify_update()
+        self._set_fields(name=self._name_edit.text() or self._path.name)
+
+    def _on_enabled_changed(self, state: int) -> None:
+        self._set_fields(enabled=state == Qt.Checked)
 
     def _on_speed_changed(self, value: float) -> None:
-        if not self._path or getattr(self, "_updating", False):
-            return
-        self._path.speed = value
-        self._notify_update()
+        self._set_fields(speed=value)
 
     def _on_density_changed(self, value: float) -> None:
-        if not self._path or getattr(self, "_updating", False):
-            return
-        self._path.point_density = value
-        self._notify_update()
+        self._set_fields(point_density=value)
 
     def _on_blend_changed(self, value: float) -> None:
-        if not self._path or getattr(self, "_updating", False):
-            return
-        self._path.blend_radius = value
-        self._notify_update()
+        self._set_fields(blend_radius=value)
 
     def _on_approach_changed(self, value: float) -> None:
-        if not self._path or getattr(self, "_updating", False):
-            return
-        self._path.approach_height = value
-        self._notify_update()
+        self._set_fields(approach_height=value)
 
     def _on_retract_changed(self, value: float) -> None:
-        if not self._path or getattr(self, "_updating", False):
-            return
-        self._path.retract_height = value
-        self._notify_update()
+        self._set_fields(retract_height=value)
+
+    def _on_offset_changed(self, value: float) -> None:
+        self._set_fields(tool_offset=value)
 
     def _on_add_point(self) -> None:
-        if not self._path:
+        if not self._path or not self._editor:
             return
-        last = self._path.points[-1] if self._path.points else PathPoint(0, 0, 0)
-        new_point = PathPoint(last.x, last.y, last.z)
-        self._path.points.append(new_point)
-        self._update_ui()
-        self._notify_update()
-        self.points_changed.emit()
+        last = self._path.points.positions[-1:] if len(self._path.points) else np.zeros((1, 3))
+        self._editor.insert_points(self._path_index(), len(self._path.points), last.copy())
+        self._points_table.scrollToBottom()
 
-    def _on_remove_point(self) -> None:
-        if not self._path:
-            return
-        selected_rows = sorted({index.row() for index in self._points_table.selectedIndexes()}, reverse=True)
-        for row in selected_rows:
-            if 0 <= row < len(self._path.points):
-                del self._path.points[row]
-        self._update_ui()
-        self._notify_update()
-        if selected_rows:
-            self.points_changed.emit()
+    def _selected_rows(self) -> List[int]:
+        selection = self._points_table.selectionModel()
+        return sorted({index.row() for index in selection.selectedIndexes()}) if selection else []
 
-    def _on_point_edited(self, item: QTableWidgetItem) -> None:
-        if not self._path or getattr(self, "_updating", False):
-            return
-        row = item.row()
-        column = item.column()
-        if not (0 <= row < len(self._path.points)):
-            return
-        value = item.data(Qt.EditRole)
-        try:
-            numeric = float(value)
-        except (TypeError, ValueError):
+    def _on_remove_point(self) -> None:
+        self._points_model.remove_rows(self._selected_rows())
+
+    def _on_copy_points(self) -> None:
+        rows = self._selected_rows()
+        if rows:
+            QApplication.clipboard().setText(self._points_model.copy_text(rows))
+
+    def _on_paste_points(self) -> None:
+        current = self._points_table.currentIndex()
+        row = current.row() if current.isValid() else self._points_model.rowCount()
+        column = current.column() if current.isValid() else 0
+        self._points_model.paste(row, column, QApplication.clipboard().text())
+
+    def _on_points_model_changed(self, *args: object) -> None:
+        # Every change of the shown points comes from an editor change set.
+        if self._updating:
             return
-        point = self._path.points[row]
-        if column == 0:
-            point.x = numeric
-        elif column == 1:
-            point.y = numeric
-        elif column == 2:
-            point.z = numeric
-        elif column == 3:
-            point.rx = numeric
-        elif column == 4:
-            point.ry = numeric
-        elif column == 5:
-            point.rz = numeric
         self._notify_update()
         self.points_changed.emit()
@@ -15,7 +15,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from ..core import PathSegment, Project
+from ..core import PathSegment, Project, ProjectEditor
 from .path_detail import PathDetailWidget
 
 
@@ -54,11 +54,29 @@ class PathManagerWidget(QWidget):
         layout.addWidget(self._detail_widget, stretch=3)
 
         self._project: Optional[Project] = None
+        self._editor: Optional[ProjectEditor] = None
 
-    def set_project(self, project: Project) -> None:
-        self._project = project
+    def set_editor(self, editor: ProjectEditor) -> None:
+        self._editor = editor
+        self._project = editor.project
+        self._detail_widget.set_editor(editor)
         self._reload_list()
 
+    def refresh(self) -> None:
+        """Reload list and details after the project was changed elsewhere (e.g. undo)."""
+
+        row = self._list_widget.currentRow()
+        self._reload_list()
+        if self._project and self._project.paths and row > 0:
+            self._list_widget.setCurrentRow(min(row, len(self._project.paths) - 1))
+
+    def select_segment(self, segment: PathSegment) -> None:
+        """Reload the list and select ``segment``."""
+
+        self._reload_list()
+        if self._project and segment in self._project.paths:
+            self._list_widget.setCurrentRow(self._project.paths.index(segment))
+
     def current_segment(self) -> Optional[PathSegment]:
         if not self._project:
             return None
@@ -93,42 +111,45 @@ class PathManagerWidget(QWidget):
         self.path_selection_changed.emit(row)
 
     def _on_item_changed(self, item: QListWidgetItem) -> None:
-        if not self._project:
+        if not self._project or not self._editor:
             return
         row = self._list_widget.row(item)
         if not (0 <= row < len(self._project.paths)):
             return
         segment = self._project.paths[row]
-        segment.enabled = item.checkState() == Qt.Checked
-        segment.name = item.text()
+        fields = {"enabled": item.checkState() == Qt.Checked, "name": item.text()}
+        changed = {name: value for name, value in fields.items() if getattr(segment, name) != value}
+        if not changed:
+            return
+        self._editor.set_segment_fields(row, **changed)
         self.project_modified.emit()
 
     def _on_add_path(self) -> None:
-        if not self._project:
+        if not self._project or not self._editor:
             return
-        segment = self._project.add_path()
+        segment = self._editor.add_path()
         self._reload_list()
-        row = self._project.paths.index(segment)
+        row = self._editor.index_of(segment)
         self._list_widget.setCurrentRow(row)
         self.project_modified.emit()
 
     def _on_remove_path(self) -> None:
-        if not self._project:
+        if not self._project or not self._editor:
             return
         row = self._list_widget.currentRow()
         if row < 0:
             return
-        self._project.remove_path(row)
+        self._editor.remove_path(row)
         self._reload_list()
         self.project_modified.emit()
 
     def _on_copy_path(self) -> None:
-        if not self._project:
+        if not self._project or not self._editor:
             return
         row = self._list_widget.currentRow()
         if row < 0:
             return
-        self._project.clone_path(row)
+        self._editor.clone_path(row)
         self._reload_list()
         self._list_widget.setCurrentRow(row + 1)
         self.project_modified.emit()
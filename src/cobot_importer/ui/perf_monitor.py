@@ -0,0 +1,214 @@
+"""Frame timing and per-section instrumentation of the viewport."""
+
+from __future__ import annotations
+
+import csv
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+# Periodic summaries and slow sections; configure this logger to collect them separately.
+PERF_LOGGER = logging.getLogger("cobot_importer.perf")
+
+# Rolling history length, about 20 s at 60 fps.
+HISTORY_FRAMES = 1200
+# Frames summarized by the overlay and the log (the most recent seconds).
+SUMMARY_WINDOW_S = 2.0
+# Seconds between summaries on the perf log.
+LOG_INTERVAL_S = 5.0
+# Sections slower than this (ms) are logged individually.
+SLOW_SECTION_MS = 50.0
+# Instrumented sections, always present as CSV columns.
+SECTIONS = ("set_mesh", "update_paths", "simulation")
+# Overlay captions of known gauges; CSV columns keep the gauge names.
+GAUGE_LABELS = {
+    "triangles": "三角面",
+    "path_vertices": "路径顶点",
+    "gpu_buffer_bytes": "GPU 缓冲",
+    "coalesced_updates": "已合并刷新",
+}
+
+
+@dataclass
+class FrameSample:
+    """One painted frame: its cost, the gap to the previous frame and what happened in between."""
+
+    time: float
+    frame_ms: float
+    interval_ms: float
+    # ms spent in each instrumented section since the previous frame
+    sections: Dict[str, float] = field(default_factory=dict)
+    # gauge values (triangles, buffer sizes, counters) when the frame was painted
+    gauges: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class PerfSummary:
+    """Frame statistics over the last :data:`SUMMARY_WINDOW_S` seconds."""
+
+    frames: int
+    fps: float
+    frame_p50: float
+    frame_p95: float
+    frame_p99: float
+    frame_max: float
+    # ms per section over the window
+    sections: Dict[str, float]
+    # latest gauge values
+    gauges: Dict[str, float]
+
+    def format(self) -> str:
+        lines = [
+            f"{self.fps:.0f} FPS  帧耗时 p50 {self.frame_p50:.1f} / p95 {self.frame_p95:.1f} / "
+            f"p99 {self.frame_p99:.1f} / max {self.frame_max:.1f} ms"
+        ]
+        lines.append("  ".join(f"{name} {value:.1f} ms" for name, value in self.sections.items()))
+        lines.extend(
+            f"{GAUGE_LABELS.get(name, name)}: {_format_gauge(name, value)}" for name, value in self.gauges.items()
+        )
+        return "\n".join(lines)
+
+
+class _Section:
+    """Context manager adding its wall time to a named section of the current frame."""
+
+    __slots__ = ("_monitor", "_name", "_start")
+
+    def __init__(self, monitor: "PerfMonitor", name: str) -> None:
+        self._monitor = monitor
+        self._name = name
+        self._start = 0.0
+
+    def __enter__(self) -> "_Section":
+        self._start = self._monitor._clock()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._monitor.add_section_time(self._name, (self._monitor._clock() - self._start) * 1000.0)
+
+
+class PerfMonitor:
+    """Rolling history of frame times, instrumented sections and gauges.
+
+    The view reports every painted frame through :meth:`record_frame`; code
+    paths worth watching are wrapped in :meth:`measure`, whose time is
+    attributed to the next frame. Gauges are callables sampled once per
+    frame (triangle counts, buffer sizes, scheduler counters). Nothing is
+    recorded while the monitor is disabled, so instrumentation can stay in
+    place. While enabled, a summary is written to :data:`PERF_LOGGER` every
+    :data:`LOG_INTERVAL_S` seconds and the history can be exported to CSV.
+    """
+
+    def __init__(self, history: int = HISTORY_FRAMES, clock: Callable[[], float] = time.perf_counter) -> None:
+        self._clock = clock
+        self._history: Deque[FrameSample] = deque(maxlen=history)
+        self._gauges: Dict[str, Callable[[], float]] = {}
+        self._pending: Dict[str, float] = {}
+        self._enabled = False
+        self._origin = clock()
+        self._last_frame: Optional[float] = None
+        self._last_log = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def set_enabled(self, enabled: bool) -> None:
+        if enabled and not self._enabled:
+            self._last_frame = None
+            self._pending.clear()
+            self._last_log = self._clock()
+        self._enabled = enabled
+
+    def add_gauge(self, name: str, read: Callable[[], float]) -> None:
+        self._gauges[name] = read
+
+    # region Recording
+    def measure(self, section: str) -> _Section:
+        """``with monitor.measure("update_paths"): ...``"""
+
+        return _Section(self, section)
+
+    def add_section_time(self, section: str, ms: float) -> None:
+        if not self._enabled:
+            return
+        self._pending[section] = self._pending.get(section, 0.0) + ms
+        if ms >= SLOW_SECTION_MS:
+            PERF_LOGGER.info("%s took %.1f ms", section, ms)
+
+    def record_frame(self, frame_ms: float) -> None:
+        """Add a painted frame that took ``frame_ms`` to render."""
+
+        if not self._enabled:
+            return
+        now = self._clock()
+        interval = 0.0 if self._last_frame is None else (now - self._last_frame) * 1000.0
+        self._last_frame = now
+        gauges = {name: float(read()) for name, read in self._gauges.items()}
+        self._history.append(FrameSample(now - self._origin, frame_ms, interval, self._pending, gauges))
+        self._pending = {}
+        if now - self._last_log >= LOG_INTERVAL_S:
+            self._last_log = now
+            if PERF_LOGGER.isEnabledFor(logging.INFO):
+                PERF_LOGGER.info("%s", self.summary().format().replace("\n", " | "))
+
+    def clear(self) -> None:
+        self._history.clear()
+        self._pending.clear()
+        self._last_frame = None
+
+    # endregion
+
+    @property
+    def history(self) -> List[FrameSample]:
+        return list(self._history)
+
+    def summary(self, window_s: float = SUMMARY_WINDOW_S) -> PerfSummary:
+        recent = [sample for sample in self._history if sample.time >= self._clock() - self._origin - window_s]
+        gauges = recent[-1].gauges if recent else {name: float(read()) for name, read in self._gauges.items()}
+        sections = {name: sum(sample.sections.get(name, 0.0) for sample in recent) for name in self._section_names()}
+        if not recent:
+            return PerfSummary(0, 0.0, 0.0, 0.0, 0.0, 0.0, sections, gauges)
+        frame_ms = np.array([sample.frame_ms for sample in recent])
+        p50, p95, p99 = np.percentile(frame_ms, [50, 95, 99]).tolist()
+        span = recent[-1].time - recent[0].time
+        fps = (len(recent) - 1) / span if span > 0 else 0.0
+        return PerfSummary(len(recent), fps, p50, p95, p99, float(frame_ms.max()), sections, gauges)
+
+    def export_csv(self, path: Union[str, Path]) -> int:
+        """Write the history, one frame per row, and return the number of rows."""
+
+        samples = self.history
+        sections = self._section_names()
+        gauges = list(self._gauges)
+        for sample in samples:
+            gauges.extend(name for name in sample.gauges if name not in gauges)
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["time_s", "frame_ms", "interval_ms", *(f"{name}_ms" for name in sections), *gauges])
+            for sample in samples:
+                writer.writerow(
+                    [f"{sample.time:.4f}", f"{sample.frame_ms:.3f}", f"{sample.interval_ms:.3f}"]
+                    + [f"{sample.sections.get(name, 0.0):.3f}" for name in sections]
+                    + [f"{sample.gauges[name]:g}" if name in sample.gauges else "" for name in gauges]
+                )
+        logger.info("Exported %d frames to %s", len(samples), path)
+        return len(samples)
+
+    def _section_names(self) -> List[str]:
+        names = list(SECTIONS)
+        for sample in self._history:
+            names.extend(name for name in sample.sections if name not in names)
+        return names
+
+
+def _format_gauge(name: str, value: float) -> str:
+    if name.endswith("bytes"):
+        return f"{value / (1024 * 1024):.1f} MB"
+    return f"{value:,.0f}"
@@ -0,0 +1,209 @@
+"""Table model over the waypoints of one path segment."""
+
+from __future__ import annotations
+
+import logging
+import re
+from typing import Any, Iterable, Optional, Union
+
+import numpy as np
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QObject, QPersistentModelIndex, Qt
+
+from ..core import ChangeSet, PathSegment, ProjectEditor
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ["X", "Y", "Z", "Rx", "Ry", "Rz"]
+_SEPARATORS = re.compile(r"[\t,; ]+")
+
+ModelIndex = Union[QModelIndex, QPersistentModelIndex]
+
+
+class PointsTableModel(QAbstractTableModel):
+    """Rows of a segment's pose array, read only when a view asks for them.
+
+    Selecting a segment is a model reset and costs the same for any number of
+    points. Edits go through the :class:`ProjectEditor`; the model follows the
+    editor's change sets, reporting changed rows as one ``dataChanged`` range
+    and inserted or removed points as one row block.
+    """
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._segment: Optional[PathSegment] = None
+        self._editor: Optional[ProjectEditor] = None
+        self._rows = 0
+
+    @property
+    def segment(self) -> Optional[PathSegment]:
+        return self._segment
+
+    def set_editor(self, editor: Optional[ProjectEditor]) -> None:
+        if self._editor is not None:
+            self._editor.unsubscribe(self.apply_changes)
+        self._editor = editor
+        if editor is not None:
+            editor.subscribe(self.apply_changes)
+
+    def set_segment(self, segment: Optional[PathSegment]) -> None:
+        self.beginResetModel()
+        self._segment = segment
+        self._rows = len(segment.points) if segment is not None else 0
+        self.endResetModel()
+
+    # region Qt model interface
+    def rowCount(self, parent: ModelIndex = QModelIndex()) -> int:  # noqa: N802 - Qt override
+        return 0 if parent.isValid() else self._rows
+
+    def columnCount(self, parent: ModelIndex = QModelIndex()) -> int:  # noqa: N802 - Qt override
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def data(self, index: ModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if self._segment is None or not index.isValid() or index.row() >= len(self._segment.points):
+            return None
+        if role == Qt.DisplayRole:
+            return f"{self._segment.points.poses[index.row(), index.column()]:.3f}"
+        if role == Qt.EditRole:
+            return float(self._segment.points.poses[index.row(), index.column()])
+        if role == Qt.TextAlignmentRole:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def setData(self, index: ModelIndex, value: Any, role: int = Qt.EditRole) -> bool:  # noqa: N802 - Qt override
+        if role != Qt.EditRole or not index.isValid() or not self._can_edit():
+            return False
+        try:
+            numeric = float(value)
+        except (TypeError, ValueError):
+            return False
+        if not np.isfinite(numeric):
+            return False
+        # The editor's change set reports the new value back through dataChanged.
+        self._editor.set_point_value(self._segment_index(), index.row(), index.column(), numeric)
+        return True
+
+    def flags(self, index: ModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:  # noqa: N802
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return COLUMNS[section] if 0 <= section < len(COLUMNS) else None
+        return str(section + 1)
+
+    # endregion
+
+    # region Bulk edits
+    def remove_rows(self, rows: Iterable[int]) -> int:
+        """Delete ``rows`` in one undoable edit and return how many were removed."""
+
+        if not self._can_edit():
+            return 0
+        rows = sorted({row for row in rows if 0 <= row < self._rows})
+        if rows:
+            self._editor.remove_points(self._segment_index(), rows)
+        return len(rows)
+
+    def paste(self, row: int, column: int, text: str) -> int:
+        """Write a block of numbers (one point per line) at ``row``/``column`` and return the rows written.
+
+        Rows past the end are appended, their other columns copied from the
+        last point. The whole paste is one undoable edit.
+        """
+
+        if not self._can_edit():
+            return 0
+        values = parse_table_text(text)
+        if values is None:
+            return 0
+        column = min(max(column, 0), len(COLUMNS) - 1)
+        values = values[:, : len(COLUMNS) - column]
+        row = min(max(row, 0), self._rows)
+        points = self._segment.points
+        overlap = min(len(values), self._rows - row)
+        template = points.poses[-1] if len(points) else np.zeros(len(COLUMNS))
+        poses = np.vstack([points.poses[row : row + overlap], np.tile(template, (len(values) - overlap, 1))])
+        poses[:, column : column + values.shape[1]] = values
+        self._editor.replace_points(self._segment_index(), row, row + overlap, poses)
+        return len(values)
+
+    def copy_text(self, rows: Iterable[int]) -> str:
+        """Tab-separated poses of ``rows``, one per line."""
+
+        if self._segment is None:
+            return ""
+        rows = sorted({row for row in rows if 0 <= row < self._rows})
+        poses = self._segment.points.poses[rows]
+        return "\n".join("\t".join(f"{value:.6g}" for value in pose) for pose in poses.tolist())
+
+    # endregion
+
+    def apply_changes(self, changes: ChangeSet) -> None:
+        """Follow an edit of the shown segment with minimal notifications."""
+
+        segment = self._segment
+        if segment is None:
+            return
+        if segment.id in changes.removed or segment.id in changes.added:
+            # The segment was replaced or deleted; the owner selects what to show next.
+            self.set_segment(segment if self._contains(segment) else None)
+            return
+        span = changes.points_changed.get(segment.id)
+        if span is None:
+            return
+        start, stop = span
+        count = len(segment.points)
+        if count > self._rows:
+            first = min(start, self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + count - self._rows - 1)
+            self._rows = count
+            self.endInsertRows()
+        elif count < self._rows:
+            first = min(start, count)
+            self.beginRemoveRows(QModelIndex(), first, first + self._rows - count - 1)
+            self._rows = count
+            self.endRemoveRows()
+        last = count if stop is None else min(stop, count)
+        if start < last:
+            self.dataChanged.emit(self.index(start, 0), self.index(last - 1, len(COLUMNS) - 1))
+
+    def _contains(self, segment: PathSegment) -> bool:
+        return self._editor is not None and any(path is segment for path in self._editor.project.paths)
+
+    def _can_edit(self) -> bool:
+        return self._segment is not None and self._editor is not None
+
+    def _segment_index(self) -> int:
+        assert self._segment is not None and self._editor is not None
+        return self._editor.index_of(self._segment)
+
+
+def parse_table_text(text: str) -> Optional[np.ndarray]:
+    """Numbers of a pasted block, one row per line (tab, comma, semicolon or space separated).
+
+    ``None`` when a line is not numeric; short lines are padded with the
+    previous line's values.
+    """
+
+    rows = []
+    for line in text.strip().splitlines():
+        fields = [field for field in _SEPARATORS.split(line.strip()) if field]
+        if not fields:
+            continue
+        try:
+            values = [float(field) for field in fields[: len(COLUMNS)]]
+        except ValueError:
+            logger.debug("Ignoring non-numeric paste: %r", line)
+            return None
+        rows.append(values)
+    if not rows:
+        return None
+    width = max(len(row) for row in rows)
+    block = np.zeros((len(rows), width))
+    for index, row in enumerate(rows):
+        previous = block[index - 1] if index else np.zeros(width)
+        block[index] = np.concatenate([row, previous[len(row) :]])
+    return block
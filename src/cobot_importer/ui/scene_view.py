@@ -2,21 +2,100 @@
 
 from __future__ import annotations
 
-from typing import Dict, Optional
+import math
+import time
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
-from PySide6.QtWidgets import QVBoxLayout, QWidget
+from PySide6.QtCore import QEvent, QObject, QPointF, Qt, QTimer, Signal
+from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
 import pyqtgraph.opengl as gl
 
-from ..core import MeshGeometry, Project
+from ..core import ChangeSet, MeshGeometry, PathSegment, Project
+from ..core.rotations import TOOL_AXIS, quaternion_matrices
+from ..simulation import CollisionReport, MotionPlanCache, ReachabilityReport, shared_plans
+from .path_batch import PathBatchItem
+from .perf_monitor import PerfMonitor
+
+# Segment parameters that affect how a path is drawn.
+_DRAWN_PARAMS = {"enabled", "approach_height", "retract_height", "blend_radius"}
+# Corner index pairs of the 12 box edges, corners numbered by their xyz bits.
+_BOX_EDGES = np.array(
+    [(0, 1), (2, 3), (4, 5), (6, 7), (0, 2), (1, 3), (4, 6), (5, 7), (0, 4), (1, 5), (2, 6), (3, 7)]
+)
+
+# Level of detail: faces drawn while orbiting/zooming, faces per covered pixel
+# when idle, and how long the camera must rest before refining.
+INTERACTIVE_FACE_BUDGET = 300_000
+IDLE_FACES_PER_PIXEL = 8.0
+IDLE_DELAY_MS = 250
+_INTERACTION_EVENTS = {QEvent.MouseButtonPress, QEvent.MouseMove, QEvent.Wheel}
+# A left press/release pair moving less than this many pixels is a pick, not an orbit.
+CLICK_TOLERANCE_PX = 3.0
+# Waypoint colors of the reachability check, by increasing severity.
+AT_LIMIT_COLOR = (1.0, 0.6, 0.0, 1.0)
+SINGULAR_COLOR = (1.0, 1.0, 0.0, 1.0)
+UNREACHABLE_COLOR = (1.0, 0.0, 0.0, 1.0)
+COLLISION_COLOR = (1.0, 0.0, 1.0, 1.0)
+# Length (mm) of the tool axis drawn behind the simulation marker.
+TOOL_MARKER_LENGTH = 30.0
+# Refresh interval of the performance overlay.
+HUD_REFRESH_MS = 500
+
+
+class _TimedGLViewWidget(gl.GLViewWidget):
+    """GL view reporting how long each frame took to paint."""
+
+    def __init__(self, perf: PerfMonitor) -> None:
+        super().__init__()
+        self._perf = perf
+
+    def paintGL(self) -> None:  # noqa: N802 - Qt override
+        if not self._perf.enabled:
+            super().paintGL()
+            return
+        start = time.perf_counter()
+        super().paintGL()
+        self._perf.record_frame((time.perf_counter() - start) * 1000.0)
+
+
+class _NormalMeshData(gl.MeshData):
+    """Mesh data whose vertex normals are given rather than derived from the faces."""
+
+    def __init__(self, vertices: np.ndarray, faces: np.ndarray, normals: np.ndarray) -> None:
+        super().__init__(vertexes=vertices, faces=faces)
+        self._normals = normals
+
+    def vertexNormals(self, indexed: Optional[str] = None) -> np.ndarray:  # noqa: N802 - pyqtgraph override
+        if indexed is None:
+            return self._normals
+        if indexed == "faces":
+            return self._normals[self.faces()]
+        return super().vertexNormals(indexed)
 
 
 class SceneView(QWidget):
-    """Displays the workpiece mesh and planned paths."""
+    """Displays the workpiece mesh and planned paths.
+
+    Paths are drawn from their compiled motion plans, approach, blended
+    corners and retract included, read from ``plans``. Frame times, mesh and
+    path updates and the drawn geometry are reported to ``perf``, which the
+    optional overlay summarizes.
+    """
 
-    def __init__(self, parent: Optional[QWidget] = None) -> None:
+    # (point, face index) of the mesh surface under a left click.
+    surface_picked = Signal(object, int)
+
+    def __init__(
+        self,
+        parent: Optional[QWidget] = None,
+        plans: Optional[MotionPlanCache] = None,
+        perf: Optional[PerfMonitor] = None,
+    ) -> None:
         super().__init__(parent)
-        self._view = gl.GLViewWidget()
+        self._plans = plans or shared_plans()
+        self._perf = perf or PerfMonitor()
+        self._view = _TimedGLViewWidget(self._perf)
         self._view.opts["distance"] = 800
         self._view.setBackgroundColor((30, 30, 30))
         layout = QVBoxLayout(self)
@@ -27,47 +106,353 @@ class SceneView(QWidget):
         self._grid.scale(50, 50, 1)
         self._view.addItem(self._grid)
 
-        self._mesh_item: Optional[gl.GLMeshItem] = None
-        self._path_items: Dict[str, gl.GLLinePlotItem] = {}
+        self._mesh_levels: List[MeshGeometry] = []
+        self._press_pos: Optional[QPointF] = None
+        # One item per LOD level, created the first time the level is shown.
+        self._mesh_items: List[Optional[gl.GLMeshItem]] = []
+        self._mesh_radius = 0.0
+        self._lod_index = 0
+        self._interacting = False
+        self._idle_timer = QTimer(self)
+        self._idle_timer.setSingleShot(True)
+        self._idle_timer.setInterval(IDLE_DELAY_MS)
+        self._idle_timer.timeout.connect(self._on_camera_idle)
+        self._view.installEventFilter(self)
+        self._placeholder = gl.GLLinePlotItem(width=1, color=(0.7, 0.7, 0.7, 0.8), mode="lines")
+        self._placeholder.hide()
+        self._view.addItem(self._placeholder)
+        # Every path in one buffer, keyed by PathSegment.id; names are not unique.
+        self._paths = PathBatchItem()
+        self._view.addItem(self._paths)
+        self._path_colors: Dict[str, Tuple[float, float, float, float]] = {}
+        # Segment revision each range was drawn from.
+        self._path_revisions: Dict[str, int] = {}
+        # Waypoint of every drawn vertex, -1 on approach and retract.
+        self._path_point_ids: Dict[str, np.ndarray] = {}
         self._marker = gl.GLScatterPlotItem(size=10, color=(1, 0, 0, 1))
         self._view.addItem(self._marker)
         self._marker.setData(pos=np.array([[0, 0, 0]]))
         self._marker.hide()
+        self._tool_axis = gl.GLLinePlotItem(width=3, color=(1, 0.6, 0, 1), mode="lines")
+        self._tool_axis.hide()
+        self._view.addItem(self._tool_axis)
+
+        self._perf.add_gauge("triangles", self._triangle_count)
+        self._perf.add_gauge("path_vertices", lambda: self._paths.vertex_count)
+        self._perf.add_gauge("gpu_buffer_bytes", self._buffer_bytes)
+        self._hud = QLabel(self._view)
+        self._hud.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self._hud.setStyleSheet("background: rgba(0, 0, 0, 160); color: #d0f0d0; padding: 4px; font-family: monospace;")
+        self._hud.move(8, 8)
+        self._hud.hide()
+        self._hud_timer = QTimer(self)
+        self._hud_timer.setInterval(HUD_REFRESH_MS)
+        self._hud_timer.timeout.connect(self._refresh_hud)
+
+    @property
+    def perf_monitor(self) -> PerfMonitor:
+        return self._perf
 
     def set_mesh(self, geometry: Optional[MeshGeometry]) -> None:
-        if self._mesh_item is not None:
-            self._view.removeItem(self._mesh_item)
-            self._mesh_item = None
+        with self._perf.measure("set_mesh"):
+            self._set_mesh(geometry)
+
+    def _set_mesh(self, geometry: Optional[MeshGeometry]) -> None:
+        for item in self._mesh_items:
+            if item is not None:
+                self._view.removeItem(item)
+        self._mesh_items = []
+        self._mesh_levels = []
         if geometry is None:
             return
-        mesh_data = gl.MeshData(vertexes=geometry.vertices, faces=geometry.faces)
-        self._mesh_item = gl.GLMeshItem(meshdata=mesh_data, smooth=True, drawEdges=False, color=(0.6, 0.6, 0.8, 1.0))
-        self._mesh_item.setGLOptions("opaque")
-        self._view.addItem(self._mesh_item)
+        self.show_placeholder(None)
+        self._mesh_levels = geometry.levels
+        self._mesh_items = [None] * len(self._mesh_levels)
+        bounds = geometry.bounds
+        self._mesh_radius = float(np.linalg.norm(bounds[1] - bounds[0]) / 2.0)
+        self._lod_index = -1
+        self._select_lod()
+
+    @property
+    def lod_index(self) -> int:
+        """Index of the displayed mesh level (0 is full resolution)."""
+
+        return self._lod_index
+
+    # region Level of detail
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:  # noqa: N802 - Qt override
+        if watched is self._view and self._mesh_levels:
+            if event.type() in _INTERACTION_EVENTS and (event.type() != QEvent.MouseMove or event.buttons()):
+                self._begin_interaction()
+            elif event.type() == QEvent.Resize:
+                self._idle_timer.start()
+            self._track_click(event)
+        return super().eventFilter(watched, event)
+
+    def _begin_interaction(self) -> None:
+        self._idle_timer.start()
+        if not self._interacting:
+            self._interacting = True
+            self._select_lod()
+
+    def _on_camera_idle(self) -> None:
+        self._interacting = False
+        self._select_lod()
+
+    def _face_budget(self) -> float:
+        if self._interacting:
+            return INTERACTIVE_FACE_BUDGET
+        # Approximate screen coverage of the model's bounding sphere.
+        distance = max(float(self._view.opts["distance"]), 1e-6)
+        half_fov = math.radians(float(self._view.opts.get("fov", 60.0))) / 2.0
+        radius_px = self._mesh_radius / (distance * math.tan(half_fov)) * self._view.height() / 2.0
+        pixels = min(math.pi * radius_px**2, float(self._view.width() * self._view.height()))
+        return pixels * IDLE_FACES_PER_PIXEL
+
+    def _select_lod(self) -> None:
+        if not self._mesh_levels:
+            return
+        budget = self._face_budget()
+        index = next(
+            (level for level, mesh in enumerate(self._mesh_levels) if len(mesh.faces) <= budget),
+            len(self._mesh_levels) - 1,
+        )
+        if index == self._lod_index:
+            return
+        item = self._mesh_items[index]
+        if item is None:
+            item = gl.GLMeshItem(
+                meshdata=self._mesh_data(self._mesh_levels[index]),
+                smooth=True,
+                drawEdges=False,
+                color=(0.6, 0.6, 0.8, 1.0),
+            )
+            item.setGLOptions("opaque")
+            self._view.addItem(item)
+            self._mesh_items[index] = item
+        for level, other in enumerate(self._mesh_items):
+            if other is not None:
+                other.setVisible(level == index)
+        self._lod_index = index
+
+    @staticmethod
+    def _mesh_data(geometry: MeshGeometry) -> gl.MeshData:
+        # MeshGeometry buffers are already float32/uint32 and contiguous, so
+        # MeshData wraps them (or their memory maps) without copying.
+        if geometry.normals is not None:
+            # MeshData would otherwise derive smooth normals in a per-vertex Python loop.
+            return _NormalMeshData(geometry.vertices, geometry.faces, geometry.normals)
+        return gl.MeshData(vertexes=geometry.vertices, faces=geometry.faces)
+
+    # endregion
+
+    # region Picking
+    def pick_ray(self, x: float, y: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the world-space origin and unit direction of the ray under widget pixel ``(x, y)``."""
+
+        viewport = self._view.getViewport()
+        transform = self._view.projectionMatrix(viewport, viewport) * self._view.viewMatrix()
+        matrix = np.array(transform.copyDataTo(), dtype=float).reshape(4, 4)
+        inverse = np.linalg.inv(matrix)
+        ndc_x = 2.0 * x / max(viewport[2], 1) - 1.0
+        ndc_y = 1.0 - 2.0 * y / max(viewport[3], 1)
+        near = inverse @ np.array([ndc_x, ndc_y, -1.0, 1.0])
+        far = inverse @ np.array([ndc_x, ndc_y, 1.0, 1.0])
+        origin = near[:3] / near[3]
+        direction = far[:3] / far[3] - origin
+        return origin, direction / np.linalg.norm(direction)
+
+    def pick_surface(self, x: float, y: float) -> Optional[Tuple[np.ndarray, int]]:
+        """Return the mesh point and face index under widget pixel ``(x, y)``, if any."""
+
+        if not self._mesh_levels:
+            return None
+        origin, direction = self.pick_ray(x, y)
+        # Picking always uses the full-resolution mesh, whichever level is drawn.
+        hit = self._mesh_levels[0].build_index().intersect_rays(origin, direction)
+        if not hit.found[0]:
+            return None
+        return hit.points[0], int(hit.faces[0])
+
+    def _track_click(self, event: QEvent) -> None:
+        if event.type() == QEvent.MouseButtonPress and event.button() == Qt.LeftButton:
+            self._press_pos = event.position()
+        elif event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            pressed, self._press_pos = self._press_pos, None
+            if pressed is None:
+                return
+            position = event.position()
+            if math.hypot(position.x() - pressed.x(), position.y() - pressed.y()) >= CLICK_TOLERANCE_PX:
+                return
+            picked = self.pick_surface(position.x(), position.y())
+            if picked is not None:
+                self.surface_picked.emit(*picked)
+
+    # endregion
+
+    def show_placeholder(self, bounds: Optional[np.ndarray]) -> None:
+        """Outline the ``[min, max]`` box of a model that is still loading."""
+
+        if bounds is None:
+            self._placeholder.hide()
+            return
+        bounds = np.asarray(bounds, dtype=float)
+        bits = (np.arange(8)[:, None] >> np.arange(3)) & 1
+        corners = np.where(bits, bounds[1], bounds[0])
+        self._placeholder.setData(pos=corners[_BOX_EDGES.ravel()])
+        self._placeholder.show()
 
     def clear_paths(self) -> None:
-        for item in self._path_items.values():
-            self._view.removeItem(item)
-        self._path_items.clear()
+        self._paths.clear()
+        self._path_colors.clear()
+        self._path_revisions.clear()
+        self._path_point_ids.clear()
+
+    def update_paths(self, project: Project, changes: Optional[ChangeSet] = None) -> None:
+        """Bring the drawn paths in line with ``project``, touching only segments whose geometry or color changed.
+
+        With ``changes`` (and no reordering) only the segments it names are
+        looked at; otherwise every segment is compared with what is drawn.
+        Changed geometry is written into the segment's range of the shared
+        path buffer; disabled segments are hidden rather than removed.
+        """
+
+        with self._perf.measure("update_paths"):
+            self._update_paths(project, changes)
 
-    def update_paths(self, project: Project) -> None:
-        self.clear_paths()
+    def _update_paths(self, project: Project, changes: Optional[ChangeSet]) -> None:
+        if changes is None or changes.order_changed or changes.removed:
+            live = {segment.id for segment in project.paths}
+            for segment_id in set(self._path_revisions) - live:
+                self._remove_path_item(segment_id)
+            for index, segment in enumerate(project.paths):
+                self._sync_path_item(index, segment)
+            return
+        dirty = set(changes.points_changed) | set(changes.added) | {
+            segment_id for segment_id, names in changes.params_changed.items() if names & _DRAWN_PARAMS
+        }
+        if not dirty:
+            return
         for index, segment in enumerate(project.paths):
-            if not segment.enabled or len(segment.points) < 2:
-                continue
-            points = np.array([[p.x, p.y, p.z] for p in segment.points])
-            color = (0.2 + 0.6 * (index % 3) / 3.0, 0.8, 0.4 + 0.4 * (index % 5) / 5.0, 1.0)
-            item = gl.GLLinePlotItem(pos=points, width=2, antialias=True, color=color, mode="line_strip")
-            self._view.addItem(item)
-            self._path_items[segment.name] = item
+            if segment.id in dirty:
+                self._sync_path_item(index, segment)
+
+    def _sync_path_item(self, index: int, segment: PathSegment) -> None:
+        # Colors depend on the segment index.
+        color = (0.2 + 0.6 * (index % 3) / 3.0, 0.8, 0.4 + 0.4 * (index % 5) / 5.0, 1.0)
+        if not len(segment.points):
+            self._remove_path_item(segment.id)
+            return
+        if not segment.enabled:
+            self._paths.set_visible(segment.id, False)
+            return
+        if self._path_revisions.get(segment.id) == segment.revision:
+            if self._path_colors[segment.id] != color:
+                self._paths.set_color(segment.id, color)
+                self._path_colors[segment.id] = color
+            return
+        plan = self._plans.plan(segment)
+        if len(plan.vertices) < 2:
+            self._remove_path_item(segment.id)
+            return
+        # Also clears reachability or collision colors, which no longer apply.
+        self._paths.set_polyline(segment.id, plan.vertices, color)
+        self._path_colors[segment.id] = color
+        self._path_revisions[segment.id] = segment.revision
+        self._path_point_ids[segment.id] = plan.point_indices
+
+    def _remove_path_item(self, segment_id: str) -> None:
+        self._paths.remove(segment_id)
+        self._path_colors.pop(segment_id, None)
+        self._path_revisions.pop(segment_id, None)
+        self._path_point_ids.pop(segment_id, None)
+
+    def _waypoint_colors(self, segment_id: str, count: int) -> Optional[np.ndarray]:
+        """Plain colors of ``count`` waypoints plus a last row for approach and retract vertices.
+
+        ``None`` when the segment is not drawn or was drawn with another number of waypoints.
+        """
+
+        point_ids = self._path_point_ids.get(segment_id)
+        if point_ids is None or int(point_ids.max()) + 1 != count:
+            return None
+        return np.tile(self._path_colors[segment_id], (count + 1, 1))
+
+    def _set_waypoint_colors(self, segment_id: str, colors: np.ndarray) -> None:
+        # Index -1 picks the plain color kept in the last row.
+        self._paths.set_color(segment_id, colors[self._path_point_ids[segment_id]])
+
+    def show_reachability(self, report: ReachabilityReport) -> None:
+        """Color the waypoints of a drawn segment by their reachability flags.
+
+        Editing the segment redraws it in its plain color, so stale flags never show.
+        """
+
+        count = len(report.reachable)
+        colors = self._waypoint_colors(report.segment_id, count)
+        if colors is None:
+            return
+        colors[:count][report.at_limit] = AT_LIMIT_COLOR
+        colors[:count][report.singular] = SINGULAR_COLOR
+        colors[:count][~report.reachable] = UNREACHABLE_COLOR
+        self._set_waypoint_colors(report.segment_id, colors)
+
+    def show_collisions(self, report: CollisionReport) -> None:
+        """Color the waypoints of a drawn segment whose tool sweep collides with the part."""
+
+        count = int(report.frame_point_indices.max()) + 1 if len(report.frame_point_indices) else 0
+        colors = self._waypoint_colors(report.segment_id, count)
+        if colors is None:
+            return
+        colors[:count][report.point_flags(count)] = COLLISION_COLOR
+        self._set_waypoint_colors(report.segment_id, colors)
+
+    def show_simulation_marker(self, position: Optional[np.ndarray], orientation: Optional[np.ndarray] = None) -> None:
+        """Show the tool tip at ``position``, with the tool axis if an orientation quaternion is given."""
 
-    def show_simulation_marker(self, position: Optional[np.ndarray]) -> None:
         if position is None:
             self._marker.setData(pos=np.array([[0, 0, 0]]))
             self._marker.hide()
+            self._tool_axis.hide()
+            return
+        self._marker.setData(pos=np.array([position]))
+        self._marker.show()
+        if orientation is None:
+            self._tool_axis.hide()
+            return
+        axis = quaternion_matrices(orientation)[0] @ TOOL_AXIS
+        self._tool_axis.setData(pos=np.array([position - TOOL_MARKER_LENGTH * axis, position]))
+        self._tool_axis.show()
+
+    # region Performance overlay
+    def set_perf_overlay(self, visible: bool) -> None:
+        """Show FPS, frame-time percentiles, drawn geometry and section times over the view."""
+
+        self._perf.set_enabled(visible)
+        self._hud.setVisible(visible)
+        if visible:
+            self._refresh_hud()
+            self._hud_timer.start()
+            self._view.update()
         else:
-            self._marker.setData(pos=np.array([position]))
-            self._marker.show()
+            self._hud_timer.stop()
+
+    def _refresh_hud(self) -> None:
+        self._hud.setText(self._perf.summary().format())
+        self._hud.adjustSize()
+
+    def _triangle_count(self) -> int:
+        return len(self._mesh_levels[self._lod_index].faces) if self._mesh_levels and self._lod_index >= 0 else 0
+
+    def _buffer_bytes(self) -> int:
+        meshes = sum(
+            level.vertices.nbytes + level.faces.nbytes + (level.normals.nbytes if level.normals is not None else 0)
+            for level, item in zip(self._mesh_levels, self._mesh_items)
+            if item is not None
+        )
+        return meshes + self._paths.nbytes
+
+    # endregion
 
     def reset_camera(self) -> None:
         self._view.opts["azimuth"] = 45
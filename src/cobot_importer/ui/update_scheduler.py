@@ -0,0 +1,123 @@
+"""Coalesce UI invalidations and flush them at most once per display frame."""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Union
+
+from PySide6.QtCore import QElapsedTimer, QObject, QTimer
+
+from ..core import ChangeSet
+
+logger = logging.getLogger(__name__)
+
+# One display frame at 60 Hz.
+FRAME_INTERVAL_MS = 16
+
+UpdateHandler = Callable[[Optional[ChangeSet]], None]
+
+
+@dataclass
+class ChannelStats:
+    """How often a channel was invalidated and how often its handler actually ran."""
+
+    requests: int = 0
+    flushes: int = 0
+
+    @property
+    def coalesced(self) -> int:
+        return self.requests - self.flushes
+
+
+class UpdateScheduler(QObject):
+    """Collect invalidations per channel and run each channel's handler once per flush.
+
+    Handlers receive the merged :class:`ChangeSet` of every invalidation since
+    their last run, or ``None`` when any of them asked for a full refresh.
+    A flush runs on the next idle pass of the event loop but no sooner than
+    ``interval_ms`` after the previous one, so bursts of edits (a dragged spin
+    box, a series of table edits) cost one update per frame. Channels flush
+    in registration order; :meth:`flush` runs pending updates immediately for
+    actions that need a current view.
+    """
+
+    def __init__(self, interval_ms: int = FRAME_INTERVAL_MS, parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self._interval_ms = interval_ms
+        self._handlers: Dict[str, UpdateHandler] = {}
+        self._stats: Dict[str, ChannelStats] = {}
+        # channel -> merged changes, or None for a full refresh
+        self._pending: Dict[str, Optional[ChangeSet]] = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+        self._since_flush = QElapsedTimer()
+        self._flushing = False
+
+    def register(self, channel: str, handler: UpdateHandler) -> None:
+        self._handlers[channel] = handler
+        self._stats.setdefault(channel, ChannelStats())
+
+    def invalidate(self, channels: Union[str, Iterable[str]], changes: Optional[ChangeSet] = None) -> None:
+        """Mark ``channels`` stale; ``changes`` narrows what changed (``None`` means everything)."""
+
+        for channel in [channels] if isinstance(channels, str) else channels:
+            if channel not in self._handlers:
+                raise KeyError(f"Unknown update channel {channel!r}")
+            self._stats[channel].requests += 1
+            if channel in self._pending:
+                pending = self._pending[channel]
+                if pending is not None:
+                    self._pending[channel] = None if changes is None else pending.merge(changes)
+            else:
+                self._pending[channel] = None if changes is None else ChangeSet().merge(changes)
+        self._schedule()
+
+    def is_pending(self, channel: str) -> bool:
+        return channel in self._pending
+
+    def flush(self) -> None:
+        """Run every pending channel now."""
+
+        self._timer.stop()
+        if self._flushing:
+            return
+        self._flushing = True
+        try:
+            # Handlers may invalidate again; those requests go to the next flush.
+            pending, self._pending = self._pending, {}
+            for channel, handler in self._handlers.items():
+                if channel in pending:
+                    self._stats[channel].flushes += 1
+                    handler(pending[channel])
+        finally:
+            self._flushing = False
+            self._since_flush.start()
+        if pending:
+            logger.debug("Flushed %s; coalesced %s", sorted(pending), self.coalesced)
+        if self._pending:
+            self._schedule()
+
+    # region Counters
+    @property
+    def stats(self) -> Dict[str, ChannelStats]:
+        return dict(self._stats)
+
+    @property
+    def coalesced(self) -> int:
+        """Invalidations absorbed by an earlier pending one, over all channels."""
+
+        return sum(stats.coalesced - (1 if channel in self._pending else 0) for channel, stats in self._stats.items())
+
+    def reset_stats(self) -> None:
+        for channel in self._stats:
+            self._stats[channel] = ChannelStats()
+
+    # endregion
+
+    def _schedule(self) -> None:
+        if self._timer.isActive() or self._flushing:
+            return
+        elapsed = self._since_flush.elapsed() if self._since_flush.isValid() else self._interval_ms
+        self._timer.start(max(self._interval_ms - elapsed, 0))
@@ -0,0 +1,14 @@
+import numpy as np
+
+from cobot_importer.core import PathSegment
+
+
+def path_segment(
+    positions, *, approach_height: float = 0.0, retract_height: float = 0.0, name: str = "轨迹", **fields
+) -> PathSegment:
+    """Segment through ``positions`` with the tool along +z; no approach or retract move unless given."""
+
+    segment = PathSegment(name=name, approach_height=approach_height, retract_height=retract_height, **fields)
+    positions = np.asarray(positions, dtype=float)
+    segment.points.extend_array(np.hstack([positions, np.zeros((len(positions), 3))]))
+    return segment
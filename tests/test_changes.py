@@ -0,0 +1,104 @@
+from pathlib import Path
+
+import numpy as np
+
+from cobot_importer.core import ChangeSet, PathPoint, PathSegment, Project, ProjectEditor, ProjectSerializer
+from cobot_importer.core.edits import CompoundEdit, InsertSegment, RemoveSegment, SetPoints
+
+
+def _project() -> Project:
+    project = Project(name="Demo")
+    project.add_path(PathSegment(name="Path", points=[PathPoint(0, 0, 0), PathPoint(1, 0, 0), PathPoint(2, 0, 0)]))
+    project.add_path(PathSegment(name="Path", points=[PathPoint(0, 1, 0)]))
+    return project
+
+
+def test_revisions_increase_on_every_change():
+    project = _project()
+    segment = project.paths[0]
+    revisions = [project.revision]
+
+    segment.points.set_value(1, 2, 5.0)
+    revisions.append(project.revision)
+    segment.speed = 50.0
+    revisions.append(project.revision)
+    project.remove_path(1)
+    revisions.append(project.revision)
+
+    assert revisions == sorted(set(revisions))
+    snapshot = project.copy()
+    assert snapshot.revision == project.revision
+    assert snapshot.paths[0].id == segment.id
+
+
+def test_ids_are_unique_and_persist(tmp_path: Path):
+    project = _project()
+    clone = project.clone_path(0)
+    ids = [path.id for path in project.paths]
+    assert len(set(ids)) == len(ids)
+    assert clone.name == "Path Copy" and clone.id != project.paths[0].id
+
+    for project_format in (ProjectSerializer.FORMAT_JSON, ProjectSerializer.FORMAT_CONTAINER):
+        target = tmp_path / f"{project_format}.cobot3d"
+        ProjectSerializer.save(project, target, format=project_format)
+        loaded = ProjectSerializer.load(target)
+        assert loaded.id == project.id
+        assert [path.id for path in loaded.paths] == ids
+
+
+def test_editor_reports_change_sets():
+    project = _project()
+    editor = ProjectEditor(project)
+    received = []
+    editor.subscribe(received.append)
+    first, second = (path.id for path in project.paths)
+
+    editor.set_segment_fields(0, speed=10.0)
+    editor.set_point_value(0, 1, 0, 4.0)
+    editor.remove_points(0, [1])
+    editor.remove_path(1)
+
+    assert received[0].params_changed == {first: {"speed"}}
+    assert received[1].points_changed == {first: (1, 2)}
+    assert received[2].points_changed == {first: (1, None)}
+    assert received[3].removed == {second} and received[3].order_changed
+
+
+def test_compound_change_set_merges_segment_lifecycle():
+    project = _project()
+    editor = ProjectEditor(project)
+    received = []
+    editor.subscribe(received.append)
+    segment = PathSegment(name="Temp", points=[PathPoint(0, 0, 0)])
+
+    editor.apply(
+        CompoundEdit(
+            [
+                SetPoints(0, 0, np.zeros((1, 6))),
+                InsertSegment(2, segment),
+                RemoveSegment(2),
+                SetPoints(0, 2, np.ones((1, 6))),
+            ]
+        )
+    )
+
+    changes = received[-1]
+    assert changes.added == set() and changes.removed == set()
+    assert changes.points_changed == {project.paths[0].id: (0, 3)}
+    assert changes.touched_segments() == {project.paths[0].id}
+    assert not ChangeSet().merge(ChangeSet()).order_changed
+
+
+def test_merge_keeps_the_removal_of_a_segment_that_existed_before():
+    changes = ChangeSet()
+    for step in (ChangeSet(removed={"x"}), ChangeSet.segments_added(["x"]), ChangeSet(removed={"x"})):
+        changes.merge(step)
+    assert changes.removed == {"x"} and changes.added == set()
+
+    # Removed and inserted again: replaced, not new.
+    changes.merge(ChangeSet.segments_added(["x"]))
+    assert changes.added == {"x"} and changes.removed == set() and changes.created == set()
+
+    # Only a segment created within the merged edits vanishes when removed.
+    changes.merge(ChangeSet.segments_added(["y"])).merge(ChangeSet(removed={"y"}))
+    assert "y" not in changes.added | changes.removed
@@ -0,0 +1,107 @@
+import numpy as np
+import trimesh
+
+from cobot_importer.core import MeshIndex, PathSegment
+from cobot_importer.core.spatial import segment_distances, segment_triangle_distances
+from cobot_importer.simulation import CollisionChecker, ToolShape
+
+
+def _box_index() -> MeshIndex:
+    box = trimesh.creation.box(extents=(100.0, 100.0, 20.0))
+    return MeshIndex.build(np.asarray(box.vertices), np.asarray(box.faces))
+
+
+def _segment(poses, **fields) -> PathSegment:
+    segment = PathSegment(name="碰撞", **fields)
+    segment.points.extend_array(np.asarray(poses, dtype=float))
+    return segment
+
+
+def test_segment_distances_match_dense_sampling():
+    rng = np.random.default_rng(4)
+    p0, p1, q0, q1 = (rng.normal(size=(300, 3)) for _ in range(4))
+    exact = segment_distances(p0, p1, q0, q1)
+    u = np.linspace(0.0, 1.0, 301)[None, :, None]
+    first = p0[:, None] + u * (p1 - p0)[:, None]
+    second = q0[:, None] + u * (q1 - q0)[:, None]
+    sampled = np.linalg.norm(first[:, :, None] - second[:, None], axis=3).min(axis=(1, 2))
+    assert np.all(exact <= sampled + 1e-12)
+    np.testing.assert_allclose(exact, sampled, atol=5e-3)
+
+    triangle = np.array([[[0.0, 0, 0], [10.0, 0, 0], [0.0, 10, 0]]])
+    crossing = segment_triangle_distances(np.array([[1.0, 1, -1]]), np.array([[1.0, 1, 1]]), triangle)
+    above = segment_triangle_distances(np.array([[1.0, 1, 2]]), np.array([[20.0, 1, 2]]), triangle)
+    np.testing.assert_allclose([crossing[0], above[0]], [0.0, 2.0])
+
+
+def test_capsules_within_radius_of_the_mesh():
+    index = _box_index()
+    starts = np.array([[0.0, 0, 12], [0.0, 0, 20], [60.0, 0, 0], [0.0, 0, -30]])
+    ends = np.array([[0.0, 0, 50], [0.0, 0, 50], [70.0, 0, 0], [0.0, 0, 30]])
+    np.testing.assert_array_equal(index.segments_within(starts, ends, 3.0), [True, False, False, True])
+
+
+def test_tool_sweep_reports_colliding_ranges():
+    checker = CollisionChecker(_box_index(), ToolShape(radius=2.0, length=50.0, clearance=1.0))
+    # Tool pointing down onto the top face (z = 10), then tipped into the part.
+    down = [np.pi, 0.0, 0.0]
+    poses = [[-40.0 + 10 * i, 0.0, 10.0] + down for i in range(9)]
+    poses[4][3:] = [0.0, 0.0, 0.0]
+    segment = _segment(poses)
+    report = checker.check_segment(segment)
+    assert report.has_collisions
+    assert report.point_ranges == [(3, 4)]
+    assert report.point_flags(len(poses)).tolist() == [False] * 3 + [True, True] + [False] * 4
+    assert checker.check_segment(segment) is report
+
+    segment.points.set_rows(4, np.array([[0.0, 0.0, 10.0] + down]))
+    assert not checker.check_segment(segment).has_collisions
+
+
+def test_sweep_follows_the_blended_corners_of_the_plan():
+    index = _box_index()
+    down = [np.pi, 0.0, 0.0]
+    # Around the box corner at (50, 50), 10 mm clear of both faces; a wide blend cuts the corner.
+    poses = [[-70.0, 60.0, 0.0] + down, [60.0, 60.0, 0.0] + down, [60.0, -70.0, 0.0] + down]
+    sharp = CollisionChecker(index, ToolShape(radius=2.0)).check_segment(_segment(poses))
+    assert not sharp.has_collisions
+    blended = CollisionChecker(index, ToolShape(radius=2.0)).check_segment(_segment(poses, blend_radius=50.0))
+    assert blended.point_ranges == [(1, 1)]
+
+
+def test_approach_and_retract_moves_are_swept():
+    index = _box_index()
+    down = [np.pi, 0.0, 0.0]
+    # Waypoints under the box; approach and retract rise through it.
+    poses = [[0.0, 0.0, -40.0] + down, [10.0, 0.0, -40.0] + down]
+    checker = CollisionChecker(index, ToolShape(radius=2.0, length=10.0))
+    assert not checker.check_segment(_segment(poses, approach_height=0.0, retract_height=0.0)).has_collisions
+    report = checker.check_segment(_segment(poses, approach_height=60.0, retract_height=60.0))
+    # Vertices: approach, two waypoints, retract; only the approach and the retract edge collide.
+    assert set(report.frame_vertex_indices[report.colliding].tolist()) == {0, 2}
+    assert report.point_flags(2).tolist() == [True, True]
+
+
+def test_incremental_sweeps_match_full_sweeps():
+    index = _box_index()
+    rng = np.random.default_rng(8)
+    checker = CollisionChecker(index)
+
+    def random_poses(count):
+        return np.hstack([rng.uniform(-60, 60, (count, 3)), rng.normal(size=(count, 3))])
+
+    segment = _segment(random_poses(20))
+    checker.check_segment(segment)
+    for _ in range(40):
+        count = len(segment.points)
+        choice = rng.integers(3)
+        if choice == 0 and count > 2:
+            segment.points.delete_rows([int(rng.integers(count))])
+        elif choice == 1:
+            segment.points.insert_array(int(rng.integers(count + 1)), random_poses(2))
+        else:
+            segment.points.set_value(int(rng.integers(count)), int(rng.integers(6)), float(rng.uniform(-60, 60)))
+        incremental = checker.check_segment(segment)
+        full = CollisionChecker(index).check_segment(segment)
+        np.testing.assert_array_equal(incremental.colliding, full.colliding)
+        np.testing.assert_array_equal(incremental.frame_point_indices, full.frame_point_indices)
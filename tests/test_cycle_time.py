@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from cobot_importer.simulation import CycleTimeEstimator, MotionLimits, MotionPlanCache, Trajectory
+from conftest import path_segment
+
+
+def test_estimate_matches_the_trajectory_duration():
+    cache = MotionPlanCache()
+    segments = [
+        path_segment(
+            [[0, 0, 0], [100, 0, 0], [100, 50, 0]],
+            approach_height=10.0,
+            retract_height=10.0,
+            speed=80.0,
+            blend_radius=10.0,
+        ),
+        path_segment([[0, 0, 0], [10, 0, 0]], enabled=False),
+        path_segment([[200, 0, 0], [300, 0, 0]], retract_height=10.0, speed=0.0),
+        path_segment([[300, 100, 0]], approach_height=10.0, retract_height=30.0),
+    ]
+    estimate = CycleTimeEstimator(cache).estimate(segments)
+    assert [item.name for item in estimate.segments] == ["轨迹"] * 3
+    assert estimate.segments[0].transit == 0.0
+    assert all(item.transit > 0 for item in estimate.segments[1:])
+    assert estimate.total == pytest.approx(Trajectory(segments, plans=cache).duration)
+
+
+def test_edits_and_limits_update_the_estimate():
+    cache = MotionPlanCache()
+    estimator = CycleTimeEstimator(cache)
+    segments = [path_segment([[0, 0, 0], [100, 0, 0]], speed=50.0), path_segment([[0, 100, 0], [100, 100, 0]])]
+    before = estimator.estimate(segments)
+
+    segments[1].speed = 25.0
+    after = estimator.estimate(segments)
+    assert after.segments[0] == before.segments[0]
+    assert after.segments[1].motion > before.segments[1].motion
+
+    cache.set_limits(MotionLimits(acceleration=100.0))
+    assert estimator.estimate(segments).total > after.total
+    assert estimator.estimate(segments[:1]).segments[0].transit == 0.0
+
+
+def test_an_edit_recompiles_only_the_edited_segment():
+    rng = np.random.default_rng(2)
+    cache = MotionPlanCache()
+    segments = [path_segment(rng.uniform(0, 500, size=(20, 3))) for _ in range(3000)]
+    estimator = CycleTimeEstimator(cache)
+    before = estimator.estimate(segments)
+    assert cache.compiled == 3000
+
+    segments[1500].points.set_value(3, 2, 10.0)
+    estimate = estimator.estimate(segments)
+    assert cache.compiled == 3001
+    assert len(estimate.segments) == 3000
+    changed = [index for index, (old, new) in enumerate(zip(before.segments, estimate.segments)) if old != new]
+    assert changed == [1500]
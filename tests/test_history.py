@@ -0,0 +1,71 @@
+import numpy as np
+
+from cobot_importer.core import EditHistory, PathSegment, PointStore, Project, ProjectEditor
+
+
+def _editor() -> ProjectEditor:
+    project = Project()
+    segment = project.add_path(PathSegment(name="Seg"))
+    segment.points.extend_array(np.zeros((1000, 6)))
+    return ProjectEditor(project)
+
+
+def test_undo_redo_roundtrip() -> None:
+    editor = _editor()
+    history = EditHistory(editor, merge_interval=0.0)
+    original = editor.project.to_dict()
+    editor.set_point_value(0, 5, 0, 3.0)
+    editor.remove_points(0, range(10, 20))
+    editor.clone_path(0)
+    edited = editor.project.to_dict()
+
+    while history.undo():
+        pass
+    assert editor.project.to_dict() == original
+    while history.redo():
+        pass
+    assert editor.project.to_dict() == edited
+
+
+def test_consecutive_parameter_edits_merge() -> None:
+    editor = _editor()
+    history = EditHistory(editor)
+    for speed in (110.0, 120.0, 130.0):
+        editor.set_segment_fields(0, speed=speed)
+    assert history.undo()
+    assert editor.project.paths[0].speed == 100.0
+    assert not history.can_undo()
+
+
+def test_memory_limit_evicts_oldest_entries() -> None:
+    editor = _editor()
+    history = EditHistory(editor, memory_limit=4096, merge_interval=0.0)
+    for _ in range(5):
+        editor.remove_points(0, range(0, 50))
+    assert history.nbytes <= 4096
+    undone = 0
+    while history.undo():
+        undone += 1
+    assert 0 < undone < 5
+
+
+def test_point_store_copy_is_copy_on_write() -> None:
+    store = PointStore.from_array(np.ones((4, 6)))
+    clone = store.copy()
+    assert np.shares_memory(store.poses, clone.poses)
+    clone.set_value(0, 0, 9.0)
+    assert store[0].x == 1.0
+    assert not np.shares_memory(store.poses, clone.poses)
+
+
+def test_replace_points_is_one_undo_step() -> None:
+    editor = _editor()
+    history = EditHistory(editor, merge_interval=0.0)
+    original = editor.project.paths[0].points.poses.copy()
+    editor.replace_points(0, 10, 20, np.ones((3, 6)))
+    points = editor.project.paths[0].points
+    assert len(points) == 993 and np.all(points.poses[10:13] == 1.0) and np.all(points.poses[13:] == 0.0)
+
+    assert history.undo()
+    np.testing.assert_array_equal(editor.project.paths[0].points.poses, original)
+    assert not history.can_undo()
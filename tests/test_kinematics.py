@@ -0,0 +1,103 @@
+import json
+
+import numpy as np
+import pytest
+
+from cobot_importer.core import PathSegment
+from cobot_importer.simulation import ReachabilityAnalyzer, RobotModel, solve_ik
+
+
+def _joint_path(model: RobotModel, count: int, delta) -> np.ndarray:
+    return np.array(model.home) + np.linspace(0.0, 1.0, count)[:, None] * np.asarray(delta)
+
+
+def test_forward_kinematics_and_jacobian():
+    model = RobotModel.default()
+    # UR5e with all joints at zero: arm stretched along -x.
+    np.testing.assert_allclose(model.forward(np.zeros(6))[0, :3, 3], [-817.2, -232.9, 62.8], atol=1e-9)
+
+    joints = np.array([0.3, -1.2, 1.1, -1.5, -1.4, 0.2])
+    jacobian = model.jacobian(joints)[0]
+    step = 1e-7
+    shifted = joints + np.eye(6) * step
+    numeric = (model.forward(shifted)[:, :3, 3] - model.forward(joints)[0, :3, 3]) / step
+    np.testing.assert_allclose(jacobian[:3], numeric.T, atol=1e-3)
+
+
+def test_batch_ik_recovers_a_joint_path():
+    model = RobotModel.default()
+    joints = _joint_path(model, 300, [0.5, 0.3, -0.4, 0.3, 0.5, 0.2])
+    targets = model.forward(joints)
+    solution = solve_ik(model, targets[:, :3, 3], targets[:, :3, :3])
+    assert solution.reachable.all()
+    assert not solution.singular.any() and not solution.at_limit.any()
+    # Warm starting keeps the solver on the configuration the path was made with.
+    np.testing.assert_allclose(solution.joints, joints, atol=1e-3)
+
+
+def test_ik_flags_unreachable_singular_and_limit_poses():
+    model = RobotModel.default()
+    outside = solve_ik(model, [[3000.0, 0.0, 0.0]], np.eye(3)[None])
+    assert not outside.reachable[0]
+    assert outside.position_errors[0] > 1000
+
+    wrist = np.array(model.home)
+    wrist[4] = 0.0
+    target = model.forward(wrist)
+    singular = solve_ik(model, target[:, :3, 3], target[:, :3, :3], seed=wrist + 0.05)
+    assert singular.singular[0]
+
+    limited = np.array(model.home)
+    limited[1] = -np.pi + 0.01
+    target = model.forward(limited)
+    at_limit = solve_ik(model, target[:, :3, 3], target[:, :3, :3], seed=limited)
+    assert at_limit.at_limit[0]
+
+
+def test_robot_model_loads_from_json(tmp_path):
+    model = RobotModel.default()
+    model.base = [100.0, 0.0, 0.0, 0.0, 0.0, np.pi / 2]
+    path = tmp_path / "robot.json"
+    path.write_text(json.dumps(model.to_dict()), encoding="utf-8")
+    loaded = RobotModel.load(path)
+    assert loaded == model
+    home = np.array(model.home)
+    np.testing.assert_allclose(loaded.forward(home), model.forward(home))
+    with pytest.raises(ValueError):
+        RobotModel.from_dict({"joints": [{}, {}], "home": [0.0]})
+
+
+def _down_segment(positions, **fields) -> PathSegment:
+    # Tool pointing down as at the UR5e home pose.
+    rotation = np.pi / np.sqrt(2.0) * np.array([1.0, 1.0, 0.0])
+    segment = PathSegment(name="a", **fields)
+    segment.points.extend_array(np.hstack([positions, np.tile(rotation, (len(positions), 1))]))
+    return segment
+
+
+def test_reachability_reports_are_cached_per_revision():
+    analyzer = ReachabilityAnalyzer(RobotModel.default(), resolution=5.0)
+    segment = _down_segment([[-491.9, -133.3, 487.9], [-491.9, 100.0, 300.0], [-300.0, 100.0, 300.0]])
+    report = analyzer.analyze_segment(segment)
+    assert report.reachable.all() and len(report.reachable) == 3
+    assert len(report.joints) == len(report.frame_point_indices) > 3
+    assert analyzer.analyze_segment(segment) is report
+
+    segment.points.set_value(2, 0, 3000.0)
+    edited = analyzer.analyze_segment(segment)
+    assert edited is not report
+    # The last waypoint and the move towards it leave the workspace.
+    assert edited.reachable.tolist() == [True, False, False]
+
+    assert analyzer.analyze([]) == []
+    analyzer.set_model(RobotModel.default())
+    assert analyzer.analyze_segment(segment) is not edited
+
+
+def test_reachability_covers_the_approach_and_retract_moves():
+    analyzer = ReachabilityAnalyzer(RobotModel.default(), resolution=5.0)
+    positions = [[-491.9, -133.3, 487.9], [-491.9, 100.0, 300.0]]
+    assert analyzer.analyze_segment(_down_segment(positions, retract_height=0.0)).reachable.all()
+    # Both waypoints stay reachable, but the approach starts far above the first one.
+    report = analyzer.analyze_segment(_down_segment(positions, approach_height=2000.0, retract_height=0.0))
+    assert report.reachable.tolist() == [False, True]
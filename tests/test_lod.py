@@ -0,0 +1,35 @@
+from pathlib import Path
+
+import numpy as np
+import trimesh
+
+from cobot_importer.core import MeshCache, ModelLoader
+from cobot_importer.core.lod import LOD_MIN_FACES, compute_vertex_normals, decimate
+
+
+def test_lod_chain_is_cached_with_the_mesh(tmp_path: Path):
+    model = tmp_path / "sphere.stl"
+    trimesh.creation.icosphere(subdivisions=6, radius=50.0).export(model)
+    cache = MeshCache(tmp_path / "cache")
+
+    geometry = ModelLoader.load_mesh(model, cache=cache)
+    counts = [len(level.faces) for level in geometry.levels]
+    assert counts[0] >= LOD_MIN_FACES
+    assert len(counts) > 1 and counts == sorted(counts, reverse=True)
+    for level in geometry.lods:
+        radii = np.linalg.norm(level.vertices, axis=1)
+        assert np.all(np.abs(radii - 50.0) < 2.5)
+        assert level.faces.max() < len(level.vertices)
+
+    cached = ModelLoader.load_mesh(model, cache=cache)
+    assert [len(level.faces) for level in cached.levels] == counts
+    assert isinstance(cached.lods[-1].faces, np.memmap)
+
+
+def test_decimate_and_normals_on_small_mesh():
+    mesh = trimesh.creation.icosphere(subdivisions=4)
+    vertices, faces = decimate(np.asarray(mesh.vertices), np.asarray(mesh.faces), 500)
+    assert 0 < len(faces) <= 750
+    normals = compute_vertex_normals(np.asarray(mesh.vertices), np.asarray(mesh.faces))
+    radial = mesh.vertices / np.linalg.norm(mesh.vertices, axis=1, keepdims=True)
+    np.testing.assert_allclose(normals, radial, atol=1e-2)
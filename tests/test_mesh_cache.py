@@ -0,0 +1,54 @@
+import os
+from pathlib import Path
+
+import numpy as np
+import trimesh
+
+from cobot_importer.core import MeshCache, ModelLoader
+
+
+def _write_box(path: Path, extents=(10.0, 20.0, 30.0)) -> Path:
+    trimesh.creation.box(extents=extents).export(path)
+    return path
+
+
+def test_second_load_is_served_from_mapped_cache(tmp_path: Path):
+    model = _write_box(tmp_path / "box.stl")
+    cache = MeshCache(tmp_path / "cache")
+
+    first = ModelLoader.load_mesh(model, cache=cache)
+    second = ModelLoader.load_mesh(model, cache=cache)
+
+    assert not isinstance(first.vertices, np.memmap)
+    assert isinstance(second.vertices, np.memmap)
+    np.testing.assert_array_equal(first.vertices, second.vertices)
+    np.testing.assert_array_equal(first.faces, second.faces)
+    np.testing.assert_allclose(first.normals, second.normals)
+
+    # Copies share the content-addressed entry; edits invalidate it.
+    copy = tmp_path / "copy.stl"
+    copy.write_bytes(model.read_bytes())
+    assert isinstance(ModelLoader.load_mesh(copy, cache=cache).vertices, np.memmap)
+    _write_box(model, extents=(1.0, 1.0, 1.0))
+    os.utime(model, ns=(0, 12345))
+    reloaded = ModelLoader.load_mesh(model, cache=cache)
+    assert not isinstance(reloaded.vertices, np.memmap)
+    assert np.ptp(reloaded.vertices, axis=0).max() == 1.0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path):
+    cache = MeshCache(tmp_path / "cache")
+    keys = []
+    for index in range(3):
+        model = _write_box(tmp_path / f"box{index}.stl", extents=(index + 1.0, 1.0, 1.0))
+        ModelLoader.load_mesh(model, cache=cache)
+        keys.append(cache.key_for(model))
+        entry = cache.root / keys[-1]
+        os.utime(entry, (index, index))
+    entry_size = cache.size // 3
+
+    cache.get(keys[0])  # refresh the oldest entry
+    MeshCache(cache.root, max_bytes=entry_size * 2).evict()
+
+    remaining = {path.name for path in cache.root.iterdir() if path.is_dir()}
+    assert remaining == {keys[0], keys[2]}
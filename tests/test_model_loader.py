@@ -0,0 +1,64 @@
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+import trimesh
+
+from cobot_importer.core import AsyncModelLoader, LoadCancelled, MeshCache, MeshGeometry, ModelLoader
+
+
+def test_async_load_reports_progress_and_bounds(tmp_path: Path):
+    model = tmp_path / "box.stl"
+    trimesh.creation.box(extents=(10.0, 20.0, 30.0)).export(model)
+    np.testing.assert_allclose(ModelLoader.peek_bounds(model), [[-5, -10, -15], [5, 10, 15]])
+
+    loader = AsyncModelLoader(MeshCache(tmp_path / "cache"))
+    stages, bounds = [], []
+    task = loader.submit(model, progress=lambda fraction, stage: stages.append((fraction, stage)), on_bounds=bounds.append)
+    geometry = task.result(timeout=30)
+    loader.shutdown()
+
+    assert len(geometry.faces) == 12
+    np.testing.assert_allclose(bounds[0], geometry.bounds)
+    fractions = [fraction for fraction, _stage in stages]
+    assert fractions == sorted(fractions) and fractions[-1] == 1.0
+    assert {"hash", "parse", "done"} <= {stage for _fraction, stage in stages}
+
+
+def test_cancelled_load_raises(tmp_path: Path):
+    model = tmp_path / "box.stl"
+    trimesh.creation.box().export(model)
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(LoadCancelled):
+        ModelLoader.load_mesh(model, cancel=cancel)
+
+    loader = AsyncModelLoader()
+    release = threading.Event()
+    blocker = loader.submit(model, progress=lambda *_args: release.wait(5))
+    task = loader.submit(model)
+    task.cancel()
+    release.set()
+    blocker.result(timeout=30)
+    assert isinstance(task.exception(), LoadCancelled)
+    loader.shutdown()
+
+
+def test_geometry_uses_compact_shared_buffers(tmp_path: Path):
+    model = tmp_path / "sphere.stl"
+    reference = trimesh.creation.icosphere(subdivisions=3, radius=10.0)
+    reference.export(model)
+
+    geometry = ModelLoader.load_mesh(model)
+    assert geometry.vertices.dtype == np.float32 and geometry.vertices.flags.c_contiguous
+    assert geometry.faces.dtype == np.uint32 and geometry.normals.dtype == np.float32
+    assert len(geometry.vertices) == len(reference.vertices)
+    np.testing.assert_allclose(
+        np.sort(geometry.vertices[geometry.faces].reshape(-1, 9), axis=0),
+        np.sort(reference.vertices[reference.faces].reshape(-1, 9), axis=0),
+        atol=1e-5,
+    )
+
+    shared = MeshGeometry(geometry.vertices, geometry.faces, geometry.normals)
+    assert shared.vertices is geometry.vertices and shared.faces is geometry.faces
@@ -0,0 +1,216 @@
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyqtgraph.opengl")
+
+from cobot_importer.ui.path_batch import INITIAL_CAPACITY, MAX_DIRTY_RANGES, PathBatchItem  # noqa: E402
+
+
+@pytest.fixture
+def gl_context():
+    """A current OpenGL context on an offscreen surface; skips where none can be created."""
+
+    if not any(os.environ.get(name) for name in ("QT_QPA_PLATFORM", "DISPLAY", "WAYLAND_DISPLAY")):
+        pytest.skip("no display for an OpenGL context")
+    from PySide6.QtGui import QGuiApplication, QOffscreenSurface, QOpenGLContext
+
+    app = QGuiApplication.instance() or QGuiApplication([])
+    if not isinstance(app, QGuiApplication):
+        pytest.skip("a non-GUI Qt application is already running")
+    surface = QOffscreenSurface()
+    surface.create()
+    context = QOpenGLContext()
+    if not context.create() or not context.makeCurrent(surface):
+        pytest.skip("no OpenGL context available")
+    yield context
+    context.doneCurrent()
+
+
+def _line(count: int, offset: float = 0.0) -> np.ndarray:
+    return np.column_stack([np.arange(count, dtype=float), np.full(count, offset), np.zeros(count)])
+
+
+def _visible(batch: PathBatchItem) -> np.ndarray:
+    return batch.pos[batch.color[:, 3] > 0]
+
+
+def test_ranges_share_one_buffer_and_update_in_place():
+    batch = PathBatchItem()
+    batch.set_polyline("a", _line(10), (1.0, 0.0, 0.0, 1.0))
+    batch.set_polyline("b", _line(5, 1.0), (0.0, 1.0, 0.0, 1.0))
+    assert len(batch) == 2 and batch.capacity == INITIAL_CAPACITY
+    np.testing.assert_allclose(_visible(batch), np.vstack([_line(10), _line(5, 1.0)]))
+    # Every strip edge between two ranges has a transparent end.
+    start, stop = batch.vertex_range("a")
+    assert batch.color[start - 1, 3] == 0 and batch.color[stop, 3] == 0
+
+    pos = batch.pos
+    batch._dirty.clear()
+    batch.set_polyline("a", _line(12, 2.0), (1.0, 0.0, 0.0, 1.0))
+    assert batch.vertex_range("a") == (start, start + 12)
+    assert batch.pos is pos
+    assert batch._dirty == [(start - 1, start - 1 + 10 + 2 + 2)]
+
+    # Growing past the range's slack moves it to the end.
+    batch.set_polyline("a", _line(40, 3.0), (1.0, 0.0, 0.0, 1.0))
+    assert batch.vertex_range("a")[0] > batch.vertex_range("b")[0]
+    np.testing.assert_allclose(_visible(batch), np.vstack([_line(5, 1.0), _line(40, 3.0)]))
+    assert batch.vertex_count == 45
+    batch.remove("b")
+    assert batch.vertex_count == 40
+
+
+def test_hiding_highlighting_and_removal():
+    batch = PathBatchItem()
+    batch.set_polyline("a", _line(4), (1.0, 0.0, 0.0, 1.0))
+    batch.set_polyline("b", _line(3, 1.0), (0.0, 1.0, 0.0, 1.0))
+
+    batch.set_visible("a", False)
+    np.testing.assert_allclose(_visible(batch), _line(3, 1.0))
+    batch.set_visible("a", True)
+    colors = np.tile([0.0, 0.0, 1.0, 1.0], (4, 1))
+    colors[2] = [1.0, 0.0, 1.0, 1.0]
+    batch.set_color("a", colors)
+    start, stop = batch.vertex_range("a")
+    np.testing.assert_allclose(batch.color[start:stop], colors)
+
+    batch.remove("a")
+    assert "a" not in batch
+    np.testing.assert_allclose(_visible(batch), _line(3, 1.0))
+
+
+def test_growth_and_compaction_keep_the_polylines():
+    batch = PathBatchItem()
+    for key in range(200):
+        batch.set_polyline(key, _line(50, key), (1.0, 1.0, 1.0, 1.0))
+    assert batch.capacity > INITIAL_CAPACITY
+    used = batch._used
+    kept = [key for key in range(200) if key % 4 == 0]
+    for key in set(range(200)) - set(kept):
+        batch.remove(key)
+    # Repacking dropped the freed ranges.
+    assert batch._used < used / 2
+    np.testing.assert_allclose(_visible(batch), np.vstack([_line(50, key) for key in kept]))
+
+
+class _RecordingBuffer:
+    """Stand-in for a QOpenGLBuffer: keeps the uploaded bytes and records partial writes."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.writes = []
+        self.bound = False
+
+    def isCreated(self) -> bool:
+        return bool(self.data)
+
+    def size(self) -> int:
+        return len(self.data)
+
+    def bind(self) -> None:
+        self.bound = True
+
+    def release(self) -> None:
+        self.bound = False
+
+    def write(self, offset: int, data: np.ndarray, count: int) -> None:
+        assert self.bound and offset + count <= len(self.data)
+        self.data[offset : offset + count] = data.tobytes()[:count]
+        self.writes.append((offset, count))
+
+
+def _upload_all(batch: PathBatchItem) -> None:
+    """What the base class's paint does for the dirty buffers, without a GL context."""
+
+    if batch.dirty_bits:
+        batch.m_vbo_position.data = bytearray(batch.pos.tobytes())
+        batch.m_vbo_color.data = bytearray(batch.color.tobytes())
+        batch.dirty_bits = type(batch.dirty_bits)(0)
+
+
+def _recording_batch() -> PathBatchItem:
+    batch = PathBatchItem()
+    batch.m_vbo_position = _RecordingBuffer()
+    batch.m_vbo_color = _RecordingBuffer()
+    return batch
+
+
+def test_edits_write_only_the_touched_slots():
+    batch = _recording_batch()
+    batch.set_polyline("a", _line(10), (1.0, 0.0, 0.0, 1.0))
+    batch.set_polyline("b", _line(5, 1.0), (0.0, 1.0, 0.0, 1.0))
+    batch.set_polyline("c", _line(7, 2.0), (0.0, 0.0, 1.0, 1.0))
+    batch._write_dirty()
+    _upload_all(batch)
+    assert batch.m_vbo_position.writes == []
+
+    pos, color = batch.pos, batch.color
+    batch.set_polyline("a", _line(12, 3.0), (1.0, 1.0, 0.0, 1.0))
+    batch.set_color("c", (1.0, 0.0, 1.0, 1.0))
+    # No reallocation: the base class has nothing to upload.
+    assert not batch.dirty_bits and batch.pos is pos and batch.color is color
+    batch._write_dirty()
+    _upload_all(batch)
+    assert batch.m_vbo_position.data == batch.pos.tobytes()
+    assert batch.m_vbo_color.data == batch.color.tobytes()
+    # One write per edited range, "b" in between is left alone.
+    slots = [batch._ranges[key] for key in "ac"]
+    expected = [(entry.start * 16, entry.size * 16) for entry in slots]
+    assert batch.m_vbo_color.writes == expected
+    assert batch._dirty == []
+
+    batch.set_visible("b", False)
+    batch._write_dirty()
+    assert batch.m_vbo_color.data == batch.color.tobytes()
+    assert len(batch.m_vbo_color.writes) == 3
+
+
+def test_pending_whole_uploads_take_over_partial_writes():
+    batch = _recording_batch()
+    batch.set_polyline("a", _line(10), (1.0, 0.0, 0.0, 1.0))
+    batch._write_dirty()
+    _upload_all(batch)
+
+    # Clearing uploads the colors as a whole; positions still need the partial write.
+    batch.clear()
+    batch.set_polyline("b", _line(6, 1.0), (0.0, 1.0, 0.0, 1.0))
+    batch._write_dirty()
+    assert batch.m_vbo_color.writes == [] and batch.m_vbo_position.writes
+    _upload_all(batch)
+    assert batch.m_vbo_position.data == batch.pos.tobytes()
+    assert batch.m_vbo_color.data == batch.color.tobytes()
+
+    # Too many scattered edits fall back to one whole upload.
+    for key in range(MAX_DIRTY_RANGES + 1):
+        batch.set_color("b", (0.0, 0.0, key % 2, 1.0))
+    assert batch.dirty_bits and len(batch._dirty) < MAX_DIRTY_RANGES
+
+
+def _read_buffer(vbo, like: np.ndarray) -> np.ndarray:
+    from OpenGL import GL
+
+    vbo.bind()
+    data = GL.glGetBufferSubData(GL.GL_ARRAY_BUFFER, 0, like.nbytes)
+    vbo.release()
+    return np.frombuffer(bytes(data), dtype=like.dtype).reshape(like.shape)
+
+
+def test_partial_writes_match_a_full_upload(gl_context):
+    batch = PathBatchItem()
+    batch.set_polyline("a", _line(10), (1.0, 0.0, 0.0, 1.0))
+    batch.set_polyline("b", _line(5, 1.0), (0.0, 1.0, 0.0, 1.0))
+    batch.set_polyline("c", _line(7, 2.0), (0.0, 0.0, 1.0, 1.0))
+    batch.upload_vbo(batch.m_vbo_position, batch.pos)
+    batch.upload_vbo(batch.m_vbo_color, batch.color)
+    batch.dirty_bits = type(batch.dirty_bits)(0)
+    batch._dirty.clear()
+
+    batch.set_polyline("a", _line(12, 3.0), (1.0, 1.0, 0.0, 1.0))
+    batch.set_color("c", (1.0, 0.0, 1.0, 1.0))
+    batch.set_visible("b", False)
+    assert batch._dirty and not batch.dirty_bits
+    batch._write_dirty()
+    np.testing.assert_array_equal(_read_buffer(batch.m_vbo_position, batch.pos), batch.pos)
+    np.testing.assert_array_equal(_read_buffer(batch.m_vbo_color, batch.color), batch.color)
@@ -0,0 +1,90 @@
+import csv
+import logging
+
+import pytest
+
+# The ui package imports the Qt widgets.
+pytest.importorskip("PySide6.QtWidgets")
+
+from cobot_importer.ui.perf_monitor import PERF_LOGGER, SLOW_SECTION_MS, PerfMonitor  # noqa: E402
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _monitor():
+    clock = _Clock()
+    monitor = PerfMonitor(history=50, clock=clock)
+    monitor.add_gauge("triangles", lambda: 1200)
+    monitor.set_enabled(True)
+    return monitor, clock
+
+
+def test_disabled_monitor_records_nothing():
+    monitor = PerfMonitor()
+    with monitor.measure("update_paths"):
+        pass
+    monitor.record_frame(5.0)
+    assert monitor.history == []
+
+
+def test_frames_carry_section_times_and_gauges():
+    monitor, clock = _monitor()
+    with monitor.measure("update_paths"):
+        clock.now += 0.004
+    monitor.add_section_time("update_paths", 1.0)
+    monitor.record_frame(3.0)
+    clock.now += 0.016
+    monitor.record_frame(2.0)
+
+    first, second = monitor.history
+    assert first.sections == {"update_paths": pytest.approx(5.0)}
+    assert first.gauges == {"triangles": 1200}
+    assert second.sections == {}
+    assert second.interval_ms == pytest.approx(16.0)
+
+
+def test_summary_reports_fps_and_percentiles_of_recent_frames():
+    monitor, clock = _monitor()
+    for index in range(60):
+        clock.now += 0.02
+        monitor.record_frame(30.0 if index == 59 else 10.0)
+    summary = monitor.summary(window_s=0.99)
+    assert summary.frames == 50
+    assert summary.fps == pytest.approx(50.0)
+    assert summary.frame_p50 == pytest.approx(10.0)
+    assert summary.frame_max == pytest.approx(30.0)
+    assert summary.gauges == {"triangles": 1200}
+    assert "50 FPS" in summary.format()
+
+
+def test_slow_sections_go_to_the_perf_log(caplog):
+    monitor, _ = _monitor()
+    with caplog.at_level(logging.INFO, logger=PERF_LOGGER.name):
+        monitor.add_section_time("set_mesh", SLOW_SECTION_MS + 1.0)
+        monitor.add_section_time("set_mesh", 1.0)
+    assert [record.name for record in caplog.records] == ["cobot_importer.perf"]
+    assert "set_mesh" in caplog.records[0].getMessage()
+
+
+def test_history_exports_to_csv(tmp_path):
+    monitor, clock = _monitor()
+    monitor.add_section_time("simulation", 0.5)
+    monitor.record_frame(4.0)
+    clock.now += 0.01
+    monitor.record_frame(6.0)
+
+    path = tmp_path / "perf.csv"
+    assert monitor.export_csv(path) == 2
+    with open(path, newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert list(rows[0]) == [
+        "time_s", "frame_ms", "interval_ms", "set_mesh_ms", "update_paths_ms", "simulation_ms", "triangles"
+    ]
+    assert [float(row["frame_ms"]) for row in rows] == [4.0, 6.0]
+    assert float(rows[0]["simulation_ms"]) == 0.5 and float(rows[1]["interval_ms"]) == pytest.approx(10.0)
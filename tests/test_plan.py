@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from cobot_importer.simulation import MotionLimits, MotionPlanCache, PathPlayer, Trajectory
+from conftest import path_segment
+
+
+def test_plan_covers_approach_path_and_retract():
+    positions = [[0, 0, 0], [100, 0, 0], [100, 100, 0]]
+    segment = path_segment(positions, approach_height=10.0, retract_height=10.0, speed=50.0, blend_radius=10.0)
+    plan = MotionPlanCache().plan(segment)
+    np.testing.assert_allclose(plan.vertices[0], [0, 0, 10])
+    np.testing.assert_allclose(plan.vertices[-1], [100, 100, 10])
+    assert plan.point_indices[0] == plan.point_indices[-1] == -1
+    assert plan.length == pytest.approx(10 + 10 + plan.arc[-2] - plan.arc[1])
+    assert plan.duration == pytest.approx(plan.profiles.durations.sum())
+
+    np.testing.assert_array_equal(plan.target_point_indices, [-1, 0, 1, 2, -1])
+    np.testing.assert_allclose(plan.targets[:, 2], [10, 0, 0, 0, 10])
+    np.testing.assert_allclose(plan.target_speeds, [250, 50, 50, 50, 50])
+    np.testing.assert_allclose(plan.target_blends, [0, 0, 10, 0, 0])
+
+
+def test_cache_recompiles_only_edited_segments():
+    cache = MotionPlanCache()
+    first = path_segment([[0, 0, 0], [10, 0, 0]])
+    second = path_segment([[0, 10, 0], [10, 10, 0]], retract_height=10.0)
+    plans = dict(cache.plans([first, second]))
+    assert cache.plan(first) is plans[0]
+
+    second.points.set_value(1, 0, 20.0)
+    assert cache.plan(first) is plans[0]
+    assert cache.plan(second) is not plans[1]
+    np.testing.assert_allclose(cache.plan(second).vertices[-1], [20, 10, 10])
+
+    second.retract_height = 0.0
+    np.testing.assert_allclose(cache.plan(second).vertices[-1], [20, 10, 0])
+    # Snapshots share the plan of their source.
+    assert cache.plan(second.copy()) is cache.plan(second)
+
+    cache.set_limits(MotionLimits(acceleration=500.0))
+    assert cache.plan(first).limits.acceleration == 500.0
+
+
+def test_consumers_read_the_same_plan():
+    cache = MotionPlanCache()
+    positions = [[0, 0, 0], [30, 0, 0], [30, 30, 0]]
+    segment = path_segment(positions, approach_height=10.0, retract_height=15.0, blend_radius=5.0)
+    plan = cache.plan(segment)
+    trajectory = Trajectory([segment], plans=cache)
+    assert trajectory.length == pytest.approx(plan.length)
+    assert trajectory.duration == pytest.approx(plan.duration)
+
+    frames = PathPlayer([segment], resolution=0.5, plans=cache).frames()
+    np.testing.assert_allclose(frames.positions[0], plan.vertices[0])
+    steps = np.linalg.norm(np.diff(np.vstack([frames.positions, plan.vertices[-1:]]), axis=0), axis=1)
+    assert steps.sum() == pytest.approx(plan.length)
+
+
+def test_one_edit_recompiles_one_segment_of_a_large_project():
+    cache = MotionPlanCache()
+    segments = [path_segment([[index, 0, 0], [index, 10, 0]]) for index in range(600)]
+    Trajectory(segments, plans=cache)
+    assert cache.compiled == 600
+
+    segments[300].points.set_value(1, 2, 5.0)
+    Trajectory(segments, plans=cache)
+    assert cache.compiled == 601
+
+    cache.retain(segments[:100])
+    Trajectory(segments[:100], plans=cache)
+    assert cache.compiled == 601
+    Trajectory(segments, plans=cache)
+    assert cache.compiled == 1101
@@ -0,0 +1,77 @@
+import numpy as np
+
+from cobot_importer.core import PathSegment
+from cobot_importer.core.rotations import rotation_vectors_from_quaternions
+from cobot_importer.simulation import PathPlayer
+from conftest import path_segment
+
+
+def _reference(segments, resolution):
+    """Frames as produced by the original per-step loop."""
+
+    frames = []
+    for s_index, segment in enumerate(segments):
+        if not segment.enabled or len(segment.points) < 2:
+            continue
+        positions = segment.points.positions
+        for p_index in range(len(positions) - 1):
+            start, end = positions[p_index], positions[p_index + 1]
+            steps = max(int(np.linalg.norm(end - start) / resolution), 1)
+            for step in range(steps):
+                frames.append((start * (1 - step / steps) + end * step / steps, s_index, p_index))
+    return frames
+
+
+def test_frames_match_per_step_interpolation():
+    rng = np.random.default_rng(5)
+    segments = [
+        path_segment(rng.uniform(-50, 50, size=(30, 3)), name="a"),
+        path_segment(rng.uniform(-50, 50, size=(5, 3)), name="off", enabled=False),
+        path_segment(np.zeros((1, 3)), name="single"),
+        path_segment(np.array([[0.0, 0, 0], [0.0, 0, 0], [3.0, 4.0, 0]]), name="b"),
+    ]
+    player = PathPlayer(segments, resolution=2.0)
+    expected = _reference(segments, 2.0)
+
+    frames = player.frames()
+    assert player.frame_count == len(frames) == len(expected)
+    np.testing.assert_allclose(frames.positions, [frame[0] for frame in expected], atol=1e-12)
+    np.testing.assert_array_equal(frames.segment_indices, [frame[1] for frame in expected])
+    np.testing.assert_array_equal(frames.point_indices, [frame[2] for frame in expected])
+    assert len(player.segment_frames(1)) == 0
+    np.testing.assert_array_equal(player.segment_frames(3).point_indices, [0, 1, 1])
+
+    chunks = list(player.iter_chunks(chunk_size=50))
+    assert max(len(chunk) for chunk in chunks) == 50
+    assert all(len(set(chunk.segment_indices)) == 1 for chunk in chunks)
+    np.testing.assert_array_equal(np.concatenate([chunk.positions for chunk in chunks]), frames.positions)
+    first = next(player.iter_frames())
+    assert first.segment_index == 0 and first.point_index == 0
+
+
+def test_player_keeps_a_snapshot_of_the_points():
+    segment = path_segment(np.array([[0.0, 0, 0], [10.0, 0, 0]]), name="a")
+    player = PathPlayer([segment], resolution=1.0)
+    segment.points.set_value(1, 0, 100.0)
+    assert player.frame_count == 10
+    np.testing.assert_allclose(player.frames().positions[-1], [9.0, 0, 0])
+
+
+def test_frames_interpolate_orientations():
+    segment = PathSegment(name="a", approach_height=0.0, retract_height=0.0)
+    segment.points.extend_array(np.array([[0.0, 0, 0, 0, 0, 0], [10.0, 0, 0, 0, 0, np.pi / 2]]))
+    frames = PathPlayer([segment], resolution=1.0).frames()
+    angles = rotation_vectors_from_quaternions(frames.orientations)[:, 2]
+    np.testing.assert_allclose(angles, np.arange(10) * np.pi / 20, atol=1e-12)
+
+
+def test_frames_follow_approach_blends_and_retract():
+    corner = np.array([[0.0, 0, 0], [20.0, 0, 0], [20.0, 20.0, 0]])
+    segment = path_segment(corner, name="a", approach_height=5.0, retract_height=8.0, blend_radius=4.0)
+    frames = PathPlayer([segment], resolution=1.0).frames()
+    np.testing.assert_allclose(frames.positions[0], [0, 0, 5])
+    np.testing.assert_allclose(frames.positions[-1], [20, 20, 7])
+    # Approach frames belong to no waypoint; retract frames start from the last one.
+    assert frames.point_indices[0] == -1 and frames.point_indices[-1] == 2
+    # The blended corner keeps its distance from the waypoint.
+    assert np.linalg.norm(frames.positions - corner[1], axis=1).min() > 1.0
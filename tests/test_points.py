@@ -0,0 +1,49 @@
+import numpy as np
+
+from cobot_importer.core import IOEvent, PathPoint, PathSegment, PointStore
+from cobot_importer.core.project import IOType
+
+
+def test_segment_converts_point_lists() -> None:
+    segment = PathSegment(name="Seg", points=[PathPoint(0, 0, 0), PathPoint(1, 2, 3, rz=0.5)])
+    assert isinstance(segment.points, PointStore)
+    segment.points.append(PathPoint(4, 5, 6))
+    assert segment.points.poses.shape == (3, 6)
+    assert segment.points[1].rz == 0.5
+    assert segment.points[-1] == PathPoint(4, 5, 6)
+
+
+def test_views_write_through_to_arrays() -> None:
+    store = PointStore.from_array(np.zeros((4, 3)))
+    positions = store.positions
+    store[2].x = 7.0
+    assert positions[2, 0] == 7.0
+    store.set_rows(0, np.ones((2, 6)))
+    assert store[1].rx == 1.0
+
+
+def test_io_events_follow_their_points() -> None:
+    event = IOEvent(io_type=IOType.DIGITAL_OUTPUT, identifier="DO1", value=1.0)
+    store = PointStore([PathPoint(0, 0, 0), PathPoint(1, 0, 0, io_events=[event]), PathPoint(2, 0, 0)])
+    store.insert(0, PathPoint(-1, 0, 0))
+    assert list(store[2].io_events) == [event]
+    del store[0]
+    store.delete_rows([0])
+    assert store[0].x == 1.0
+    assert store.event_items() == {0: [event]}
+
+
+def test_reading_events_leaves_the_store_unchanged() -> None:
+    store = PointStore.from_array(np.zeros((3, 3)))
+    revision = store.revision
+    assert store.events_at(1) == () and store[2].io_events == ()
+    assert store.event_items() == {} and store._events == {}
+    assert store.revision == revision
+
+
+def test_segment_dict_roundtrip_keeps_events() -> None:
+    event = IOEvent(io_type=IOType.NETWORK_COMMAND, identifier="start", payload={"a": 1})
+    segment = PathSegment(name="Seg", points=[PathPoint(1, 2, 3, io_events=[event]), PathPoint(4, 5, 6)])
+    restored = PathSegment.from_dict(segment.to_dict())
+    assert restored == segment
+    assert restored.points.to_list()[0].io_events == [event]
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+
+from PySide6.QtCore import Qt  # noqa: E402
+
+from cobot_importer.core import EditHistory, PathSegment, Project, ProjectEditor  # noqa: E402
+from cobot_importer.ui.points_model import PointsTableModel, parse_table_text  # noqa: E402
+
+
+def _model(count: int = 10):
+    project = Project()
+    segment = project.add_path(PathSegment(name="Seg"))
+    segment.points.extend_array(np.column_stack([np.arange(count, dtype=float), np.zeros((count, 5))]))
+    editor = ProjectEditor(project)
+    model = PointsTableModel()
+    model.set_editor(editor)
+    model.set_segment(segment)
+    signals = []
+    model.dataChanged.connect(lambda top, bottom, *_: signals.append(("changed", top.row(), bottom.row())))
+    model.rowsInserted.connect(lambda _, first, last: signals.append(("inserted", first, last)))
+    model.rowsRemoved.connect(lambda _, first, last: signals.append(("removed", first, last)))
+    return editor, segment, model, signals
+
+
+def test_rows_are_read_from_the_point_store():
+    _, _, model, _ = _model()
+    assert model.rowCount() == 10 and model.columnCount() == 6
+    assert model.data(model.index(3, 0)) == "3.000"
+    assert model.data(model.index(3, 0), Qt.EditRole) == 3.0
+    assert model.headerData(1, Qt.Horizontal) == "Y"
+
+
+def test_edits_are_reported_as_ranges():
+    editor, segment, model, signals = _model()
+    assert model.setData(model.index(2, 1), "4.5")
+    assert segment.points.poses[2, 1] == 4.5
+    assert signals == [("changed", 2, 2)]
+
+    signals.clear()
+    assert model.remove_rows([7, 5, 6, 42]) == 3
+    assert model.rowCount() == 7
+    assert signals[0] == ("removed", 5, 7)
+
+    signals.clear()
+    editor.insert_points(0, 2, np.zeros((4, 3)))
+    assert model.rowCount() == len(segment.points) == 11
+    assert signals[0] == ("inserted", 2, 5)
+    assert not model.setData(model.index(0, 0), "abc")
+
+
+def test_paste_overwrites_and_appends_in_one_undo_step():
+    editor, segment, model, _ = _model(3)
+    history = EditHistory(editor, merge_interval=0.0)
+    before = segment.points.poses.copy()
+    assert model.paste(2, 1, "1\t2\n3,4\n5") == 3
+    np.testing.assert_allclose(segment.points.poses[2:, :3], [[2, 1, 2], [2, 3, 4], [2, 5, 4]])
+    assert model.rowCount() == 5
+    assert model.paste(0, 0, "x y") == 0
+
+    assert history.undo()
+    np.testing.assert_allclose(segment.points.poses, before)
+    assert model.rowCount() == 3
+    assert model.copy_text([1]).split("\t")[0] == "1"
+
+
+def test_selecting_a_segment_does_not_read_its_points(monkeypatch):
+    _, segment, model, _ = _model(1)
+    segment.points.extend_array(np.zeros((1_000_000, 6)))
+    store = type(segment.points)
+    reads = []
+    poses = store.poses
+    monkeypatch.setattr(store, "poses", property(lambda self: reads.append(1) or poses.fget(self)))
+
+    model.set_segment(segment)
+    assert model.rowCount() == 1_000_001
+    assert reads == []
+    # Rows are read when a view asks for them.
+    assert model.data(model.index(1, 0)) == "0.000"
+    assert len(reads) == 1
+
+
+def test_parse_table_text_pads_short_lines():
+    np.testing.assert_allclose(parse_table_text("1 2 3\n4\n"), [[1, 2, 3], [4, 2, 3]])
+    assert parse_table_text("   ") is None
@@ -0,0 +1,63 @@
+import numpy as np
+import trimesh
+
+from cobot_importer.core import MeshGeometry, PathSegment
+from cobot_importer.core.lod import compute_vertex_normals
+from cobot_importer.core.projection import project_points, project_segment
+from cobot_importer.core.rotations import TOOL_AXIS, rotation_matrices, rotation_vectors_from_normals
+
+
+def _sphere(radius: float = 50.0) -> MeshGeometry:
+    mesh = trimesh.creation.icosphere(subdivisions=4, radius=radius)
+    vertices, faces = np.asarray(mesh.vertices), np.asarray(mesh.faces)
+    return MeshGeometry(vertices, faces, compute_vertex_normals(vertices, faces))
+
+
+def test_project_points_returns_surface_points_normals_and_faces():
+    geometry = _sphere()
+    rng = np.random.default_rng(1)
+    directions = rng.normal(size=(5000, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    points = directions * rng.uniform(45.0, 55.0, size=(5000, 1))
+
+    projection = project_points(geometry, points, workers=1)
+    np.testing.assert_allclose(np.linalg.norm(projection.points, axis=1), 50.0, atol=0.1)
+    np.testing.assert_allclose(projection.normals, directions, atol=0.02)
+    triangles = geometry.vertices[geometry.faces[projection.faces]]
+    assert np.all(np.linalg.norm(triangles.mean(axis=1) - projection.points, axis=1) < 5.0)
+
+    threaded = project_points(geometry, points, workers=4)
+    np.testing.assert_array_equal(threaded.faces, projection.faces)
+    np.testing.assert_allclose(threaded.points, projection.points)
+
+
+def test_project_segment_orients_tool_against_normal():
+    geometry = _sphere()
+    segment = PathSegment(name="drift")
+    segment.points.extend_array(np.array([[0.0, 0.0, 53.0, 0, 0, 0], [30.0, 30.0, 30.0, 0.1, 0.2, 0.3]]))
+
+    kept = project_segment(segment, geometry)
+    np.testing.assert_allclose(kept[:, 3:], segment.points.orientations)
+    oriented = project_segment(segment, geometry, orient=True)
+    np.testing.assert_allclose(np.linalg.norm(oriented[:, :3], axis=1), 50.0, atol=0.1)
+    tool_axes = rotation_matrices(oriented[:, 3:]) @ TOOL_AXIS
+    radial = oriented[:, :3] / np.linalg.norm(oriented[:, :3], axis=1, keepdims=True)
+    np.testing.assert_allclose(tool_axes, -radial, atol=0.02)
+    assert segment.points.poses[0, 2] == 53.0
+
+
+def test_sharp_edges_use_face_normals():
+    mesh = trimesh.creation.box(extents=(100, 50, 20))
+    vertices, faces = np.asarray(mesh.vertices), np.asarray(mesh.faces)
+    geometry = MeshGeometry(vertices, faces, compute_vertex_normals(vertices, faces))
+
+    projection = project_points(geometry, [[10.0, 5.0, 40.0], [70.0, 0.0, 3.0]])
+    np.testing.assert_allclose(projection.points, [[10.0, 5.0, 10.0], [50.0, 0.0, 3.0]], atol=1e-6)
+    np.testing.assert_allclose(projection.normals, [[0, 0, 1.0], [1.0, 0, 0]], atol=1e-9)
+
+
+def test_rotation_vectors_from_axis_aligned_normals():
+    normals = np.array([[0, 0, -1.0], [0, 0, 1.0], [1.0, 0, 0]])
+    vectors = rotation_vectors_from_normals(normals)
+    np.testing.assert_allclose(vectors[0], 0.0)
+    np.testing.assert_allclose(rotation_matrices(vectors) @ TOOL_AXIS, -normals, atol=1e-12)
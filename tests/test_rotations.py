@@ -0,0 +1,42 @@
+import numpy as np
+
+from cobot_importer.core.rotations import (
+    canonical_rotation_vectors,
+    quaternion_matrices,
+    quaternions_from_rotation_vectors,
+    rotation_matrices,
+    rotation_vectors_from_quaternions,
+    slerp,
+)
+
+
+def test_quaternion_round_trip_and_matrices():
+    vectors = np.random.default_rng(2).normal(scale=2.0, size=(200, 3))
+    vectors[0] = 0.0
+    quaternions = quaternions_from_rotation_vectors(vectors)
+    np.testing.assert_allclose(np.linalg.norm(quaternions, axis=1), 1.0)
+    np.testing.assert_allclose(quaternion_matrices(quaternions), rotation_matrices(vectors), atol=1e-12)
+
+    recovered = rotation_vectors_from_quaternions(-quaternions)
+    assert np.linalg.norm(recovered, axis=1).max() <= np.pi + 1e-12
+    np.testing.assert_allclose(rotation_matrices(recovered), rotation_matrices(vectors), atol=1e-12)
+
+
+def test_canonical_rotation_vectors_wrap_large_angles_only():
+    vectors = np.array([[0.1, 0.2, 0.3], [0.0, 0.0, 1.5 * np.pi], [4.0 * np.pi, 0.0, 0.0]])
+    canonical = canonical_rotation_vectors(vectors)
+    np.testing.assert_array_equal(canonical[0], vectors[0])
+    np.testing.assert_allclose(canonical[1:], [[0, 0, -0.5 * np.pi], [0, 0, 0]], atol=1e-12)
+    np.testing.assert_allclose(rotation_matrices(canonical), rotation_matrices(vectors), atol=1e-12)
+
+
+def test_slerp_follows_the_shorter_arc_at_constant_rate():
+    start = quaternions_from_rotation_vectors([[0.0, 0.0, 0.0]])
+    end = -quaternions_from_rotation_vectors([[0.0, 0.0, np.pi / 2]])
+    fractions = np.linspace(0.0, 1.0, 5)
+    result = slerp(np.repeat(start, 5, axis=0), np.repeat(end, 5, axis=0), fractions)
+    angles = rotation_vectors_from_quaternions(result)[:, 2]
+    np.testing.assert_allclose(angles, fractions * np.pi / 2, atol=1e-12)
+
+    same = slerp(start, start, [0.3])
+    np.testing.assert_allclose(same, start)
@@ -1,6 +1,9 @@
 from pathlib import Path
 
-from cobot_importer.core import PathPoint, PathSegment, Project, ProjectSerializer
+import numpy as np
+
+from cobot_importer.core import IOEvent, PathPoint, PathSegment, Project, ProjectSerializer
+from cobot_importer.core.project import IOType
 
 
 def test_project_roundtrip(tmp_path: Path) -> None:
@@ -19,3 +22,26 @@ def test_project_roundtrip(tmp_path: Path) -> None:
     assert loaded.name == project.name
     assert len(loaded.paths) == 1
     assert len(loaded.paths[0].points) == 3
+
+
+def test_container_roundtrip_is_detected_and_mapped(tmp_path: Path) -> None:
+    project = Project(name="Big")
+    segment = project.add_path(PathSegment(name="Seg1", speed=42.0))
+    segment.points.extend_array(np.arange(600, dtype=float).reshape(100, 6))
+    segment.points.set_events(3, [IOEvent(io_type=IOType.DIGITAL_OUTPUT, identifier="DO1", value=1.0)])
+    project.add_path(PathSegment(name="Empty"))
+    path = tmp_path / "project.cobot3d"
+    ProjectSerializer.save(project, path, format=ProjectSerializer.FORMAT_CONTAINER)
+
+    assert ProjectSerializer.detect_format(path) == ProjectSerializer.FORMAT_CONTAINER
+    loaded = ProjectSerializer.load(path)
+    assert loaded.paths[0].points.source == str(path)
+    assert loaded.paths[0].speed == 42.0
+    np.testing.assert_array_equal(loaded.paths[0].points.poses, segment.points.poses)
+    assert loaded.paths[0].points[3].io_events == segment.points[3].io_events
+    assert len(loaded.paths[1].points) == 0
+
+    loaded.paths[0].points[0].x = -1.0
+    ProjectSerializer.save(loaded, path)
+    assert ProjectSerializer.detect_format(path) == ProjectSerializer.FORMAT_JSON
+    assert ProjectSerializer.load(path).paths[0].points[0].x == -1.0
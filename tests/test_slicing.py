@@ -0,0 +1,77 @@
+import numpy as np
+import trimesh
+
+from cobot_importer.core import MeshGeometry
+from cobot_importer.core.lod import compute_vertex_normals
+from cobot_importer.core.rotations import TOOL_AXIS, rotation_matrices
+from cobot_importer.core.slicing import plane_offsets, sections_to_segments, slice_mesh
+
+
+def _geometry(mesh: trimesh.Trimesh) -> MeshGeometry:
+    vertices, faces = np.asarray(mesh.vertices), np.asarray(mesh.faces)
+    return MeshGeometry(vertices, faces, compute_vertex_normals(vertices, faces))
+
+
+def _height_field() -> trimesh.Trimesh:
+    """Open wavy sheet over [-40, 40] x [-20, 20]."""
+
+    x, y = np.meshgrid(np.linspace(-40, 40, 81), np.linspace(-20, 20, 41), indexing="ij")
+    z = 5.0 * np.sin(x / 10.0) * np.cos(y / 10.0)
+    vertices = np.column_stack([x.ravel(), y.ravel(), z.ravel()])
+    ids = np.arange(x.size).reshape(x.shape)
+    a, b, c, d = ids[:-1, :-1].ravel(), ids[1:, :-1].ravel(), ids[1:, 1:].ravel(), ids[:-1, 1:].ravel()
+    faces = np.concatenate([np.column_stack([a, b, c]), np.column_stack([a, c, d])])
+    return trimesh.Trimesh(vertices, faces, process=False)
+
+
+def _length(points: np.ndarray) -> float:
+    return float(np.linalg.norm(np.diff(points, axis=0), axis=1).sum())
+
+
+def test_sections_match_reference_and_close_on_solids():
+    mesh = trimesh.creation.icosphere(subdivisions=3, radius=10.0)
+    geometry = _geometry(mesh)
+    offsets = plane_offsets(geometry, [0, 1, 1], 2.5)
+    curves = slice_mesh(geometry, [0, 1, 1], offsets, workers=1)
+
+    reference = trimesh.intersections.mesh_multiplane(mesh, [0, 0, 0], np.array([0, 1, 1]) / np.sqrt(2), offsets)[0]
+    assert [curve.plane for curve in curves] == list(range(len(offsets)))
+    for curve, lines in zip(curves, reference):
+        assert curve.closed and np.allclose(curve.points[0], curve.points[-1])
+        np.testing.assert_allclose(curve.points @ [0, 1, 1] / np.sqrt(2), offsets[curve.plane], atol=1e-9)
+        assert np.isclose(_length(curve.points), np.linalg.norm(lines[:, 1] - lines[:, 0], axis=1).sum())
+
+    threaded = slice_mesh(geometry, [0, 1, 1], offsets[::-1], workers=3)
+    assert [curve.plane for curve in threaded] == list(range(len(offsets)))[::-1]
+    for curve, expected in zip(threaded, curves):
+        np.testing.assert_array_equal(curve.points, expected.points)
+
+
+def test_planes_through_vertices_give_one_loop_each():
+    geometry = _geometry(trimesh.creation.box(extents=(100, 50, 20)))
+    curves = slice_mesh(geometry, [1, 0, 0], [-50.0, 0.0, 20.0])
+    assert len(curves) == 2 and all(curve.closed for curve in curves)
+    assert np.isclose(_length(curves[1].points), 140.0)
+
+
+def test_zigzag_links_open_sections_in_alternating_directions():
+    geometry = _geometry(_height_field())
+    offsets = plane_offsets(geometry, [1, 0, 0], 10.0)
+    curves = slice_mesh(geometry, [1, 0, 0], offsets)
+    assert len(curves) == len(offsets) == 8 and not any(curve.closed for curve in curves)
+
+    separate = sections_to_segments(geometry, curves, [1, 0, 0], zigzag=False)
+    assert [len(segment.points) for segment in separate] == [len(curve.points) for curve in curves]
+
+    (zigzag,) = sections_to_segments(geometry, curves, [1, 0, 0], tool_offset=2.0, name="Raster")
+    assert zigzag.name == "Raster" and zigzag.tool_offset == 2.0
+    assert len(zigzag.points) == sum(len(curve.points) for curve in curves)
+    positions = zigzag.points.positions
+    ends = np.cumsum([len(curve.points) for curve in curves])
+    starts = ends - np.array([len(curve.points) for curve in curves])
+    directions = np.sign(positions[ends - 1, 1] - positions[starts, 1])
+    np.testing.assert_array_equal(directions, directions[0] * np.array([1, -1] * 4))
+    # Waypoints sit above the sheet, the tool pointing down into it.
+    np.testing.assert_allclose(geometry.build_index().nearest_surface(positions).distances, 2.0, atol=0.05)
+    tool_axes = rotation_matrices(zigzag.points.orientations) @ TOOL_AXIS
+    assert np.all(tool_axes[:, 2] < -0.5)
@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import numpy as np
+import trimesh
+
+from cobot_importer.core import MeshCache, MeshIndex, ModelLoader
+from cobot_importer.core.spatial import closest_points_on_segments, closest_points_on_triangles
+
+
+def _mesh():
+    mesh = trimesh.util.concatenate(
+        [trimesh.creation.icosphere(subdivisions=3, radius=10.0), trimesh.creation.box(extents=(4, 4, 4))]
+    )
+    mesh.apply_translation((1.0, -2.0, 0.5))
+    return np.asarray(mesh.vertices, dtype=np.float32), np.asarray(mesh.faces, dtype=np.uint32)
+
+
+def test_queries_match_brute_force():
+    vertices, faces = _mesh()
+    index = MeshIndex.build(vertices, faces)
+    triangles = vertices[faces].astype(float)
+    rng = np.random.default_rng(7)
+    points = rng.uniform(-15, 15, size=(300, 3))
+
+    pairs = np.repeat(points, len(faces), axis=0), np.tile(triangles, (len(points), 1, 1))
+    expected = np.linalg.norm(closest_points_on_triangles(*pairs) - pairs[0], axis=1).reshape(len(points), -1)
+    surface = index.nearest_surface(points)
+    np.testing.assert_allclose(surface.distances, expected.min(axis=1), atol=1e-6)
+    np.testing.assert_allclose(np.linalg.norm(surface.points - points, axis=1), surface.distances, atol=1e-6)
+
+    edge_distances = np.min(
+        [
+            np.linalg.norm(closest_points_on_segments(pairs[0], pairs[1][:, a], pairs[1][:, b]) - pairs[0], axis=1)
+            for a, b in ((0, 1), (1, 2), (2, 0))
+        ],
+        axis=0,
+    ).reshape(len(points), -1)
+    edge = index.nearest_edge(points)
+    np.testing.assert_allclose(edge.distances, edge_distances.min(axis=1), atol=1e-6)
+    ends = vertices[edge.edges].astype(float)
+    np.testing.assert_allclose(closest_points_on_segments(edge.points, ends[:, 0], ends[:, 1]), edge.points, atol=1e-5)
+
+    vertex = index.nearest_vertex(points)
+    brute = np.linalg.norm(points[:, None] - vertices[None].astype(float), axis=2)
+    np.testing.assert_allclose(vertex.distances, brute.min(axis=1), atol=1e-5)
+
+
+def test_rays_hit_first_surface():
+    vertices, faces = _mesh()
+    index = MeshIndex.build(vertices, faces)
+    rng = np.random.default_rng(3)
+    directions = rng.normal(size=(200, 3))
+    directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+    origins = np.array([1.0, -2.0, 0.5]) - directions * 30.0 + rng.uniform(-3, 3, size=(200, 3))
+    hits = index.intersect_rays(origins, directions)
+
+    triangles = vertices[faces].astype(float)
+    for ray in range(len(origins)):
+        t = MeshIndex._ray_triangle(
+            np.repeat(origins[ray : ray + 1], len(faces), axis=0),
+            np.repeat(directions[ray : ray + 1], len(faces), axis=0),
+            triangles,
+        )
+        assert np.isclose(hits.distances[ray], t.min())
+        assert hits.faces[ray] == -1 or np.isclose(t[hits.faces[ray]], t.min())
+
+    miss = index.intersect_rays([[100.0, 100.0, 100.0]], [[0.0, 0.0, 1.0]])
+    assert not miss.found[0] and np.isnan(miss.points[0]).all()
+
+
+def test_index_is_built_on_load_and_cached(tmp_path: Path):
+    model = tmp_path / "sphere.stl"
+    trimesh.creation.icosphere(subdivisions=3, radius=10.0).export(model)
+    cache = MeshCache(tmp_path / "cache")
+
+    geometry = ModelLoader.load_mesh(model, cache=cache)
+    assert geometry.index is not None
+    cached = ModelLoader.load_mesh(model, cache=cache)
+    assert cached.index is not None
+    for name, array in geometry.index.to_arrays().items():
+        np.testing.assert_array_equal(cached.index.to_arrays()[name], array)
+    hit = cached.index.intersect_rays([0.0, 0.0, 50.0], [0.0, 0.0, -1.0])
+    assert hit.found[0] and abs(hit.points[0][2] - 10.0) < 0.1
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+import trimesh
+
+from cobot_importer.core import MeshGeometry
+from cobot_importer.core.lod import compute_vertex_normals
+from cobot_importer.core.surface_path import SurfacePathGenerator
+
+
+def _box() -> MeshGeometry:
+    mesh = trimesh.creation.box(extents=(100, 50, 20))
+    vertices, faces = np.asarray(mesh.vertices), np.asarray(mesh.faces)
+    return MeshGeometry(vertices, faces, compute_vertex_normals(vertices, faces))
+
+
+def _box_distance(points: np.ndarray) -> np.ndarray:
+    outside = np.abs(points) - np.array([50.0, 25.0, 10.0])
+    return np.linalg.norm(np.maximum(outside, 0.0), axis=1) + np.minimum(outside.max(axis=1), 0.0)
+
+
+def test_path_follows_surface_around_edges():
+    controls = [[-40.0, 0.0, 10.0], [50.0, 0.0, 0.0], [40.0, 20.0, -10.0]]
+    generator = SurfacePathGenerator(_box(), spacing=2.0)
+    update = generator.set_control_points(controls)
+    poses = generator.poses()
+    assert (update.start, update.stop) == (0, 0)
+    np.testing.assert_array_equal(update.poses, poses)
+
+    np.testing.assert_allclose(_box_distance(poses[:, :3]), 0.0, atol=1e-6)
+    steps = np.linalg.norm(np.diff(poses[:, :3], axis=0), axis=1)
+    assert steps.max() < 2.1 and np.median(steps) > 1.5
+    # Across the top edge the path runs over the faces, not through the box.
+    assert np.any(np.all(np.isclose(poses[:, :3], [50.0, 0.0, 10.0], atol=2.0), axis=1))
+    np.testing.assert_allclose(poses[0], [-40.0, 0.0, 10.0, np.pi, 0.0, 0.0], atol=1e-9)
+    np.testing.assert_allclose(poses[-1], [40.0, 20.0, -10.0, 0.0, 0.0, 0.0], atol=1e-9)
+
+    generator.set_parameters(offset=1.5)
+    np.testing.assert_allclose(_box_distance(generator.poses()[:, :3]), 1.5, atol=1e-6)
+
+
+def test_moving_a_control_point_only_regenerates_its_spans():
+    geometry = _box()
+    controls = np.array([[-45.0, -20.0, 10.0], [-10.0, 0.0, 10.0], [10.0, 10.0, 10.0], [45.0, 20.0, 10.0]])
+    generator = SurfacePathGenerator(geometry, spacing=1.0)
+    generator.set_control_points(controls)
+    before = generator.poses()
+
+    update = generator.move_control_point(2, [20.0, -10.0, 10.0])
+    after = generator.poses()
+    first_span = int(np.ceil(np.hypot(35.0, 20.0)))
+    assert update.start == first_span
+    np.testing.assert_array_equal(after[: update.start], before[: update.start])
+    np.testing.assert_array_equal(after[update.start + len(update.poses) :], before[update.stop :])
+    np.testing.assert_array_equal(after[update.start : update.start + len(update.poses)], update.poses)
+
+    controls[2] = [20.0, -10.0, 10.0]
+    np.testing.assert_allclose(after, SurfacePathGenerator(geometry, spacing=1.0).set_control_points(controls).poses)
+
+    appended = generator.append_control_point([45.0, -20.0, 10.0])
+    assert appended.stop == len(after) and appended.start == len(after) - 1
+    removed = generator.remove_control_point(0)
+    assert (removed.start, removed.stop, len(removed.poses)) == (0, first_span, 0)
+    with pytest.raises(IndexError):
+        generator.move_control_point(10, [0.0, 0.0, 0.0])
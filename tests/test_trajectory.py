@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from cobot_importer.core import PathSegment
+from cobot_importer.core.rotations import rotation_vectors_from_quaternions
+from cobot_importer.simulation import MotionLimits, Trajectory, VelocityProfile
+from conftest import path_segment
+
+
+@pytest.mark.parametrize(
+    "profile, duration",
+    [(VelocityProfile.TRAPEZOID, 1.1), (VelocityProfile.S_CURVE, 1.2)],
+)
+def test_profile_durations_and_speed(profile, duration):
+    limits = MotionLimits(acceleration=1000.0, jerk=10000.0, profile=profile)
+    trajectory = Trajectory([path_segment([[0, 0, 0], [100, 0, 0]], speed=100.0)], limits)
+    assert trajectory.duration == pytest.approx(duration)
+
+    times = np.linspace(0.0, trajectory.duration, 4001)
+    sample = trajectory.sample(times)
+    assert sample.positions[0] == pytest.approx([0, 0, 0])
+    assert sample.positions[-1] == pytest.approx([100, 0, 0])
+    assert np.all(np.diff(sample.positions[:, 0]) >= -1e-9)
+    assert sample.speeds.max() == pytest.approx(100.0)
+    assert np.all(np.abs(np.diff(sample.speeds) / np.diff(times)) <= 1000.0 + 1e-6)
+    # The reported speed is the derivative of the position.
+    derivative = np.gradient(sample.positions[:, 0], times)
+    assert np.abs(derivative - sample.speeds)[1:-1].max() < 1.0
+
+
+def test_short_moves_lower_the_peak_speed():
+    limits = MotionLimits(acceleration=1000.0, jerk=10000.0)
+    trajectory = Trajectory([path_segment([[0, 0, 0], [2, 0, 0]], speed=100.0)], limits)
+    sample = trajectory.sample(np.linspace(0.0, trajectory.duration, 501))
+    assert sample.speeds.max() < 100.0
+    assert sample.positions[-1] == pytest.approx([2, 0, 0])
+
+
+def test_approach_retract_and_travel_moves():
+    first = path_segment([[0, 0, 0], [50, 0, 0]], speed=50.0, approach_height=10.0, retract_height=20.0)
+    second = path_segment([[100, 0, 0], [150, 0, 0]], speed=50.0)
+    trajectory = Trajectory([first, second])
+    assert trajectory.length == pytest.approx(10 + 50 + 20 + np.hypot(50, 20) + 50)
+
+    sample = trajectory.sample(np.linspace(0.0, trajectory.duration, 2001))
+    assert sample.positions[0] == pytest.approx([0, 0, 10])
+    assert sample.positions[-1] == pytest.approx([150, 0, 0])
+    assert sample.positions[:, 2].max() == pytest.approx(20.0)
+    # Approach, retract and travel report no waypoint.
+    assert sample.point_indices[0] == -1
+    assert set(sample.segment_indices) == {0, 1}
+
+
+def test_blending_rounds_corners_without_stopping():
+    corner = [[0, 0, 0], [100, 0, 0], [100, 100, 0]]
+    stopping = Trajectory([path_segment(corner, speed=100.0)])
+    blended = Trajectory([path_segment(corner, speed=100.0, blend_radius=10.0)])
+    assert blended.duration < stopping.duration
+    assert blended.length < stopping.length
+
+    sample = blended.sample(np.linspace(0.0, blended.duration, 2001))
+    assert np.linalg.norm(sample.positions - [100, 0, 0], axis=1).min() > 2.0
+    assert sample.speeds[len(sample.speeds) // 2] == pytest.approx(100.0)
+
+
+def test_sharp_blended_corners_still_stop():
+    reversal = [[0, 0, 0], [100, 0, 0], [0, 1, 0]]
+    trajectory = Trajectory([path_segment(reversal, speed=100.0, blend_radius=10.0)])
+    sample = trajectory.sample(np.linspace(0.0, trajectory.duration, 4001))
+    middle = sample.speeds[1000:3000]
+    assert middle.max() == pytest.approx(100.0)
+    assert middle.min() < 1.0
+
+
+def test_sampling_clamps_and_handles_empty_programs():
+    trajectory = Trajectory([path_segment([[0, 0, 0], [10, 0, 0]], speed=10.0)])
+    sample = trajectory.sample([-1.0, trajectory.duration + 5.0])
+    assert sample.positions == pytest.approx(np.array([[0, 0, 0], [10, 0, 0]]))
+
+    empty = Trajectory([path_segment([[0, 0, 0], [10, 0, 0]], enabled=False)])
+    assert empty.duration == 0.0
+    assert len(empty.sample(0.5).positions) == 0
+
+
+def test_orientations_are_interpolated_along_the_path():
+    segment = PathSegment(name="轨迹", approach_height=10.0, retract_height=0.0)
+    segment.points.extend_array(np.array([[0.0, 0, 0, 0, 0, 0], [100.0, 0, 0, 0, 0, np.pi / 2]]))
+    trajectory = Trajectory([segment])
+    sample = trajectory.sample(np.linspace(0.0, trajectory.duration, 401))
+    angles = rotation_vectors_from_quaternions(sample.orientations)[:, 2]
+    progress = np.clip(sample.positions[:, 0] / 100.0, 0.0, 1.0)
+    np.testing.assert_allclose(angles, progress * np.pi / 2, atol=1e-9)
@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+pytest.importorskip("PySide6.QtCore")
+
+from PySide6.QtCore import QCoreApplication  # noqa: E402
+
+from cobot_importer.core import ChangeSet  # noqa: E402
+from cobot_importer.ui.update_scheduler import UpdateScheduler  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+def _scheduler(*channels, interval_ms: int = 16):
+    scheduler = UpdateScheduler(interval_ms=interval_ms)
+    calls = []
+    for channel in channels:
+        scheduler.register(channel, lambda changes, channel=channel: calls.append((channel, changes)))
+    return scheduler, calls
+
+
+def _points(segment_id: str, start: int, stop: int) -> ChangeSet:
+    changes = ChangeSet()
+    changes.mark_points(segment_id, start, stop)
+    return changes
+
+
+def test_burst_of_invalidations_runs_each_handler_once(app):
+    scheduler, calls = _scheduler("scene", "status")
+    for index in range(30):
+        scheduler.invalidate(["scene", "status"], _points("a", index, index + 1))
+    assert calls == []
+
+    scheduler.flush()
+    assert [channel for channel, _ in calls] == ["scene", "status"]
+    assert calls[0][1].points_changed == {"a": (0, 30)}
+    assert scheduler.stats["scene"].requests == 30
+    assert scheduler.stats["scene"].flushes == 1
+    assert scheduler.coalesced == 58
+
+
+def test_full_refresh_absorbs_partial_changes(app):
+    scheduler, calls = _scheduler("scene")
+    original = _points("a", 0, 1)
+    scheduler.invalidate("scene", original)
+    scheduler.invalidate("scene")
+    scheduler.invalidate("scene", _points("b", 0, 1))
+    scheduler.flush()
+    assert calls == [("scene", None)]
+    # The caller's change set is not modified by later merges.
+    assert original.points_changed == {"a": (0, 1)}
+
+
+def test_flush_follows_the_event_loop_at_most_once_per_frame(app):
+    scheduler, calls = _scheduler("scene", interval_ms=50)
+    scheduler.invalidate("scene")
+    deadline = time.monotonic() + 1.0
+    while not calls and time.monotonic() < deadline:
+        app.processEvents()
+    assert len(calls) == 1
+
+    # Right after a flush the next one waits for the rest of the frame.
+    scheduler.invalidate("scene")
+    app.processEvents()
+    assert len(calls) == 1 and scheduler.is_pending("scene")
+    assert 0 < scheduler._timer.interval() <= 50
+    scheduler.flush()
+    assert len(calls) == 2 and not scheduler._timer.isActive()
+
+
+def test_unknown_channel_is_rejected(app):
+    scheduler, _ = _scheduler("scene")
+    with pytest.raises(KeyError):
+        scheduler.invalidate("plots")